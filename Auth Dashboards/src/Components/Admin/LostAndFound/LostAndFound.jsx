@@ -18,7 +18,7 @@ import {
   Plus,
   AlertCircle
 } from 'lucide-react';
-import { getAllLost, getAllMatches, getAllFound, searchFace, checkMatches, normalizePersonRecord } from '../../../Services/api';
+import { getRecordsPage, getAllMatches, getStats, searchFace, checkMatches, searchRecords, normalizePersonRecord } from '../../../Services/api';
 
 // Contracts reference
 // LostReport, Match (pending review)
@@ -30,16 +30,34 @@ const statusStyles = {
   closed:'bg-emerald-500/15 text-emerald-600 dark:text-emerald-300 border-emerald-400/30'
 };
 
+// Lost / found records are listed in pages of this size; polling only refreshes the first page
+const PAGE_SIZE = 50;
+
+// Fresh first page first, then previously loaded records that are not on it
+const mergeFirstPage = (prev, page) => {
+  const ids = new Set(page.map(r => r.id));
+  return [...page, ...prev.filter(r => !ids.has(r.id))];
+};
+const appendPage = (prev, page) => {
+  const ids = new Set(prev.map(r => r.id));
+  return [...prev, ...page.filter(r => !ids.has(r.id))];
+};
+
 const LostAndFound = () => {
   // Tabs: lost | found | matches | search
   const [tab, setTab] = useState('lost');
   const [reports, setReports] = useState([]); // transformed lost people records
   const [foundReports, setFoundReports] = useState([]); // transformed found people records
   const [matches, setMatches] = useState([]); // transformed match records
+  const [openMatchedIds, setOpenMatchedIds] = useState(() => new Set()); // lost face ids with only unconfirmed matches
+  const [pages, setPages] = useState({ lost: { page: 0, total: 0 }, found: { page: 0, total: 0 } }); // pages loaded per tab
+  const [stats, setStats] = useState(null); // collection-wide counts from /stats
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [statusFilter, setStatusFilter] = useState('all');
   const [search, setSearch] = useState('');
+  const [searchHits, setSearchHits] = useState(null); // server-side text search results for the lost/found tab, null when inactive
   const [dateRange, setDateRange] = useState('24h');
   const [selectedReport, setSelectedReport] = useState(null);
   const [matchModal, setMatchModal] = useState(null);
@@ -122,41 +140,58 @@ const LostAndFound = () => {
   };
 
   // Progressive / staged fetching to improve perceived speed:
-  // 1. Load lost reports first (primary tab default) – show immediately.
-  // 2. Then fetch found reports & matches in background; update when ready.
-  // 3. Cache layer in api.js dedupes duplicate calls (StrictMode, concurrent tabs).
+  // 1. Load the first page of lost reports (primary tab default) – show immediately.
+  // 2. Then fetch the first page of found reports, matches and counts in background.
+  // 3. Polling only re-reads the first pages and merges them, so new reports appear at
+  //    the top without re-downloading every record and image; older pages load on demand.
   const fetchData = useCallback(async ({ force=false } = {}) => {
     setError(null);
-    setLoading(true);
+    const config = force ? { noCache: true } : undefined;
     try {
-      const lostRes = await getAllLost(force ? { noCache: true } : undefined);
-      // Show lost list ASAP
-      setReports(cur => {
-        const matchMap = new Map(); // temporarily empty until matches arrive
-        return transformLost(lostRes.records || [], matchMap);
-      });
+      const lostRes = await getRecordsPage('lost', { page: 1, pageSize: PAGE_SIZE }, config);
+      setReports(prev => mergeFirstPage(prev, transformLost(lostRes.records || [], new Map())));
+      setPages(p => ({ ...p, lost: { page: Math.max(p.lost.page, 1), total: lostRes.total_count ?? 0 } }));
     } catch (e) {
       setError(e.message || 'Failed to load lost records');
     } finally {
       setLoading(false);
     }
-    // Fire & forget secondary fetches (found + matches); update independently
+    // Fire & forget secondary fetches (found + matches + counts); update independently
     Promise.allSettled([
-      getAllFound(force ? { noCache: true } : undefined),
-      getAllMatches(force ? { noCache: true } : undefined)
+      getRecordsPage('found', { page: 1, pageSize: PAGE_SIZE }, config),
+      getAllMatches(config),
+      getStats(config)
     ]).then(results => {
-      const [foundRes, matchesRes] = results.map(r => r.status === 'fulfilled' ? r.value : null);
+      const [foundRes, matchesRes, statsRes] = results.map(r => r.status === 'fulfilled' ? r.value : null);
       if (matchesRes) {
-        const matchMap = new Map();
-        (matchesRes.records || []).forEach(m => { if (m.lost_face_id) matchMap.set(m.lost_face_id, true); });
-        setMatches(transformMatches(matchesRes.records || []));
-        // Re-map lost reports to include matched status without losing existing ordering
-        setReports(prev => prev.map(r => ({ ...r, status: matchMap.has(r.id) && r.status==='open' ? 'matched' : r.status })));
+        const records = matchesRes.records || [];
+        // Confirmed matches close the lost record; others only mark it as matched
+        const confirmed = new Set(records.filter(m => m.match_status === 'confirmed').map(m => m.lost_face_id));
+        setOpenMatchedIds(new Set(records.map(m => m.lost_face_id).filter(id => id && !confirmed.has(id))));
+        setMatches(transformMatches(records));
+      }
+      if (foundRes) {
+        setFoundReports(prev => mergeFirstPage(prev, transformFound(foundRes.records || [])));
+        setPages(p => ({ ...p, found: { page: Math.max(p.found.page, 1), total: foundRes.total_count ?? 0 } }));
       }
-      if (foundRes) setFoundReports(transformFound(foundRes.records || []));
+      if (statsRes) setStats(statsRes);
     });
   }, []);
 
+  const loadMore = useCallback(async (source) => {
+    setLoadingMore(true);
+    try {
+      const res = await getRecordsPage(source, { page: pages[source].page + 1, pageSize: PAGE_SIZE });
+      if (source === 'lost') setReports(prev => appendPage(prev, transformLost(res.records || [], new Map())));
+      else setFoundReports(prev => appendPage(prev, transformFound(res.records || [])));
+      setPages(p => ({ ...p, [source]: { page: p[source].page + 1, total: res.total_count ?? p[source].total } }));
+    } catch (e) {
+      setError(e.message || `Failed to load more ${source} records`);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [pages]);
+
   useEffect(() => { fetchData(); }, [fetchData]);
 
   // Optional lightweight polling for updates every 60s
@@ -165,34 +200,65 @@ const LostAndFound = () => {
     return () => clearInterval(iv);
   }, [fetchData]);
 
+  // Server-side fuzzy search (name / location / mobile) for the lost and found tabs, debounced
+  useEffect(() => {
+    const term = search.trim();
+    if ((tab !== 'lost' && tab !== 'found') || term.length < 2) { setSearchHits(null); return; }
+    let cancelled = false;
+    const t = setTimeout(async () => {
+      try {
+        const res = await searchRecords(term, { searchIn: tab, pageSize: 100, includeImages: true });
+        if (!cancelled) setSearchHits({ tab, records: (res.results || []).map(r => r.record) });
+      } catch {
+        if (!cancelled) setSearchHits(null); // fall back to local filtering
+      }
+    }, 300);
+    return () => { cancelled = true; clearTimeout(t); };
+  }, [search, tab]);
+
   // Filters ----------------------------------------------------------------
-  const filteredReports = useMemo(()=> reports.filter(r => (
-    (statusFilter==='all'||r.status===statusFilter) && (
-      r.person.name.toLowerCase().includes(search.toLowerCase()) ||
-      r.person.description.toLowerCase().includes(search.toLowerCase())
-    )
-  )), [reports, statusFilter, search]);
-  const filteredFound = useMemo(()=> foundReports.filter(r => (
-    (statusFilter==='all'||r.status===statusFilter) && (
-      r.person.name.toLowerCase().includes(search.toLowerCase()) ||
-      r.person.description.toLowerCase().includes(search.toLowerCase())
-    )
-  )), [foundReports, statusFilter, search]);
+  const localMatch = r => (
+    r.person.name.toLowerCase().includes(search.toLowerCase()) ||
+    r.person.description.toLowerCase().includes(search.toLowerCase())
+  );
+  // Search hits keep the server's relevance order; status comes from the loaded list when available
+  const fromHits = (list, transform) => {
+    const byId = new Map(list.map(r => [r.id, r]));
+    return transform(searchHits.records).map(r => byId.get(r.id) || r);
+  };
+  const lostReports = useMemo(()=> reports.map(r => (
+    r.status==='open' && openMatchedIds.has(r.id) ? { ...r, status:'matched' } : r
+  )), [reports, openMatchedIds]);
+  const filteredReports = useMemo(()=> (
+    searchHits?.tab === 'lost' ? fromHits(lostReports, recs => transformLost(recs, new Map())) : lostReports.filter(localMatch)
+  ).filter(r => statusFilter==='all'||r.status===statusFilter), [lostReports, statusFilter, search, searchHits]);
+  const filteredFound = useMemo(()=> (
+    searchHits?.tab === 'found' ? fromHits(foundReports, transformFound) : foundReports.filter(localMatch)
+  ).filter(r => statusFilter==='all'||r.status===statusFilter), [foundReports, statusFilter, search, searchHits]);
 
   const filteredMatches = useMemo(()=> matches.filter(m => (
     search.trim()==='' || m.lostPersonName.toLowerCase().includes(search.toLowerCase())
   )), [matches, search]);
 
-  const counts = useMemo(()=> ({
-    lostTotal: reports.length,
-    lostOpen: reports.filter(r=>r.status==='open').length,
-    lostMatched: reports.filter(r=>r.status==='matched').length,
-    lostClosed: reports.filter(r=>r.status==='closed').length,
-    foundTotal: foundReports.length,
-    foundOpen: foundReports.filter(r=>r.status==='open').length,
-    foundClosed: foundReports.filter(r=>r.status==='closed').length,
-    pendingMatches: matches.filter(m=>m.status==='pending_review').length
-  }), [reports, foundReports, matches]);
+  // Records beyond the loaded pages
+  const hasMore = { lost: reports.length < pages.lost.total, found: foundReports.length < pages.found.total };
+
+  // Totals come from /stats since only some pages are loaded; loaded records are the fallback
+  const counts = useMemo(()=> {
+    const lostClosed = stats?.lost_found ?? lostReports.filter(r=>r.status==='closed').length;
+    const lostTotal = stats?.lost_people ?? pages.lost.total;
+    const lostMatched = openMatchedIds.size;
+    return {
+      lostTotal,
+      lostOpen: Math.max(0, lostTotal - lostClosed - lostMatched),
+      lostMatched,
+      lostClosed,
+      foundTotal: stats?.found_people ?? pages.found.total,
+      foundOpen: stats?.found_pending ?? foundReports.filter(r=>r.status==='open').length,
+      foundClosed: stats?.found_matched ?? foundReports.filter(r=>r.status==='closed').length,
+      pendingMatches: matches.filter(m=>m.status==='pending_review').length
+    };
+  }, [lostReports, foundReports, matches, stats, pages, openMatchedIds]);
 
   // States rendering helpers ----------------------------------------------
   const loadingCards = <div className="grid [grid-template-columns:repeat(auto-fill,minmax(230px,1fr))] gap-4">{Array.from({length:8}).map((_,i)=>(<div key={i} className="h-48 rounded-lg bg-gradient-to-r from-black/5 via-black/10 to-black/5 dark:from-white/5 dark:via-white/10 dark:to-white/5 animate-pulse"/>))}</div>;
@@ -354,7 +420,7 @@ const LostAndFound = () => {
           )}
           <div className="relative">
             <SearchIcon size={14} className="absolute left-2 top-1/2 -translate-y-1/2 text-white/40"/>
-            <input value={search} onChange={e=>setSearch(e.target.value)} placeholder={tab==='matches'? 'Search lost person':'Search name / desc'} className="h-9 w-40 sm:w-56 pl-7 pr-2 rounded-md border border-white/10 bg-white/5 text-xs text-white/80 placeholder:text-white/40 focus:outline-none focus:ring-2 focus:ring-orange-500" />
+            <input value={search} onChange={e=>setSearch(e.target.value)} placeholder={tab==='matches'? 'Search lost person':'Search name / place / mobile'} className="h-9 w-40 sm:w-56 pl-7 pr-2 rounded-md border border-white/10 bg-white/5 text-xs text-white/80 placeholder:text-white/40 focus:outline-none focus:ring-2 focus:ring-orange-500" />
           </div>
           <select value={dateRange} onChange={e=>setDateRange(e.target.value)} className="h-9 rounded-md border border-white/10 bg-white/5 backdrop-blur px-2 text-white/80 focus:outline-none focus:ring-2 focus:ring-orange-500">
             {['24h','48h','7d','30d'].map(r => <option key={r} className="bg-gray-900" value={r}>{r}</option>)}
@@ -494,11 +560,18 @@ const LostAndFound = () => {
       )}
       {tab!=='search' && (
         loading ? loadingCards : (
-          tab==='lost' ? (filteredReports.length===0 ? emptyState : reportCards)
-          : tab==='found' ? (filteredFound.length===0 ? <div className="p-10 text-sm text-white/60 text-center border border-dashed border-white/15 rounded-lg bg-white/5 backdrop-blur flex flex-col gap-3 items-center"><Inbox size={40} className="text-orange-400"/>No found reports.</div> : foundCards)
+          tab==='lost' ? (filteredReports.length===0 && !hasMore.lost ? emptyState : reportCards)
+          : tab==='found' ? (filteredFound.length===0 && !hasMore.found ? <div className="p-10 text-sm text-white/60 text-center border border-dashed border-white/15 rounded-lg bg-white/5 backdrop-blur flex flex-col gap-3 items-center"><Inbox size={40} className="text-orange-400"/>No found reports.</div> : foundCards)
           : (filteredMatches.length===0 ? <div className="p-10 text-sm text-white/60 text-center border border-dashed border-white/15 rounded-lg bg-white/5 backdrop-blur flex flex-col gap-3 items-center"><Inbox size={40} className="text-orange-400"/>No match records.</div> : matchCards)
         )
       )}
+      {!loading && !searchHits && ['lost','found'].includes(tab) && hasMore[tab] && (
+        <div className="flex justify-center">
+          <button onClick={()=>loadMore(tab)} disabled={loadingMore} className="h-9 px-4 rounded-md border text-xs bg-white/5 border-white/10 text-white/70 hover:bg-white/10 transition disabled:opacity-50">
+            {loadingMore ? 'Loading…' : `Load more (${tab==='lost' ? reports.length : foundReports.length} of ${pages[tab].total})`}
+          </button>
+        </div>
+      )}
 
       {/* Report Detail Drawer */}
       <Drawer open={!!selectedReport} onClose={()=>setSelectedReport(null)} title={selectedReport ? selectedReport.person.name : ''}>
@@ -33,7 +33,7 @@ const Alerts = ({ volunteerId='demo_user_123' }) => {
 
   /**
    * Map backend alert entry (type + data) to internal VolunteerAlert.
-   * Backend (GET /alert/{user_id}) returns alerts: [{ type:'lost'|'found', data:{ ...record }}]
+   * Backend (GET /alert/{user_id}) returns alerts: [{ alert_id, type:'lost'|'found', created_at, read, data:{ ...record }}]
    * We derive severity heuristically (lost -> high, found -> medium) until backend provides native severity.
    */
   const mapApiAlerts = (apiAlerts) => {
@@ -49,13 +49,13 @@ const Alerts = ({ volunteerId='demo_user_123' }) => {
         ? `${personName} (${rec.age ?? 'Unknown'} yrs) reported ${rec.where_lost ? 'at '+rec.where_lost : ''}. Status: ${statusRaw}.`
         : `${personName} (${rec.age ?? 'Unknown'} yrs) found${rec.location_found? ' at '+rec.location_found:''}. Status: ${statusRaw}.`;
       return {
-        id: rec.face_id || 'alert_'+Math.random().toString(16).slice(2),
+        id: a.alert_id || rec.face_id || 'alert_'+Math.random().toString(16).slice(2),
         type: actionLabel,
         severity,
         zone,
         description: desc.trim(),
-        ts: rec.status_updated_time || rec.upload_time || new Date().toISOString(),
-        status: 'new'
+        ts: a.created_at || rec.status_updated_time || rec.upload_time || new Date().toISOString(),
+        status: a.read ? 'ack' : 'new'
       };
     });
   };
@@ -2,37 +2,48 @@ import React, { useCallback, useEffect, useMemo, useState } from 'react';
 import Drawer from '../../../General/Drawer';
 import { Flag, CheckCircle2, XCircle, Clock, MapPin, RefreshCw } from 'lucide-react';
 import { StatusBadge } from '../LostAndFound';
-import { getAllFound, searchFace, normalizePersonRecord } from '../../../../Services/api';
+import { getRecordsPage, searchRecords, searchFace, normalizePersonRecord } from '../../../../Services/api';
 
 /** @typedef {{ id:string; type:'person'|'item'; description:string; photoUrls:string[]; location:string; status:'open'|'matched'|'resolved'|'missing'|'cancelled'; createdAt:string; reporterId:string; matchedWith?:string; resolvedAt?:string }} LostCase */
 
 const relative = iso => { if(!iso) return '-'; const t=new Date(iso).getTime(); if(isNaN(t)) return '-'; const d=Date.now()-t; const m=Math.floor(d/60000); if(m<1) return 'just now'; if(m<60) return m+'m'; const h=Math.floor(m/60); if(h<24) return h+'h'; const da=Math.floor(h/24); return da+'d'; };
 
-const Found = ({ data = [], loading: parentLoading, onUpdate, onResolve }) => {
+// Found cases are read in pages without images; the face is fetched when a case is opened
+const PAGE_SIZE = 50;
+
+const toFoundCase = r => ({
+  id: r.face_id,
+  type: 'person',
+  description: r.name ? `Found: ${r.name} (${r.age ?? 'Unknown'} yrs)` : `Found person ${r.face_id?.slice(0,8)}`,
+  photoUrls: [], // list endpoint does not currently include image blobs/URLs
+  location: r.location_found || 'Unknown',
+  status: r.status === 'found' ? 'resolved' : 'open',
+  createdAt: r.upload_time || null,
+  reporterId: r.user_id || (r.reported_by?.name || 'n/a')
+});
+
+const Found = ({ data = [], loading: parentLoading, hasMore: parentHasMore = false, loadingMore: parentLoadingMore = false, onLoadMore, onUpdate, onResolve }) => {
   const [internal, setInternal] = useState([]);
+  const [page, setPage] = useState(0); // pages loaded when not parent-controlled
+  const [internalHasMore, setInternalHasMore] = useState(false);
+  const [internalLoadingMore, setInternalLoadingMore] = useState(false);
+  const [search, setSearch] = useState('');
+  const [searchHits, setSearchHits] = useState(null); // server-side text search results, null when inactive
   const [loading, setLoading] = useState(parentLoading);
   const [error, setError] = useState(null);
   const [detail, setDetail] = useState(null);
   const [enriching, setEnriching] = useState(false);
   const [enrichedMap, setEnrichedMap] = useState({}); // face_id -> normalized enriched record
 
-  // Fetch found list if parent hasn't provided data
+  // Fetch the first page of found cases if parent hasn't provided data
   const fetchFound = useCallback(async () => {
     if (data.length) return; // parent-controlled
     setLoading(true); setError(null);
     try {
-      const res = await getAllFound();
-      const mapped = (res.records || []).map(r => ({
-        id: r.face_id,
-        type: 'person',
-        description: r.name ? `Found: ${r.name} (${r.age ?? 'Unknown'} yrs)` : `Found person ${r.face_id?.slice(0,8)}`,
-        photoUrls: [], // list endpoint does not currently include image blobs/URLs
-        location: r.location_found || 'Unknown',
-        status: r.status === 'found' ? 'resolved' : 'open',
-        createdAt: r.upload_time || null,
-        reporterId: r.user_id || (r.reported_by?.name || 'n/a')
-      }));
-      setInternal(mapped);
+      const res = await getRecordsPage('found', { page: 1, pageSize: PAGE_SIZE, includeImages: false });
+      setInternal((res.records || []).map(toFoundCase));
+      setPage(1);
+      setInternalHasMore(!!res.has_more);
     } catch (e) {
       setError(e.message || 'Failed to load found cases');
     } finally { setLoading(false); }
@@ -40,8 +51,49 @@ const Found = ({ data = [], loading: parentLoading, onUpdate, onResolve }) => {
 
   useEffect(() => { fetchFound(); }, [fetchFound]);
 
+  const loadMoreFound = async () => {
+    setInternalLoadingMore(true);
+    try {
+      const res = await getRecordsPage('found', { page: page + 1, pageSize: PAGE_SIZE, includeImages: false });
+      setInternal(prev => {
+        const ids = new Set(prev.map(c => c.id));
+        return [...prev, ...(res.records || []).map(toFoundCase).filter(c => !ids.has(c.id))];
+      });
+      setPage(page + 1);
+      setInternalHasMore(!!res.has_more);
+    } catch (e) {
+      setError(e.message || 'Failed to load more found cases');
+    } finally { setInternalLoadingMore(false); }
+  };
+
+  // Server-side fuzzy search (name / location / mobile), debounced
+  useEffect(() => {
+    const term = search.trim();
+    if (term.length < 2) { setSearchHits(null); return; }
+    let cancelled = false;
+    const t = setTimeout(async () => {
+      try {
+        const res = await searchRecords(term, { searchIn: 'found', pageSize: PAGE_SIZE });
+        if (!cancelled) setSearchHits((res.results || []).map(r => toFoundCase(r.record)));
+      } catch (e) {
+        if (!cancelled) { setSearchHits(null); setError(e.message || 'Search failed'); }
+      }
+    }, 300);
+    return () => { cancelled = true; clearTimeout(t); };
+  }, [search]);
+
   const source = data.length ? data : internal;
-  const sorted = useMemo(()=>[...source].sort((a,b)=> new Date(b.createdAt)-new Date(a.createdAt)), [source]);
+  // Search hits keep the server's relevance order; local status changes come from the loaded list
+  const sorted = useMemo(() => {
+    if (searchHits) {
+      const byId = new Map(source.map(c => [c.id, c]));
+      return searchHits.map(c => byId.get(c.id) || c);
+    }
+    return [...source].sort((a,b)=> new Date(b.createdAt)-new Date(a.createdAt));
+  }, [source, searchHits]);
+  const hasMore = data.length ? parentHasMore : internalHasMore;
+  const loadingMore = data.length ? parentLoadingMore : internalLoadingMore;
+  const loadMore = data.length ? onLoadMore : loadMoreFound;
 
   // Local only actions (no backend mutation endpoints documented yet)
   const confirm = (c) => onUpdate && onUpdate(c.id, old => ({ ...old, status:'matched' }));
@@ -76,6 +128,7 @@ const Found = ({ data = [], loading: parentLoading, onUpdate, onResolve }) => {
             <button onClick={fetchFound} disabled={loading} className="h-7 px-2 rounded-md mk-border mk-surface-alt text-[10px] flex items-center gap-1 disabled:opacity-50 hover:bg-orange-50 dark:hover:bg-white/10"><RefreshCw size={12}/> Refresh</button>
           </div>
         )}
+        <input value={search} onChange={e=>setSearch(e.target.value)} placeholder="Search name / place / mobile" aria-label="Search found cases" className="h-8 w-full px-2 rounded-md mk-border mk-surface-alt text-[11px] mk-text-primary focus:outline-none focus-visible:ring-2 focus-visible:ring-orange-400/60" />
         {error && <div className="p-3 text-[11px] rounded-md bg-red-500/10 border border-red-500/40 text-red-300 flex justify-between"><span>{error}</span><button onClick={fetchFound} className="underline">Retry</button></div>}
         {loading && Array.from({length:4}).map((_,i)=>(<div key={i} className="h-24 rounded-lg bg-gradient-to-r from-black/5 via-black/10 to-black/5 dark:from-white/5 dark:via-white/10 dark:to-white/5 animate-pulse"/>))}
         {!loading && !error && sorted.length===0 && <div className="p-10 text-center text-sm mk-text-muted mk-surface-alt mk-border rounded-lg">No found cases.</div>}
@@ -105,6 +158,9 @@ const Found = ({ data = [], loading: parentLoading, onUpdate, onResolve }) => {
             </div>
           </div>
         ))}
+        {!loading && !searchHits && hasMore && loadMore && (
+          <button onClick={loadMore} disabled={loadingMore} className="h-8 w-full rounded-md mk-border mk-surface-alt text-[11px] disabled:opacity-50 hover:bg-orange-50 dark:hover:bg-white/10">{loadingMore ? 'Loading…' : 'Load more'}</button>
+        )}
       </div>
       <div className="hidden md:block md:col-span-3">
         {detail ? (
@@ -7,9 +7,22 @@ import Matched from "./Matched/Matched";
 import Missings from "./Missing/Missing";
 import MyReports from "./MyReports/MyReports";
 import History from "./History/History";
-import { getAllLost, getAllFound, getAllMatches } from "../../../Services/api";
+import { getRecordsPage, getAllMatches } from "../../../Services/api";
 import FaceSearch from './FaceSearch/FaceSearch';
 
+// Lost / found cases are read in pages of this size without images; polling only refreshes the first page
+const PAGE_SIZE = 50;
+
+// Fresh first page first, then previously loaded cases that are not on it
+const mergeFirstPage = (prev, page) => {
+  const ids = new Set(page.map(c => c.id));
+  return [...page, ...prev.filter(c => !ids.has(c.id))];
+};
+const appendPage = (prev, page) => {
+  const ids = new Set(prev.map(c => c.id));
+  return [...prev, ...page.filter(c => !ids.has(c.id))];
+};
+
 /** Shared Data Contract */
 /** @typedef {{ id:string; type:'person'|'item'; description:string; photoUrls:string[]; location:string; status:'open'|'matched'|'resolved'|'missing'|'cancelled'; createdAt:string; reporterId:string; matchedWith?:string; resolvedAt?:string }} LostCase */
 
@@ -40,6 +53,8 @@ const LostAndFound = ({ volunteerId = "vol123" }) => {
   // Activity log entries: { id, caseId, action, type, zone, date, status }
   const [activity, setActivity] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [pages, setPages] = useState({ lost: { page: 0, total: 0 }, found: { page: 0, total: 0 } }); // pages loaded per list
   const [error, setError] = useState(null);
 
   // Data transformers ------------------------------------------------------
@@ -77,12 +92,11 @@ const LostAndFound = ({ volunteerId = "vol123" }) => {
     });
   }, []);
 
-  const buildMatches = useCallback((matchRecords, lostList, foundList) => {
-    const lostMap = Object.fromEntries(lostList.map(l => [l.id, l]));
-    const foundMap = Object.fromEntries(foundList.map(f => [f.id, f]));
+  // Match records carry the matched lost / found records, so matches do not depend on the loaded pages
+  const buildMatches = useCallback((matchRecords) => {
     return (matchRecords || []).map(m => {
-      const lostCase = lostMap[m.lost_face_id];
-      const foundCase = foundMap[m.found_face_id];
+      const lostCase = m.lost_person ? mapLost([m.lost_person])[0] : null;
+      const foundCase = m.found_person ? mapFound([m.found_person])[0] : null;
       if (!lostCase || !foundCase) return null;
       return {
         id: m.match_id,
@@ -106,23 +120,26 @@ const LostAndFound = ({ volunteerId = "vol123" }) => {
         status: m.match_status || 'matched'
       };
     }).filter(Boolean);
-  }, []);
+  }, [mapLost, mapFound]);
 
   // Fetch real data -------------------------------------------------------
   const load = useCallback(async () => {
     setLoading(true); setError(null);
     try {
       const [lostRes, foundRes, matchesRes] = await Promise.all([
-        getAllLost(),
-        getAllFound(),
+        getRecordsPage('lost', { page: 1, pageSize: PAGE_SIZE, includeImages: false }),
+        getRecordsPage('found', { page: 1, pageSize: PAGE_SIZE, includeImages: false }),
         getAllMatches().catch(()=>({ records: [] }))
       ]);
       const lostList = mapLost(lostRes.records || []);
       const foundList = mapFound(foundRes.records || []);
-      const matchesList = buildMatches(matchesRes.records || [], lostList, foundList);
-      setLostReports(lostList);
-      setFoundCases(foundList);
-      setMatchedCases(matchesList);
+      setLostReports(prev => mergeFirstPage(prev, lostList));
+      setFoundCases(prev => mergeFirstPage(prev, foundList));
+      setPages(p => ({
+        lost: { page: Math.max(p.lost.page, 1), total: lostRes.total_count ?? 0 },
+        found: { page: Math.max(p.found.page, 1), total: foundRes.total_count ?? 0 }
+      }));
+      setMatchedCases(buildMatches(matchesRes.records || []));
       // Basic derived activity log (initial snapshot)
       const initialActivity = [
         ...foundList.slice(0,5).map(f => ({ id:'act-found-'+f.id, caseId:f.id, action:'Found Logged', type:f.type, zone:f.location, date:f.createdAt, status:f.status })),
@@ -138,6 +155,21 @@ const LostAndFound = ({ volunteerId = "vol123" }) => {
 
   useEffect(() => { load(); }, [load]);
 
+  // Next page of lost or found cases, on demand
+  const loadMore = useCallback(async (source) => {
+    setLoadingMore(true);
+    try {
+      const res = await getRecordsPage(source, { page: pages[source].page + 1, pageSize: PAGE_SIZE, includeImages: false });
+      if (source === 'lost') setLostReports(prev => appendPage(prev, mapLost(res.records || [])));
+      else setFoundCases(prev => appendPage(prev, mapFound(res.records || [])));
+      setPages(p => ({ ...p, [source]: { page: p[source].page + 1, total: res.total_count ?? p[source].total } }));
+    } catch (e) {
+      setError(e.message || 'Failed to load more records');
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [pages, mapLost, mapFound]);
+
   // Optional polling every 90s for updates
   useEffect(() => {
     const iv = setInterval(() => { load(); }, 90000);
@@ -234,6 +266,9 @@ const LostAndFound = ({ volunteerId = "vol123" }) => {
         <Founds
           loading={loading}
           data={foundCases}
+          hasMore={pages.found.page * PAGE_SIZE < pages.found.total}
+          loadingMore={loadingMore}
+          onLoadMore={() => loadMore('found')}
           onUpdate={updateFound}
           onResolve={resolveFound}
         />
@@ -1,6 +1,6 @@
 import React, { useCallback, useEffect, useMemo, useState } from 'react';
 import { Clock, CheckCircle2, XCircle, RefreshCw } from 'lucide-react';
-import { getAllMatches, getAllLost, getAllFound, searchFace, normalizePersonRecord } from '../../../../Services/api';
+import { getAllMatches, searchFace, normalizePersonRecord } from '../../../../Services/api';
 
 /** @typedef {{ id:string; lostCase:{ id:string; type:'person'|'item'; description:string; photoUrls:string[]; location:string; createdAt:string }; foundCase:{ id:string; type:'person'|'item'; description:string; photoUrls:string[]; location:string; reportedAt:string }; confidence?:number|null; status:'matched'|'confirmed'|'rejected' }} MatchedCase */
 
@@ -33,24 +33,19 @@ const Matched = ({ loading: externalLoading, data: externalData }) => {
 
   /**
    * API Alignment Notes:
-   * - getAllMatches returns records: match_id, lost_face_id, found_face_id, match_status (may include lost_person / found_person objects depending on backend version)
-   * - lost / found lists endpoints provide additional context (name, age, where_lost/location_found, status)
-   * - We enrich matches by cross-referencing lost & found datasets when nested objects are absent.
+   * - getAllMatches returns records: match_id, lost_face_id, found_face_id, match_status and the
+   *   matched lost_person / found_person records (name, age, where_lost/location_found, upload_time)
+   * - The nested records are enough for the list, so the full lost / found collections are not read;
+   *   images are fetched per face (searchFace) when a match is opened.
    */
   const fetchMatches = useCallback(async () => {
     if (externalData?.length) return; // parent-supplied data takes precedence
     setLoading(true); setError(null);
     try {
-      const [matchesRes, lostRes, foundRes] = await Promise.all([
-        getAllMatches(),
-        getAllLost().catch(()=>({ records: [] })),
-        getAllFound().catch(()=>({ records: [] }))
-      ]);
-      const lostMap = Object.fromEntries((lostRes.records||[]).map(r => [r.face_id, r]));
-      const foundMap = Object.fromEntries((foundRes.records||[]).map(r => [r.face_id, r]));
+      const matchesRes = await getAllMatches();
       const transformed = (matchesRes.records || []).map(r => {
-        const lostRaw = r.lost_person || lostMap[r.lost_face_id] || {};
-        const foundRaw = r.found_person || foundMap[r.found_face_id] || {};
+        const lostRaw = r.lost_person || {};
+        const foundRaw = r.found_person || {};
         return {
           id: r.match_id,
           lostCase: {
@@ -2,38 +2,50 @@ import React, { useCallback, useEffect, useMemo, useState } from 'react';
 import Drawer from '../../../General/Drawer';
 import { Clock, MapPin, CheckCircle2, RefreshCw } from 'lucide-react';
 import { StatusBadge } from '../LostAndFound';
-import { getAllLost, searchFace, normalizePersonRecord } from '../../../../Services/api';
+import { getRecordsPage, searchRecords, searchFace, normalizePersonRecord } from '../../../../Services/api';
 
 /** @typedef {{ id:string; type:'person'|'item'; description:string; photoUrls:string[]; location:string; status:'open'|'matched'|'resolved'|'missing'|'cancelled'; createdAt:string; reporterId:string; matchedWith?:string; resolvedAt?:string }} LostCase */
 
 const relative = iso => { if(!iso) return '-'; const t=new Date(iso).getTime(); if(isNaN(t)) return '-'; const d=Date.now()-t; const m=Math.floor(d/60000); if(m<1) return 'just now'; if(m<60) return m+'m'; const h=Math.floor(m/60); if(h<24) return h+'h'; const da=Math.floor(h/24); return da+'d'; };
 
+// Lost reports are read in pages without images; the face is fetched when a case is opened
+const PAGE_SIZE = 50;
+
+// Map API status (pending|found) to local (missing|resolved)
+const toMissingCase = r => ({
+  id: r.face_id,
+  type: 'person',
+  description: r.name ? `${r.name} (${r.age ?? 'Unknown'} yrs) – Last seen ${r.where_lost || 'unspecified'}` : `Lost person ${r.face_id?.slice(0,8)}`,
+  photoUrls: [],
+  location: r.where_lost || 'Unknown',
+  status: r.status === 'found' ? 'resolved' : 'missing',
+  createdAt: r.upload_time || null,
+  reporterId: r.user_id || 'n/a'
+});
+const missingOnly = records => (records || []).map(toMissingCase).filter(x => x.status === 'missing');
+
 const Missings = ({ data = [], loading: parentLoading, onMarkFound }) => {
   const [internal, setInternal] = useState([]);
+  const [page, setPage] = useState(0);
+  const [hasMore, setHasMore] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [search, setSearch] = useState('');
+  const [searchHits, setSearchHits] = useState(null); // server-side text search results, null when inactive
   const [loading, setLoading] = useState(parentLoading);
   const [error, setError] = useState(null);
   const [detail, setDetail] = useState(null);
   const [enriching, setEnriching] = useState(false);
   const [enrichedMap, setEnrichedMap] = useState({});
 
-  // Fetch lost list if parent passes empty (graceful fallback)
+  // Fetch the first page of lost reports if parent passes empty (graceful fallback)
   const fetchLost = useCallback(async () => {
     if (data.length) return; // parent controlled
     setLoading(true); setError(null);
     try {
-      const res = await getAllLost();
-      // Map API status (pending|found) to local (missing|resolved)
-      const mapped = (res.records||[]).map(r => ({
-        id: r.face_id,
-        type: 'person',
-        description: r.name ? `${r.name} (${r.age ?? 'Unknown'} yrs) – Last seen ${r.where_lost || 'unspecified'}` : `Lost person ${r.face_id?.slice(0,8)}`,
-        photoUrls: [],
-        location: r.where_lost || 'Unknown',
-        status: r.status === 'found' ? 'resolved' : 'missing',
-        createdAt: r.upload_time || null,
-        reporterId: r.user_id || 'n/a'
-      })).filter(x => x.status === 'missing');
-      setInternal(mapped);
+      const res = await getRecordsPage('lost', { page: 1, pageSize: PAGE_SIZE, includeImages: false });
+      setInternal(missingOnly(res.records));
+      setPage(1);
+      setHasMore(!!res.has_more);
     } catch (e) {
       setError(e.message || 'Failed to load missing cases');
     } finally { setLoading(false); }
@@ -41,8 +53,46 @@ const Missings = ({ data = [], loading: parentLoading, onMarkFound }) => {
 
   useEffect(() => { fetchLost(); }, [fetchLost]);
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const res = await getRecordsPage('lost', { page: page + 1, pageSize: PAGE_SIZE, includeImages: false });
+      setInternal(prev => {
+        const ids = new Set(prev.map(c => c.id));
+        return [...prev, ...missingOnly(res.records).filter(c => !ids.has(c.id))];
+      });
+      setPage(page + 1);
+      setHasMore(!!res.has_more);
+    } catch (e) {
+      setError(e.message || 'Failed to load more missing cases');
+    } finally { setLoadingMore(false); }
+  };
+
+  // Server-side fuzzy search (name / location / mobile), debounced
+  useEffect(() => {
+    const term = search.trim();
+    if (term.length < 2) { setSearchHits(null); return; }
+    let cancelled = false;
+    const t = setTimeout(async () => {
+      try {
+        const res = await searchRecords(term, { searchIn: 'lost', pageSize: PAGE_SIZE });
+        if (!cancelled) setSearchHits(missingOnly((res.results || []).map(r => r.record)));
+      } catch (e) {
+        if (!cancelled) { setSearchHits(null); setError(e.message || 'Search failed'); }
+      }
+    }, 300);
+    return () => { cancelled = true; clearTimeout(t); };
+  }, [search]);
+
   const source = data.length ? data.filter(x => x.status === 'missing') : internal;
-  const sorted = useMemo(()=>[...source].sort((a,b)=> new Date(b.createdAt)-new Date(a.createdAt)), [source]);
+  // Search hits keep the server's relevance order; local status changes come from the loaded list
+  const sorted = useMemo(() => {
+    if (searchHits) {
+      const byId = new Map(source.map(c => [c.id, c]));
+      return searchHits.map(c => byId.get(c.id) || c);
+    }
+    return [...source].sort((a,b)=> new Date(b.createdAt)-new Date(a.createdAt));
+  }, [source, searchHits]);
 
   return (
   <div className="flex flex-col md:grid md:grid-cols-5 md:gap-5 mk-text-primary" aria-label="Missing cases">
@@ -53,6 +103,7 @@ const Missings = ({ data = [], loading: parentLoading, onMarkFound }) => {
             <button onClick={fetchLost} disabled={loading} className="h-7 px-2 rounded-md mk-border mk-surface-alt text-[10px] flex items-center gap-1 disabled:opacity-50 hover:bg-orange-50 dark:hover:bg-white/10"><RefreshCw size={12}/> Refresh</button>
           </div>
         )}
+        <input value={search} onChange={e=>setSearch(e.target.value)} placeholder="Search name / place / mobile" aria-label="Search missing cases" className="h-8 w-full px-2 rounded-md mk-border mk-surface-alt text-[11px] mk-text-primary focus:outline-none focus-visible:ring-2 focus-visible:ring-orange-400/60" />
         {error && <div className="p-3 text-[11px] rounded-md bg-red-500/10 border border-red-500/40 text-red-300 flex justify-between"><span>{error}</span><button onClick={fetchLost} className="underline">Retry</button></div>}
         {loading && Array.from({length:4}).map((_,i)=>(<div key={i} className="h-24 rounded-lg bg-gradient-to-r from-black/5 via-black/10 to-black/5 dark:from-white/5 dark:via-white/10 dark:to-white/5 animate-pulse"/>))}
         {!loading && sorted.length===0 && <div className="p-10 text-center text-sm mk-text-muted mk-surface-alt mk-border rounded-lg">No missing cases.</div>}
@@ -87,6 +138,9 @@ const Missings = ({ data = [], loading: parentLoading, onMarkFound }) => {
             </div>
           </div>
         ))}
+        {!loading && !searchHits && !data.length && hasMore && (
+          <button onClick={loadMore} disabled={loadingMore} className="h-8 w-full rounded-md mk-border mk-surface-alt text-[11px] disabled:opacity-50 hover:bg-orange-50 dark:hover:bg-white/10">{loadingMore ? 'Loading…' : 'Load more'}</button>
+        )}
       </div>
       <div className="hidden md:block md:col-span-3">
         {detail ? (
@@ -4,15 +4,16 @@
 //  1.  POST /upload_found Volunteers a found person's details and photo
 //  2.  POST /upload_lost Volunteers a lost person's details and photo
 //  3.  GET  /search_face/{face_id} Views matches for a given face ID
-//  4.  GET  /get_all_lost /List all lost persons
-//  5.  GET  /get_all_found /List all found persons
+//  4.  GET  /get_all_lost?page=&page_size= /List all (or one page of) lost persons
+//  5.  GET  /get_all_found?page=&page_size= /List all (or one page of) found persons
 //  6.  GET  /get_all_matches /List all match records
 //  7.  GET  /health Health check
 //  8.  GET  /stats Statistics summary
 //  9.  GET  /check_matches/{face_id} Check matches for a given face ID
 // 10.  POST /cleanup_found_duplicates?threshold=<float> Manual duplicate cleanup
-// 11.  GET  /alert/{user_id} User alerts
+// 11.  GET  /alert/{user_id}?since=&limit=&unread_only= User alerts (POST /alert/{user_id}/read marks read)
 // 12.  GET  /get_records_by_user/{user_id} Get records by user
+// 13.  GET  /search_records?q=&search_in=&fields=&page=&page_size= Fuzzy metadata search
 // Backwards compatibility alias: createLostReport -> uploadLostPerson
 
 import axios from 'axios';
@@ -236,6 +237,36 @@ export const getAllLost = async (config) => cachedGet('/get_all_lost', config);
  */
 export const getAllFound = async (config) => cachedGet('/get_all_found', config);
 
+/**
+ * 4b/5b. One page of lost or found people (GET /get_all_lost|/get_all_found?page=&page_size=) – cached per page
+ * @param {'lost'|'found'} source
+ * @param {{ page?: number; pageSize?: number; includeImages?: boolean }} [options]
+ * Response adds page, page_size and has_more; total_count is the whole collection.
+ */
+export const getRecordsPage = async (source, options = {}, config) => {
+	if (source !== 'lost' && source !== 'found') throw new ApiError("source must be 'lost' or 'found'");
+	const params = new URLSearchParams({ page: String(options.page || 1) });
+	if (options.pageSize) params.set('page_size', String(options.pageSize));
+	if (options.includeImages === false) params.set('include_images', 'false');
+	return cachedGet(`/get_all_${source}?${params}`, config);
+};
+
+/**
+ * 13. Search Records (GET /search_records) – fuzzy name / location / mobile search
+ * @param {string} q search text (at least 2 characters)
+ * @param {{ searchIn?: 'lost'|'found'|'both'; fields?: string[]; page?: number; pageSize?: number; projection?: string[]; includeImages?: boolean }} [options]
+ */
+export const searchRecords = async (q, options = {}, config) => {
+	if (!q || q.trim().length < 2) throw new ApiError('searchRecords needs at least 2 characters');
+	const params = { q: q.trim(), search_in: options.searchIn || 'both' };
+	if (options.fields?.length) params.fields = options.fields.join(',');
+	if (options.page) params.page = options.page;
+	if (options.pageSize) params.page_size = options.pageSize;
+	if (options.projection?.length) params.projection = options.projection.join(',');
+	if (options.includeImages) params.include_images = true;
+	return exec(client.get('/search_records', withConfig({ ...config, params })));
+};
+
 /**
  * 6. Get All Matches (GET /get_all_matches) – cached
  */
@@ -331,10 +362,28 @@ export const cleanupFoundDuplicates = async (threshold, config) => {
 /**
  * 11. User Alerts (GET /alert/{user_id})
  * @param {string} userId
+ * @param {{ since?: string; limit?: number; unreadOnly?: boolean }} [options]
+ *   since: `next_since` from a previous response, to fetch only newer alerts
  */
-export const getUserAlerts = async (userId, config) => {
+export const getUserAlerts = async (userId, options = {}, config) => {
 	if (!userId) throw new ApiError('userId is required for getUserAlerts');
-	return exec(client.get(`/alert/${encodeURIComponent(userId)}`, withConfig(config)));
+	const params = {};
+	if (options.since) params.since = options.since;
+	if (options.limit) params.limit = options.limit;
+	if (options.unreadOnly) params.unread_only = true;
+	return exec(client.get(`/alert/${encodeURIComponent(userId)}`, withConfig({ ...config, params })));
+};
+
+/**
+ * 11b. Mark User Alerts Read (POST /alert/{user_id}/read?until=...)
+ * @param {string} userId
+ * @param {string} [until] `cursor` of the newest alert to mark read; it and all older alerts count as read (default all)
+ */
+export const markUserAlertsRead = async (userId, until, config) => {
+	if (!userId) throw new ApiError('userId is required for markUserAlertsRead');
+	const params = {};
+	if (until) params.until = until;
+	return exec(client.post(`/alert/${encodeURIComponent(userId)}/read`, null, withConfig({ ...config, params })));
 };
 
 /**
@@ -403,6 +452,7 @@ export const apiService = {
 	listLostReports,
 	getUserAlerts,
 	getRecordsByUser,
+	searchRecords,
 	normalizePersonRecord,
 	client // expose raw axios instance for advanced usage
 };
@@ -13,5 +13,46 @@ HOST = "0.0.0.0"
 PORT = 8000
 
 # Streaming Configuration
-FRAME_RATE = 10
-JPEG_QUALITY = 80
\ No newline at end of file
+# Defaults for viewers that do not pass ?fps=&quality=&width=
+FRAME_RATE = float(os.getenv("FRAME_RATE", 10))
+JPEG_QUALITY = int(os.getenv("JPEG_QUALITY", 80))
+# Named downscaled variants clients can pick with ?variant=, as name:width pairs.
+# Free-form ?width= values are rounded up to the nearest rung so encodes are shared.
+SUBSTREAM_LADDER = {
+    name.strip(): int(width)
+    for name, width in (
+        item.split(":") for item in os.getenv("SUBSTREAM_LADDER", "low:320,medium:640,high:1280").split(",") if item.strip()
+    )
+}
+# Seconds after its last viewer that a variant stops being reported and its cache entries are dropped
+VARIANT_IDLE_TIMEOUT = float(os.getenv("VARIANT_IDLE_TIMEOUT", 5))
+# Floors for the automatic downgrade of viewers whose connection falls behind
+MIN_FRAME_RATE = float(os.getenv("MIN_FRAME_RATE", 1))
+MIN_JPEG_QUALITY = int(os.getenv("MIN_JPEG_QUALITY", 30))
+
+# Capture Supervision
+# Reopen a failed camera after RECONNECT_MIN_DELAY seconds, doubling up to RECONNECT_MAX_DELAY
+RECONNECT_MIN_DELAY = float(os.getenv("RECONNECT_MIN_DELAY", 1))
+RECONNECT_MAX_DELAY = float(os.getenv("RECONNECT_MAX_DELAY", 60))
+# A camera that delivers no frame for this long is reopened
+STALL_TIMEOUT = float(os.getenv("STALL_TIMEOUT", 10))
+# Consecutive failed attempts before a camera is reported as failed
+FAILED_AFTER = int(os.getenv("FAILED_AFTER", 5))
+CAPTURE_OPEN_TIMEOUT_MS = int(os.getenv("CAPTURE_OPEN_TIMEOUT_MS", 10000))
+
+# Capture Lifecycle
+# Seconds a camera keeps capturing after its last viewer leaves, so reconnecting viewers reuse it
+CAPTURE_IDLE_GRACE = float(os.getenv("CAPTURE_IDLE_GRACE", 30))
+# Frames per second decoded for cameras without stream viewers (snapshot-only, pinned or idle)
+IDLE_FRAME_RATE = float(os.getenv("IDLE_FRAME_RATE", 1))
+# Comma-separated stream ids that are captured from startup and never stopped (e.g. for analytics)
+PINNED_STREAMS = [s.strip() for s in os.getenv("PINNED_STREAMS", "").split(",") if s.strip()]
+
+# Mosaic
+MOSAIC_FRAME_RATE = float(os.getenv("MOSAIC_FRAME_RATE", 5))
+MOSAIC_WIDTH = int(os.getenv("MOSAIC_WIDTH", 1920))
+# Default layout as COLUMNSxROWS (e.g. "4x4"); empty picks the smallest square grid that fits
+MOSAIC_LAYOUT = os.getenv("MOSAIC_LAYOUT", "")
+# Caps on tiles per layout and on composite size (default 4K), which bound each mosaic's canvas
+MOSAIC_MAX_STREAMS = int(os.getenv("MOSAIC_MAX_STREAMS", 64))
+MOSAIC_MAX_PIXELS = int(os.getenv("MOSAIC_MAX_PIXELS", 3840 * 2160))
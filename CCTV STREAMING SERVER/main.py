@@ -1,16 +1,20 @@
-from fastapi import FastAPI, WebSocket, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, WebSocket, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse, Response
+from email.utils import formatdate, parsedate_to_datetime
 from motor.motor_asyncio import AsyncIOMotorClient
-import cv2
-import asyncio
 import json
-from typing import List, Dict
-import io
-import threading
-from concurrent.futures import ThreadPoolExecutor
-import queue
+import math
+from typing import List, Optional
 import os
 from dotenv import load_dotenv
+from streaming import StreamRegistry, StreamProfile, Mosaic
+from config import (
+    FRAME_RATE, JPEG_QUALITY, MIN_FRAME_RATE, MIN_JPEG_QUALITY,
+    RECONNECT_MIN_DELAY, RECONNECT_MAX_DELAY, STALL_TIMEOUT, FAILED_AFTER, CAPTURE_OPEN_TIMEOUT_MS,
+    CAPTURE_IDLE_GRACE, PINNED_STREAMS, IDLE_FRAME_RATE,
+    MOSAIC_FRAME_RATE, MOSAIC_WIDTH, MOSAIC_LAYOUT, MOSAIC_MAX_STREAMS, MOSAIC_MAX_PIXELS,
+    SUBSTREAM_LADDER, VARIANT_IDLE_TIMEOUT
+)
 
 load_dotenv()
 
@@ -21,11 +25,31 @@ MONGO_URI = os.getenv("MONGO_URI")
 client = AsyncIOMotorClient(MONGO_URI)
 db = client.cctv_management
 
-# Thread pool for video processing
-executor = ThreadPoolExecutor(max_workers=10)
+# One capture per camera, shared by every viewer of that camera
+registry = StreamRegistry(
+    jpeg_quality=JPEG_QUALITY,
+    idle_grace=CAPTURE_IDLE_GRACE,
+    reconnect_min_delay=RECONNECT_MIN_DELAY,
+    reconnect_max_delay=RECONNECT_MAX_DELAY,
+    stall_timeout=STALL_TIMEOUT,
+    failed_after=FAILED_AFTER,
+    open_timeout_ms=CAPTURE_OPEN_TIMEOUT_MS,
+    idle_fps=IDLE_FRAME_RATE,
+    variant_idle_timeout=VARIANT_IDLE_TIMEOUT
+)
 
 @app.on_event("startup")
 async def startup_event():
+    registry.start_reaper()
+    if PINNED_STREAMS:
+        try:
+            streams = await db.cctvs.find({"_id": {"$in": PINNED_STREAMS}}).to_list(None)
+            for stream in streams:
+                if stream.get("video_source"):
+                    registry.pin(str(stream["_id"]), stream["video_source"])
+            print(f"Pinned {len(streams)} of {len(PINNED_STREAMS)} cameras")
+        except Exception as e:
+            print(f"Error pinning cameras: {e}")
     print("CCTV Streaming Server started")
 
 @app.get("/")
@@ -53,63 +77,55 @@ async def get_stream(stream_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-class VideoStreamer:
-    def __init__(self, rtsp_url: str):
-        self.rtsp_url = rtsp_url
-        self.frame_queue = queue.Queue(maxsize=10)
-        self.running = False
-        
-    def capture_frames(self):
-        cap = cv2.VideoCapture(self.rtsp_url)
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        
-        while self.running:
-            success, frame = cap.read()
-            if not success:
-                continue
-                
-            if not self.frame_queue.full():
-                ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-                if ret:
-                    try:
-                        self.frame_queue.put_nowait(buffer.tobytes())
-                    except queue.Full:
-                        pass
-        cap.release()
-        
-    def start(self):
-        self.running = True
-        threading.Thread(target=self.capture_frames, daemon=True).start()
-        
-    def stop(self):
-        self.running = False
-        
-    def get_frame(self):
-        try:
-            return self.frame_queue.get_nowait()
-        except queue.Empty:
-            return None
+def frame_width(variant: Optional[str], width: Optional[int]) -> Optional[int]:
+    """Width of the ladder rung a viewer gets; None for the camera's native resolution.
 
-async def generate_frames(rtsp_url: str):
-    streamer = VideoStreamer(rtsp_url)
-    streamer.start()
+    A free-form width is rounded up to the nearest rung, so every viewer of a
+    rung shares one resize and encode per frame.
+    """
+    if variant:
+        if variant not in SUBSTREAM_LADDER:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown variant '{variant}', expected one of: {', '.join(SUBSTREAM_LADDER)}"
+            )
+        return SUBSTREAM_LADDER[variant]
+    if width:
+        rungs = sorted(rung for rung in SUBSTREAM_LADDER.values() if rung >= width)
+        return rungs[0] if rungs else None
+    return None
+
+def stream_profile(fps: Optional[float], quality: Optional[int], width: Optional[int],
+                   variant: Optional[str] = None) -> StreamProfile:
+    """Viewer's requested profile, falling back to the configured defaults."""
+    return StreamProfile(
+        fps=fps or FRAME_RATE,
+        quality=quality or JPEG_QUALITY,
+        width=frame_width(variant, width),
+        min_fps=MIN_FRAME_RATE,
+        min_quality=MIN_JPEG_QUALITY
+    )
+
+async def generate_frames(stream_id: str, rtsp_url: str, profile: StreamProfile):
+    subscription = registry.subscribe(stream_id, rtsp_url, fps=profile.fps)
     
     try:
-        while True:
-            frame_bytes = await asyncio.get_event_loop().run_in_executor(
-                executor, streamer.get_frame
-            )
-            
-            if frame_bytes:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            
-            await asyncio.sleep(0.033)  # ~30 FPS
+        async for frame_bytes in subscription.frames(profile):
+            # The shared JPEG bytes are sent as their own chunk rather than copied into one
+            yield b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+            yield frame_bytes
+            yield b'\r\n'
     finally:
-        streamer.stop()
+        registry.unsubscribe(subscription)
 
 @app.get("/video/{stream_id}")
-async def video_feed(stream_id: str):
+async def video_feed(
+    stream_id: str,
+    fps: Optional[float] = Query(None, gt=0, le=60),
+    quality: Optional[int] = Query(None, ge=10, le=100),
+    width: Optional[int] = Query(None, ge=16, le=3840),
+    variant: Optional[str] = Query(None, description="Substream ladder rung, e.g. low, medium, high")
+):
     try:
         stream = await db.cctvs.find_one({"_id": stream_id})
         if not stream:
@@ -119,17 +135,139 @@ async def video_feed(stream_id: str):
         if not rtsp_url:
             raise HTTPException(status_code=400, detail="No video source found")
         
+        profile = stream_profile(fps, quality, width, variant)
         return StreamingResponse(
-            generate_frames(rtsp_url),
+            generate_frames(stream_id, rtsp_url, profile),
             media_type="multipart/x-mixed-replace; boundary=frame"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def resolve_mosaic(streams: str, layout: Optional[str], width: int):
+    """Camera documents (in requested order) and grid size for a mosaic ``width`` pixels wide."""
+    stream_ids = list(dict.fromkeys(s.strip() for s in streams.split(",") if s.strip()))
+    if not stream_ids:
+        raise HTTPException(status_code=400, detail="No streams given")
+    if len(stream_ids) > MOSAIC_MAX_STREAMS:
+        raise HTTPException(status_code=400, detail=f"At most {MOSAIC_MAX_STREAMS} streams per mosaic")
+
+    layout = layout or MOSAIC_LAYOUT
+    if layout:
+        try:
+            columns, rows = (int(n) for n in layout.lower().split("x"))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Layout must look like 4x4")
+        if columns < 1 or rows < 1 or columns * rows < len(stream_ids):
+            raise HTTPException(status_code=400, detail=f"Layout {layout} has room for fewer than {len(stream_ids)} streams")
+        if columns * rows > MOSAIC_MAX_STREAMS:
+            raise HTTPException(status_code=400, detail=f"Layout {layout} has more than {MOSAIC_MAX_STREAMS} tiles")
+    else:
+        columns = math.ceil(math.sqrt(len(stream_ids)))
+        rows = math.ceil(len(stream_ids) / columns)
+
+    tile_width, tile_height = Mosaic.tile_size(width, columns)
+    if tile_height < 1:
+        raise HTTPException(status_code=400, detail=f"{columns} columns do not fit in {width} pixels")
+    if tile_width * columns * tile_height * rows > MOSAIC_MAX_PIXELS:
+        raise HTTPException(status_code=400, detail=f"A {columns}x{rows} mosaic {width} pixels wide exceeds {MOSAIC_MAX_PIXELS} pixels")
+
+    found = {str(stream["_id"]): stream for stream in await db.cctvs.find({"_id": {"$in": stream_ids}}).to_list(None)}
+    missing = [stream_id for stream_id in stream_ids if not found.get(stream_id, {}).get("video_source")]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Streams not found or without video source: {', '.join(missing)}")
+    return [found[stream_id] for stream_id in stream_ids], columns, rows
+
+def mosaic_profile(fps: Optional[float], quality: Optional[int], width: Optional[int]) -> StreamProfile:
+    return StreamProfile(
+        fps=fps or MOSAIC_FRAME_RATE,
+        quality=quality or JPEG_QUALITY,
+        width=width or MOSAIC_WIDTH,
+        min_fps=MIN_FRAME_RATE,
+        min_quality=MIN_JPEG_QUALITY
+    )
+
+def open_mosaic(streams: List[dict], columns: int, rows: int, profile: StreamProfile) -> Mosaic:
+    subscriptions = [
+        registry.subscribe(str(stream["_id"]), stream["video_source"], fps=profile.fps) for stream in streams
+    ]
+    labels = [stream.get("name") or str(stream["_id"]) for stream in streams]
+    return Mosaic(subscriptions, labels, columns, rows, profile.width)
+
+async def generate_mosaic(streams: List[dict], columns: int, rows: int, profile: StreamProfile):
+    mosaic = open_mosaic(streams, columns, rows, profile)
+    
+    try:
+        async for frame_bytes in mosaic.frames(profile):
+            yield b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+            yield frame_bytes
+            yield b'\r\n'
+    finally:
+        for subscription in mosaic.subscriptions:
+            registry.unsubscribe(subscription)
+
+@app.get("/mosaic")
+async def mosaic_feed(
+    streams: str = Query(..., description="Comma-separated stream ids, in tile order"),
+    layout: Optional[str] = Query(None, description="COLUMNSxROWS, e.g. 4x4"),
+    fps: Optional[float] = Query(None, gt=0, le=30),
+    quality: Optional[int] = Query(None, ge=10, le=100),
+    width: Optional[int] = Query(None, ge=160, le=3840)
+):
+    """Several cameras tiled into one MJPEG stream."""
+    try:
+        profile = mosaic_profile(fps, quality, width)
+        docs, columns, rows = await resolve_mosaic(streams, layout, profile.width)
+        return StreamingResponse(
+            generate_mosaic(docs, columns, rows, profile),
+            media_type="multipart/x-mixed-replace; boundary=frame"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.websocket("/ws/mosaic")
+async def mosaic_websocket(
+    websocket: WebSocket,
+    streams: str = Query(...),
+    layout: Optional[str] = Query(None),
+    fps: Optional[float] = Query(None, gt=0, le=30),
+    quality: Optional[int] = Query(None, ge=10, le=100),
+    width: Optional[int] = Query(None, ge=160, le=3840)
+):
+    await websocket.accept()
+    mosaic = None
+    
+    try:
+        profile = mosaic_profile(fps, quality, width)
+        docs, columns, rows = await resolve_mosaic(streams, layout, profile.width)
+        mosaic = open_mosaic(docs, columns, rows, profile)
+        
+        async for frame_bytes in mosaic.frames(profile):
+            await websocket.send_bytes(frame_bytes)
+            
+    except HTTPException as e:
+        await websocket.send_text(json.dumps({"error": e.detail}))
+    except Exception as e:
+        await websocket.send_text(json.dumps({"error": str(e)}))
+    finally:
+        if mosaic:
+            for subscription in mosaic.subscriptions:
+                registry.unsubscribe(subscription)
+
 @app.websocket("/ws/{stream_id}")
-async def websocket_endpoint(websocket: WebSocket, stream_id: str):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    stream_id: str,
+    fps: Optional[float] = Query(None, gt=0, le=60),
+    quality: Optional[int] = Query(None, ge=10, le=100),
+    width: Optional[int] = Query(None, ge=16, le=3840),
+    variant: Optional[str] = Query(None)
+):
     await websocket.accept()
-    streamer = None
+    subscription = None
     
     try:
         stream = await db.cctvs.find_one({"_id": stream_id})
@@ -142,28 +280,100 @@ async def websocket_endpoint(websocket: WebSocket, stream_id: str):
             await websocket.send_text(json.dumps({"error": "No video source"}))
             return
         
-        streamer = VideoStreamer(rtsp_url)
-        streamer.start()
+        profile = stream_profile(fps, quality, width, variant)
+        subscription = registry.subscribe(stream_id, rtsp_url, fps=profile.fps)
         
-        while True:
-            frame_bytes = await asyncio.get_event_loop().run_in_executor(
-                executor, streamer.get_frame
-            )
-            
-            if frame_bytes:
-                await websocket.send_bytes(frame_bytes)
-            
-            await asyncio.sleep(0.033)  # ~30 FPS
+        async for frame_bytes in subscription.frames(profile):
+            await websocket.send_bytes(frame_bytes)
             
     except Exception as e:
         await websocket.send_text(json.dumps({"error": str(e)}))
     finally:
-        if streamer:
-            streamer.stop()
+        if subscription:
+            registry.unsubscribe(subscription)
+
+@app.get("/snapshot/{stream_id}")
+async def get_snapshot(
+    request: Request,
+    stream_id: str,
+    width: Optional[int] = Query(None, ge=16, le=3840),
+    quality: Optional[int] = Query(None, ge=10, le=100),
+    variant: Optional[str] = Query(None)
+):
+    """Latest frame of a camera as a JPEG, for grid views that refresh every few seconds.
+
+    Never waits for the camera: a camera that is not being captured is started
+    at its idle frame rate and 503 is returned until its first frame arrives.
+    Encoded snapshots are cached per size and revalidated with ETag.
+    """
+    try:
+        width = frame_width(variant, width)
+        camera = registry.get(stream_id)
+        if camera is None:
+            stream = await db.cctvs.find_one({"_id": stream_id})
+            if not stream:
+                raise HTTPException(status_code=404, detail="Stream not found")
+            rtsp_url = stream.get("video_source")
+            if not rtsp_url:
+                raise HTTPException(status_code=400, detail="No video source found")
+            camera = registry.touch(stream_id, rtsp_url)
+        else:
+            camera.touch()
+
+        seq, frame, published_at = camera.slot.latest()
+        if frame is None:
+            raise HTTPException(status_code=503, detail="No frame available yet", headers={"Retry-After": "1"})
+
+        quality, width = camera.encoded_frames.variant(frame, quality or camera.jpeg_quality, width)
+        etag = f'"{stream_id}-{int(published_at * 1000)}-q{quality}-w{width or 0}"'
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(published_at, usegmt=True),
+            "Cache-Control": "no-cache",
+            "X-Camera-State": camera.health()["state"]
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+                return Response(status_code=304, headers=headers)
+        elif request.headers.get("if-modified-since"):
+            try:
+                if int(published_at) <= parsedate_to_datetime(request.headers["if-modified-since"]).timestamp():
+                    return Response(status_code=304, headers=headers)
+            except (TypeError, ValueError):
+                pass
+
+        frame_bytes = await camera.jpeg(seq, frame, quality, width)
+        if frame_bytes is None:
+            raise HTTPException(status_code=500, detail="Could not encode frame")
+        return Response(content=frame_bytes, media_type="image/jpeg", headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/variants")
+async def get_variants():
+    """The substream ladder: variant names and their widths."""
+    return {"variants": SUBSTREAM_LADDER}
+
+@app.get("/captures")
+async def get_captures():
+    """Cameras currently being captured, with their health and viewer counts."""
+    return {"captures": registry.stats()}
+
+@app.get("/captures/{stream_id}")
+async def get_capture_health(stream_id: str):
+    """Health of one camera: connecting, live, stalled or failed; idle when nobody is watching."""
+    health = registry.health(stream_id)
+    if health is None:
+        return {"stream_id": stream_id, "state": "idle", "viewers": 0}
+    return {"stream_id": stream_id, **health}
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    executor.shutdown(wait=True)
+    registry.stop_all()
     client.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,696 @@
+import cv2
+import time
+import asyncio
+import threading
+import numpy as np
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+
+class FrameSlot:
+    """Latest frame of a camera with a sequence number that asyncio consumers can await.
+
+    The capture thread publishes into the slot; each consumer awaits a frame
+    newer than the last one it saw and is woken on its own event loop as soon
+    as one is published, so nobody polls and nobody gets the same frame twice.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._frame = None
+        self._published_at = None
+        self._closed = False
+        self._waiters = []
+
+    @staticmethod
+    def _wake(future: asyncio.Future):
+        if not future.done():
+            future.set_result(None)
+
+    def publish(self, frame) -> int:
+        with self._lock:
+            self._seq += 1
+            self._frame = frame
+            self._published_at = time.time()
+            waiters, self._waiters = self._waiters, []
+            seq = self._seq
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(self._wake, future)
+        return seq
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(self._wake, future)
+
+    def latest(self) -> Tuple[int, Optional[np.ndarray], Optional[float]]:
+        """Current ``(seq, frame, published_at)`` without waiting; frame is None before the first one."""
+        with self._lock:
+            return self._seq, self._frame, self._published_at
+
+    async def wait_next(self, after_seq: int) -> Tuple[int, Optional[np.ndarray]]:
+        """The first frame published after ``after_seq``; ``(seq, None)`` once the slot is closed."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._seq > after_seq:
+                    return self._seq, self._frame
+                if self._closed:
+                    return self._seq, None
+                future = loop.create_future()
+                waiter = (loop, future)
+                self._waiters.append(waiter)
+            try:
+                await future
+            finally:
+                if not future.done():
+                    with self._lock:
+                        if waiter in self._waiters:
+                            self._waiters.remove(waiter)
+
+
+class EncodedFrameCache:
+    """JPEG bytes of a camera's latest frame, one entry per quality/width variant.
+
+    A frame is encoded lazily, the first time a viewer asks for a variant of
+    it, and every other viewer of that variant gets the same bytes object.
+    Viewers racing for the same variant wait for a single encode. Downscaled
+    frames are cached per width too, so variants that differ only in quality
+    share one resize.
+
+    Only the latest frame's encodes and resizes are kept (see ``evict``), and
+    a variant nobody has read for ``idle_timeout`` seconds is forgotten.
+    """
+
+    def __init__(self, idle_timeout: float = 5.0):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._variant_locks: Dict[Tuple[int, Optional[int]], threading.Lock] = {}
+        self._entries: Dict[Tuple[int, Optional[int]], Tuple[int, bytes]] = {}
+        self._resize_locks: Dict[int, threading.Lock] = {}
+        self._resized: Dict[int, Tuple[int, np.ndarray]] = {}
+        self._last_read: Dict[Tuple[int, Optional[int]], float] = {}
+
+    @staticmethod
+    def variant(frame: np.ndarray, quality: int, width: Optional[int]) -> Tuple[int, Optional[int]]:
+        # Frames are only ever scaled down, so a width at or above the source is the source
+        if width is not None and width >= frame.shape[1]:
+            width = None
+        return int(quality), width
+
+    def cached(self, seq: int, variant: Tuple[int, Optional[int]]) -> Optional[bytes]:
+        with self._lock:
+            self._last_read[variant] = time.monotonic()
+        entry = self._entries.get(variant)
+        if entry is not None and entry[0] == seq:
+            return entry[1]
+        return None
+
+    def resized(self, seq: int, frame: np.ndarray, width: Optional[int]) -> np.ndarray:
+        """The frame scaled down to ``width``, resized at most once per frame and width."""
+        if width is None:
+            return frame
+        with self._lock:
+            resize_lock = self._resize_locks.setdefault(width, threading.Lock())
+        with resize_lock:
+            entry = self._resized.get(width)
+            if entry is not None and entry[0] == seq:
+                return entry[1]
+            height = max(1, round(frame.shape[0] * width / frame.shape[1]))
+            small = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            with self._lock:
+                if entry is None or entry[0] < seq:
+                    self._resized[width] = (seq, small)
+            return small
+
+    def variants(self) -> List[Tuple[int, Optional[int]]]:
+        """Variants being produced, i.e. the ones read within the last ``idle_timeout`` seconds."""
+        expired = time.monotonic() - self.idle_timeout
+        with self._lock:
+            live = [variant for variant, last_read in self._last_read.items() if last_read >= expired]
+        return sorted(live, key=lambda variant: (variant[1] or 0, variant[0]))
+
+    def evict(self, seq: int):
+        """Drop encodes and resizes of frames before ``seq``, and variants nobody reads any more.
+
+        Called by the capture thread when it publishes frame ``seq``: older
+        entries can never be served again, since viewers always move on to
+        the newest frame.
+        """
+        expired = time.monotonic() - self.idle_timeout
+        with self._lock:
+            for variant in [v for v, entry in self._entries.items() if entry[0] < seq]:
+                del self._entries[variant]
+            for width in [w for w, entry in self._resized.items() if entry[0] < seq]:
+                del self._resized[width]
+            for variant in [v for v, last_read in self._last_read.items() if last_read < expired]:
+                del self._last_read[variant]
+                self._variant_locks.pop(variant, None)
+            widths = {width for _, width in self._last_read}
+            for width in [w for w in self._resize_locks if w not in widths]:
+                del self._resize_locks[width]
+
+    def encode(self, seq: int, frame: np.ndarray, variant: Tuple[int, Optional[int]]) -> Optional[bytes]:
+        with self._lock:
+            variant_lock = self._variant_locks.setdefault(variant, threading.Lock())
+        with variant_lock:
+            frame_bytes = self.cached(seq, variant)
+            if frame_bytes is not None:
+                return frame_bytes
+
+            quality, width = variant
+            frame = self.resized(seq, frame, width)
+            ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if not ret:
+                return None
+            frame_bytes = buffer.tobytes()
+
+            with self._lock:
+                entry = self._entries.get(variant)
+                if entry is None or entry[0] < seq:
+                    self._entries[variant] = (seq, frame_bytes)
+            return frame_bytes
+
+
+class StreamProfile:
+    """Frame rate, JPEG quality and width one viewer asked for.
+
+    While the viewer's connection keeps up, frames are sent as requested. When
+    sends start taking longer than the frame interval, the viewer's buffer is
+    backing up, so the profile steps down (quality first, then frame rate) and
+    steps back up once sends have been fast for a while.
+    """
+
+    SLOW_SENDS_TO_DOWNGRADE = 3
+    FAST_SENDS_TO_UPGRADE = 50
+    QUALITY_STEP = 15
+
+    def __init__(self, fps: float, quality: int, width: Optional[int] = None,
+                 min_fps: float = 1.0, min_quality: int = 30):
+        self.requested_fps = fps
+        self.requested_quality = quality
+        self.width = width
+        self.levels = [(fps, quality)]
+        while True:
+            level_fps, level_quality = self.levels[-1]
+            if level_quality - self.QUALITY_STEP >= min_quality:
+                self.levels.append((level_fps, level_quality - self.QUALITY_STEP))
+            elif level_fps / 2 >= min_fps:
+                self.levels.append((level_fps / 2, level_quality))
+            else:
+                break
+        self.level = 0
+        self._slow_sends = 0
+        self._fast_sends = 0
+
+    @property
+    def fps(self) -> float:
+        return self.levels[self.level][0]
+
+    @property
+    def quality(self) -> int:
+        return self.levels[self.level][1]
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.fps
+
+    def record_send(self, seconds: float):
+        """Feed back how long handing one frame to the viewer took."""
+        if seconds > self.interval:
+            self._slow_sends += 1
+            self._fast_sends = 0
+            if self._slow_sends >= self.SLOW_SENDS_TO_DOWNGRADE and self.level < len(self.levels) - 1:
+                self.level += 1
+                self._slow_sends = 0
+        else:
+            self._slow_sends = 0
+            if seconds < self.interval / 2:
+                self._fast_sends += 1
+                if self._fast_sends >= self.FAST_SENDS_TO_UPGRADE and self.level > 0:
+                    self.level -= 1
+                    self._fast_sends = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fps": round(self.fps, 2),
+            "quality": self.quality,
+            "width": self.width,
+            "degraded": self.level > 0
+        }
+
+
+class Subscription:
+    """One viewer of a camera, remembering the last frame it was given."""
+
+    def __init__(self, camera: "CameraCapture", fps: Optional[float] = None):
+        self.camera = camera
+        self.last_seq = 0
+        # Highest frame rate this viewer consumes; None takes every frame
+        self.fps = fps
+
+    async def next_frame(self, quality: Optional[int] = None, width: Optional[int] = None) -> Optional[bytes]:
+        """Wait for the next new frame as JPEG bytes; None once the capture has stopped.
+
+        Frames are encoded off the event loop, once per variant, and shared
+        with every other viewer asking for the same quality and width.
+        """
+        while True:
+            self.last_seq, frame = await self.camera.slot.wait_next(self.last_seq)
+            if frame is None:
+                return None
+
+            frame_bytes = await self.camera.jpeg(self.last_seq, frame, quality, width)
+            if frame_bytes is not None:
+                return frame_bytes
+
+    async def frames(self, profile: StreamProfile) -> AsyncIterator[bytes]:
+        """JPEG frames paced to the profile's frame rate, adapting it to the viewer.
+
+        The time the consumer spends between receiving a frame and asking for
+        the next one is how long the frame took to send, which drives the
+        profile's downgrades and upgrades.
+        """
+        loop = asyncio.get_running_loop()
+        next_due = 0.0
+        self.fps = profile.fps
+        while True:
+            delay = next_due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            frame_bytes = await self.next_frame(profile.quality, profile.width)
+            if frame_bytes is None:
+                return
+
+            sent_at = loop.time()
+            yield frame_bytes
+            profile.record_send(loop.time() - sent_at)
+            self.fps = profile.fps
+            next_due = sent_at + profile.interval
+
+
+class Mosaic:
+    """Several cameras composited into one tiled frame, for control-room walls.
+
+    Tiles are drawn from the frames the shared captures already decoded; a
+    tile is only redrawn when its camera has published a new frame, and a
+    composite is only encoded when at least one tile changed.
+    """
+
+    TILE_ASPECT = 9 / 16
+    BACKGROUND = (24, 24, 24)
+
+    def __init__(self, subscriptions: List[Subscription], labels: List[str], columns: int, rows: int, width: int):
+        self.subscriptions = subscriptions
+        self.labels = labels
+        self.columns = columns
+        self.rows = rows
+        self.tile_width, self.tile_height = self.tile_size(width, columns)
+        self.canvas = np.full((self.tile_height * rows, self.tile_width * columns, 3), self.BACKGROUND, dtype=np.uint8)
+        self._drawn_seqs = [None] * len(subscriptions)
+
+    @classmethod
+    def tile_size(cls, width: int, columns: int) -> Tuple[int, int]:
+        """Width and height of each tile when ``columns`` tiles span ``width`` pixels."""
+        tile_width = width // columns
+        return tile_width, int(tile_width * cls.TILE_ASPECT) // 2 * 2
+
+    def _draw_tile(self, index: int, frame: Optional[np.ndarray]):
+        x = (index % self.columns) * self.tile_width
+        y = (index // self.columns) * self.tile_height
+        tile = self.canvas[y:y + self.tile_height, x:x + self.tile_width]
+        tile[:] = self.BACKGROUND
+        if frame is not None:
+            # Fit inside the tile, keeping the camera's aspect ratio
+            scale = min(self.tile_width / frame.shape[1], self.tile_height / frame.shape[0])
+            fit_width = max(1, int(frame.shape[1] * scale))
+            fit_height = max(1, int(frame.shape[0] * scale))
+            left = (self.tile_width - fit_width) // 2
+            top = (self.tile_height - fit_height) // 2
+            tile[top:top + fit_height, left:left + fit_width] = cv2.resize(
+                frame, (fit_width, fit_height), interpolation=cv2.INTER_AREA
+            )
+        else:
+            state = self.subscriptions[index].camera.health()["state"]
+            cv2.putText(tile, state, (8, self.tile_height // 2), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (160, 160, 160), 1)
+        cv2.putText(tile, self.labels[index], (8, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
+
+    def compose(self, quality: int, force: bool = False) -> Optional[bytes]:
+        """Redraw changed tiles and encode the composite; None if nothing changed."""
+        changed = force
+        for index, subscription in enumerate(self.subscriptions):
+            seq, frame, _ = subscription.camera.slot.latest()
+            if seq != self._drawn_seqs[index] or (frame is None and force):
+                self._draw_tile(index, frame)
+                self._drawn_seqs[index] = seq
+                changed = True
+        if not changed:
+            return None
+        ret, buffer = cv2.imencode('.jpg', self.canvas, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return buffer.tobytes() if ret else None
+
+    async def frames(self, profile: StreamProfile) -> AsyncIterator[bytes]:
+        """Composited JPEG frames paced to the profile, adapting to the viewer like a single stream.
+
+        Tiles of cameras without frames are refreshed every few seconds so
+        their health state stays current.
+        """
+        loop = asyncio.get_running_loop()
+        last_forced = 0.0
+        while True:
+            for subscription in self.subscriptions:
+                subscription.fps = profile.fps
+            started = loop.time()
+            force = started - last_forced >= 5.0
+            if force:
+                last_forced = started
+            frame_bytes = await loop.run_in_executor(None, self.compose, profile.quality, force)
+            if frame_bytes is not None:
+                sent_at = loop.time()
+                yield frame_bytes
+                profile.record_send(loop.time() - sent_at)
+            delay = started + profile.interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+
+class CameraCapture:
+    """A single cv2.VideoCapture for one camera, broadcasting each frame to every subscriber.
+
+    ``jpeg_quality`` is the quality used for viewers that do not ask for one.
+
+    The capture thread supervises its source. A source that cannot be opened,
+    or that delivers no frame for ``stall_timeout`` seconds, is released and
+    reopened after an exponential backoff (``reconnect_min_delay`` doubling up
+    to ``reconnect_max_delay``), so a dead camera sleeps instead of spinning
+    and recovers on its own. Its health is one of:
+
+    - connecting: opening the source
+    - live: frames are arriving
+    - stalled: opened, but no frame for ``stall_timeout`` seconds
+    - failed: ``failed_after`` consecutive attempts have failed; retries
+      continue at the maximum backoff
+
+    Frames are only decoded as fast as the fastest viewer needs them (see
+    ``delivery_interval``): without viewers (kept warm for snapshots, pinned,
+    or within the idle grace period) that is ``idle_fps``. The rest are
+    grabbed and dropped undecoded so the connection stays current.
+    """
+
+    def __init__(self, stream_id: str, source: str, jpeg_quality: int = 80,
+                 reconnect_min_delay: float = 1.0, reconnect_max_delay: float = 60.0,
+                 stall_timeout: float = 10.0, failed_after: int = 5, open_timeout_ms: int = 10000,
+                 idle_fps: float = 1.0, variant_idle_timeout: float = 5.0):
+        self.stream_id = stream_id
+        self.source = source
+        self.jpeg_quality = jpeg_quality
+        self.reconnect_min_delay = reconnect_min_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.stall_timeout = stall_timeout
+        self.failed_after = failed_after
+        self.open_timeout_ms = open_timeout_ms
+        self.idle_fps = idle_fps
+        self.subscribers = set()
+        self.pinned = False
+        self.idle_since: Optional[float] = time.monotonic()
+        self.slot = FrameSlot()
+        self.encoded_frames = EncodedFrameCache(variant_idle_timeout)
+        self.running = False
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._health: Dict[str, Any] = {
+            "state": "connecting", "since": time.time(), "last_frame_at": None,
+            "frames": 0, "decoded": 0, "reconnects": 0, "consecutive_failures": 0, "last_error": None
+        }
+
+    def _set_health(self, state: Optional[str] = None, **fields):
+        with self._lock:
+            if state is not None and state != self._health["state"]:
+                self._health["state"] = state
+                self._health["since"] = time.time()
+                print(f"Camera {self.stream_id}: {state}" + (f" ({fields['last_error']})" if fields.get("last_error") else ""))
+            self._health.update(fields)
+
+    def _open(self):
+        params = []
+        # Without these an unreachable RTSP host blocks open/read for the backend's default (~30 s)
+        for name in ("CAP_PROP_OPEN_TIMEOUT_MSEC", "CAP_PROP_READ_TIMEOUT_MSEC"):
+            if hasattr(cv2, name):
+                params += [getattr(cv2, name), self.open_timeout_ms]
+        cap = cv2.VideoCapture(self.source, cv2.CAP_ANY, params) if params else cv2.VideoCapture(self.source)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
+    def delivery_interval(self) -> float:
+        """Seconds between decoded frames: the fastest viewer's rate, or ``idle_fps`` without viewers.
+
+        0 means every frame is decoded, for viewers that did not set a rate.
+        """
+        with self._lock:
+            rates = [subscription.fps for subscription in self.subscribers]
+        if not rates:
+            return 1.0 / self.idle_fps
+        if None in rates:
+            return 0.0
+        return 1.0 / max(rates)
+
+    def _read_until_stalled(self, cap) -> Optional[str]:
+        """Publish frames until the capture stops or stalls; the stall reason, if any.
+
+        Every frame is grabbed, which keeps the stream current, but only frames
+        due for delivery are retrieved (decoded); the others are dropped undecoded.
+        """
+        last_frame = time.monotonic()
+        next_due = 0.0
+        while self.running:
+            success, frame = cap.grab(), None
+            now = time.monotonic()
+            if success and now >= next_due:
+                success, frame = cap.retrieve()
+                interval = self.delivery_interval()
+                # Keep a steady cadence, but don't burst to catch up after a gap
+                next_due = next_due + interval if now - next_due < interval else now + interval
+            if not success:
+                if now - last_frame >= self.stall_timeout:
+                    return f"no frame for {self.stall_timeout:g}s"
+                # A failed read can return immediately; don't spin on it
+                self._stopped.wait(0.05)
+                continue
+
+            last_frame = now
+            if self._health["state"] != "live":
+                self._set_health("live", consecutive_failures=0, last_error=None)
+            with self._lock:
+                self._health["frames"] += 1
+                self._health["last_frame_at"] = time.time()
+                if frame is not None:
+                    self._health["decoded"] += 1
+
+            # Decoded frames are published as-is; viewers encode the variant they need
+            if frame is not None:
+                self.encoded_frames.evict(self.slot.publish(frame))
+        return None
+
+    def capture_frames(self):
+        delay = self.reconnect_min_delay
+        attempts = 0
+        while self.running:
+            if attempts:
+                self._set_health(reconnects=self._health["reconnects"] + 1)
+            attempts += 1
+            cap = self._open()
+            if cap.isOpened():
+                error = self._read_until_stalled(cap)
+                if self._health["state"] == "live":
+                    delay = self.reconnect_min_delay
+            else:
+                error = "could not open source"
+            cap.release()
+            if not self.running:
+                break
+
+            failures = self._health["consecutive_failures"] + 1
+            if failures >= self.failed_after:
+                state = "failed"
+            elif self._health["state"] == "live" or error.startswith("no frame"):
+                state = "stalled"
+            else:
+                state = "connecting"
+            self._set_health(state, consecutive_failures=failures, last_error=error)
+
+            self._stopped.wait(delay)
+            delay = min(delay * 2, self.reconnect_max_delay)
+            if state != "failed":
+                self._set_health("connecting")
+        self.slot.close()
+
+    def start(self):
+        self.running = True
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.capture_frames, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        self._stopped.set()
+        self.slot.close()
+
+    def touch(self):
+        """Restart the idle clock of a camera that has no viewers."""
+        with self._lock:
+            if not self.subscribers:
+                self.idle_since = time.monotonic()
+
+    async def jpeg(self, seq: int, frame: np.ndarray, quality: Optional[int] = None,
+                   width: Optional[int] = None) -> Optional[bytes]:
+        """JPEG bytes of a published frame, encoded off the event loop at most once per variant."""
+        cache = self.encoded_frames
+        variant = cache.variant(frame, quality or self.jpeg_quality, width)
+        frame_bytes = cache.cached(seq, variant)
+        if frame_bytes is None:
+            frame_bytes = await asyncio.get_running_loop().run_in_executor(
+                None, cache.encode, seq, frame, variant
+            )
+        return frame_bytes
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            health = dict(self._health)
+            health["viewers"] = len(self.subscribers)
+            health["pinned"] = self.pinned
+            health["variants"] = [
+                {"quality": quality, "width": width} for quality, width in self.encoded_frames.variants()
+            ]
+            health["idle_seconds"] = round(time.monotonic() - self.idle_since, 1) if self.idle_since is not None else None
+        return health
+
+    def add(self, subscription: Subscription) -> int:
+        with self._lock:
+            self.subscribers.add(subscription)
+            self.idle_since = None
+            return len(self.subscribers)
+
+    def remove(self, subscription: Subscription) -> int:
+        with self._lock:
+            self.subscribers.discard(subscription)
+            if not self.subscribers and self.idle_since is None:
+                self.idle_since = time.monotonic()
+            return len(self.subscribers)
+
+
+class StreamRegistry:
+    """Runs at most one capture per camera and reference-counts its viewers.
+
+    Captures start lazily, when the first viewer of a camera subscribes, and
+    stop ``idle_grace`` seconds after the last one leaves, so a viewer that
+    reconnects (or a page reload) reuses the open session instead of tearing
+    down and reopening the RTSP connection. Pinned cameras are kept running
+    with or without viewers.
+    """
+
+    def __init__(self, jpeg_quality: int = 80, idle_grace: float = 30.0, **capture_options):
+        """``capture_options`` are passed to every CameraCapture (reconnect and stall settings)."""
+        self.jpeg_quality = jpeg_quality
+        self.idle_grace = idle_grace
+        self.capture_options = capture_options
+        self._cameras: Dict[str, CameraCapture] = {}
+        self._lock = threading.Lock()
+        self._reaper_stopped = threading.Event()
+        self._reaper = None
+
+    def _camera(self, stream_id: str, source: str) -> CameraCapture:
+        # Caller holds self._lock
+        camera = self._cameras.get(stream_id)
+        if camera is None:
+            camera = CameraCapture(stream_id, source, self.jpeg_quality, **self.capture_options)
+            self._cameras[stream_id] = camera
+            camera.start()
+        return camera
+
+    def subscribe(self, stream_id: str, source: str, fps: Optional[float] = None) -> Subscription:
+        """Start watching a camera; ``fps`` caps how fast its frames need decoding for this viewer."""
+        with self._lock:
+            camera = self._camera(stream_id, source)
+            subscription = Subscription(camera, fps)
+            camera.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        # The capture keeps running for the grace period; reap_idle stops it
+        subscription.camera.remove(subscription)
+        if self.idle_grace <= 0:
+            self.reap_idle()
+
+    def get(self, stream_id: str) -> Optional[CameraCapture]:
+        with self._lock:
+            return self._cameras.get(stream_id)
+
+    def touch(self, stream_id: str, source: str) -> CameraCapture:
+        """Start a camera without subscribing, or keep an idle one from being reaped.
+
+        Used by snapshot requests: the camera runs at its idle frame rate and
+        is stopped once nobody has touched or watched it for the grace period.
+        """
+        with self._lock:
+            camera = self._camera(stream_id, source)
+            camera.touch()
+            return camera
+
+    def pin(self, stream_id: str, source: str):
+        """Start a camera now and keep it running regardless of viewers."""
+        with self._lock:
+            self._camera(stream_id, source).pinned = True
+
+    def unpin(self, stream_id: str):
+        with self._lock:
+            camera = self._cameras.get(stream_id)
+            if camera is not None:
+                camera.pinned = False
+
+    def reap_idle(self) -> int:
+        """Stop captures that have had no viewers for the grace period. Returns how many stopped."""
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                stream_id for stream_id, camera in self._cameras.items()
+                if not camera.pinned and camera.idle_since is not None and now - camera.idle_since >= self.idle_grace
+            ]
+            for stream_id in idle:
+                self._cameras.pop(stream_id).stop()
+        for stream_id in idle:
+            print(f"Camera {stream_id}: stopped after {self.idle_grace:g}s without viewers")
+        return len(idle)
+
+    def _reap_loop(self):
+        interval = min(max(self.idle_grace / 4, 1.0), 30.0)
+        while not self._reaper_stopped.wait(interval):
+            try:
+                self.reap_idle()
+            except Exception as e:
+                print(f"Error reaping idle captures: {e}")
+
+    def start_reaper(self):
+        self._reaper_stopped.clear()
+        self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+        self._reaper.start()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Health and viewer count per running camera."""
+        with self._lock:
+            cameras = list(self._cameras.items())
+        return {stream_id: camera.health() for stream_id, camera in cameras}
+
+    def health(self, stream_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            camera = self._cameras.get(stream_id)
+        return camera.health() if camera else None
+
+    def stop_all(self):
+        self._reaper_stopped.set()
+        with self._lock:
+            for camera in self._cameras.values():
+                camera.stop()
+            self._cameras.clear()
@@ -0,0 +1,123 @@
+import asyncio
+import math
+import time
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionController:
+    """Bound the number of in-flight and queued inference jobs.
+
+    Requests beyond the configured queue depth, or whose estimated queue wait
+    exceeds ``max_queue_wait`` seconds, are rejected with 429 and a
+    ``Retry-After`` header derived from the observed job throughput.
+    """
+
+    def __init__(self, max_concurrency: int = 1, max_queue: int = 8,
+                 max_queue_wait: float = 30.0, smoothing: float = 0.2):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.max_queue_wait = max_queue_wait
+        self.smoothing = smoothing
+
+        # Created lazily so it binds to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.avg_service_time: Optional[float] = None
+        self.avg_queue_wait = 0.0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def throughput(self) -> Optional[float]:
+        """Estimated completed jobs per second at full concurrency."""
+        if not self.avg_service_time:
+            return None
+        return self.max_concurrency / self.avg_service_time
+
+    def estimated_wait(self, position: int) -> float:
+        """Estimated seconds until a job at queue ``position`` starts."""
+        if self.in_flight < self.max_concurrency:
+            return 0.0
+        rate = self.throughput()
+        if rate is None:
+            return 0.0
+        return position / rate
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait before retrying."""
+        rate = self.throughput()
+        if rate is None:
+            return max(1, int(math.ceil(self.max_queue_wait / 2)))
+        return min(120, max(1, int(math.ceil((self.waiting + 1) / rate))))
+
+    def _reject(self, reason: str):
+        self.rejected += 1
+        retry_after = self.retry_after()
+        logger.warning(f"Rejecting inference request ({reason}), retry after {retry_after}s")
+        raise HTTPException(
+            status_code=429,
+            detail="Server is busy processing other uploads, please retry shortly",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+    def _record(self, attr: str, value: float):
+        current = getattr(self, attr)
+        if current is None:
+            setattr(self, attr, value)
+        else:
+            setattr(self, attr, (1 - self.smoothing) * current + self.smoothing * value)
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold an inference slot for the duration of the block or raise 429."""
+        if self.waiting + self.in_flight >= self.max_concurrency + self.max_queue:
+            self._reject(f"queue full: {self.waiting} waiting")
+        if self.estimated_wait(self.waiting + 1) > self.max_queue_wait:
+            self._reject(f"estimated queue wait above {self.max_queue_wait}s")
+
+        semaphore = self._get_semaphore()
+        enqueued = time.monotonic()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.max_queue_wait)
+        except asyncio.TimeoutError:
+            self._reject(f"waited more than {self.max_queue_wait}s in queue")
+        finally:
+            self.waiting -= 1
+
+        started = time.monotonic()
+        self._record("avg_queue_wait", started - enqueued)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+            self.completed += 1
+            self._record("avg_service_time", time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current admission state for health reporting."""
+        rate = self.throughput()
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_service_time_seconds": round(self.avg_service_time, 3) if self.avg_service_time else None,
+            "avg_queue_wait_seconds": round(self.avg_queue_wait, 3),
+            "throughput_per_second": round(rate, 3) if rate else None
+        }
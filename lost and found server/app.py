@@ -3,22 +3,36 @@ import cv2
 import base64
 import uuid
 import json
+import time
 import logging
+import threading
 from datetime import datetime
+from functools import partial
 import numpy as np
 
 # Set DeepFace home directory before importing DeepFace
 os.environ['DEEPFACE_HOME'] = '/tmp/.deepface'
 
-from fastapi import FastAPI, HTTPException, File, Form, UploadFile
+from fastapi import FastAPI, HTTPException, File, Form, UploadFile, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from pymongo import MongoClient
-from bson import ObjectId
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+from bson import ObjectId, Binary
 from dotenv import load_dotenv
 from deepface import DeepFace
 from ultralytics import YOLO
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+
+from admission import AdmissionController
+from face_index import FaceIndex, EMBEDDING_DIM, normalize_embeddings, calibrate_similarity
+from index_snapshot import FaceIndexStore
+from sharding import ShardedFaceIndex
+from quantization import get_codec
+from image_hash import perceptual_hash, format_hash, hash_bands, hamming_distance, PHASH_MAX_DISTANCE
+from face_quality import assess_face_quality, quality_problems
+from cross_match import CrossMatchJob
+from text_search import query_keys, rank_matches, search_keys
 
 # Load environment variables
 load_dotenv()
@@ -31,6 +45,52 @@ logger = logging.getLogger(__name__)
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "lost_and_found")
 
+# Inference admission configuration
+INFERENCE_MAX_CONCURRENCY = int(os.getenv("INFERENCE_MAX_CONCURRENCY", "1"))
+INFERENCE_MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", "8"))
+INFERENCE_MAX_QUEUE_WAIT = float(os.getenv("INFERENCE_MAX_QUEUE_WAIT", "30"))
+
+# Face embedding index configuration
+INDEX_SNAPSHOT_DIR = os.getenv("INDEX_SNAPSHOT_DIR", "models/face_index")
+INDEX_SNAPSHOT_INTERVAL = int(os.getenv("INDEX_SNAPSHOT_INTERVAL", "300"))
+# How often workers pick up index changes written by other workers
+INDEX_REFRESH_INTERVAL = float(os.getenv("INDEX_REFRESH_INTERVAL", "5"))
+FACE_INDEX_SHARDS = int(os.getenv("FACE_INDEX_SHARDS", "1"))
+FACE_INDEX_QUANTIZATION = os.getenv("FACE_INDEX_QUANTIZATION", "none")
+# Cursor batch size when streaming stored embeddings into an index at startup
+EMBEDDING_LOAD_BATCH_SIZE = int(os.getenv("EMBEDDING_LOAD_BATCH_SIZE", "10000"))
+
+# ArcFace cosine distance threshold used by DeepFace.verify is 0.68, i.e. similarity 0.32
+MATCH_SIMILARITY_THRESHOLD = float(os.getenv("MATCH_SIMILARITY_THRESHOLD", "0.32"))
+MATCH_CALIBRATION_SCALE = float(os.getenv("MATCH_CALIBRATION_SCALE", "12"))
+
+# Matching cascade: embedding pre-rank, then DeepFace.verify on the top candidates only
+CASCADE_VERIFY_TOP_K = int(os.getenv("CASCADE_VERIFY_TOP_K", "5"))
+CASCADE_MIN_SIMILARITY = float(os.getenv("CASCADE_MIN_SIMILARITY", "0.15"))
+# Duplicate check on found uploads: only the closest found faces above this similarity
+# (duplicates need a verify distance below 0.1, i.e. similarity above 0.9) are verified
+DUPLICATE_VERIFY_TOP_K = int(os.getenv("DUPLICATE_VERIFY_TOP_K", "3"))
+DUPLICATE_MIN_SIMILARITY = float(os.getenv("DUPLICATE_MIN_SIMILARITY", "0.8"))
+
+# Face quality gate applied before embedding and storage
+FACE_MIN_SIZE = int(os.getenv("FACE_MIN_SIZE", "40"))
+FACE_MIN_SHARPNESS = float(os.getenv("FACE_MIN_SHARPNESS", "20"))
+FACE_MIN_CONFIDENCE = float(os.getenv("FACE_MIN_CONFIDENCE", "0.5"))
+# Weight of the lowest-quality gallery entries when ranking match candidates
+QUALITY_WEIGHT_FLOOR = float(os.getenv("QUALITY_WEIGHT_FLOOR", "0.7"))
+
+# Group photo uploads: cap on faces taken from one photo and size of the stored source photo
+GROUP_MAX_FACES = int(os.getenv("GROUP_MAX_FACES", "50"))
+SOURCE_PHOTO_MAX_SIDE = int(os.getenv("SOURCE_PHOTO_MAX_SIDE", "1280"))
+
+# Background lost x found cross-matching over stored embeddings (interval 0 disables the schedule)
+CROSS_MATCH_INTERVAL = int(os.getenv("CROSS_MATCH_INTERVAL", "3600"))
+CROSS_MATCH_CHUNK_ROWS = int(os.getenv("CROSS_MATCH_CHUNK_ROWS", "1024"))
+# With verification, candidate pairs go through DeepFace.verify like the upload cascade;
+# without it, pairs above MATCH_SIMILARITY_THRESHOLD are recorded as unverified "candidate"
+# matches, which do not change record status or alert anyone
+CROSS_MATCH_VERIFY = os.getenv("CROSS_MATCH_VERIFY", "false").lower() == "true"
+
 try:
     # Connect to MongoDB
     client = MongoClient(MONGO_URI)
@@ -38,6 +98,10 @@ try:
     lost_collection = db['lost_people']
     found_collection = db['found_people']
     match_collection = db['match_records']
+    embedding_collection = db['face_embeddings']
+    source_photo_collection = db['source_photos']
+    alert_collection = db['alert_inbox']
+    alert_cursor_collection = db['alert_read_cursors']
     logger.info("Connected to MongoDB successfully")
 except Exception as e:
     logger.error(f"Failed to connect to MongoDB: {e}")
@@ -63,18 +127,450 @@ except Exception as e:
     logger.error(f"Failed to load YOLO model: {e}")
     face_model = None
 
+# Admission control for inference-heavy endpoints. Handlers that take a slot are
+# plain functions, so FastAPI runs them in its thread pool and the event loop
+# keeps serving lightweight read endpoints while inference is in progress.
+admission_controller = AdmissionController(
+    max_concurrency=INFERENCE_MAX_CONCURRENCY,
+    max_queue=INFERENCE_MAX_QUEUE,
+    max_queue_wait=INFERENCE_MAX_QUEUE_WAIT
+)
 
-def crop_face(image: np.ndarray) -> np.ndarray:
-    """Extract and crop face from image using YOLO face detection."""
+
+async def inference_slot():
+    """Dependency that holds an inference slot for the request or rejects it with 429."""
+    async with admission_controller.admit():
+        yield
+
+
+# Maintenance jobs (duplicate cleanup) run for minutes, so they get their own
+# single slot with no queue: they never block uploads and their duration does
+# not skew the upload controller's service-time estimate.
+maintenance_controller = AdmissionController(max_concurrency=1, max_queue=0)
+
+
+async def maintenance_slot():
+    """Dependency that holds the maintenance slot or rejects the request with 429."""
+    async with maintenance_controller.admit():
+        yield
+
+# In-memory face embedding indexes, persisted as memory-mapped snapshots plus a WAL
+source_collections = {
+    "lost": lost_collection,
+    "found": found_collection
+}
+if FACE_INDEX_SHARDS > 1:
+    # Partition each index across worker processes for large galleries
+    face_index_factory = partial(ShardedFaceIndex, num_shards=FACE_INDEX_SHARDS)
+else:
+    face_index_factory = FaceIndex
+face_index_stores = {
+    source: FaceIndexStore(INDEX_SNAPSHOT_DIR, source, index_factory=face_index_factory,
+                           codec=get_codec(FACE_INDEX_QUANTIZATION))
+    for source in source_collections
+}
+collection_sources = {collection.name: source for source, collection in source_collections.items()}
+# Set once every index has been loaded or rebuilt
+face_index_ready = threading.Event()
+
+
+async def face_index_required():
+    """Dependency that rejects the request with 503 until the face indexes are loaded.
+
+    Declared before ``inference_slot`` so a request that cannot be served does
+    not take, or queue for, an inference slot.
+    """
+    if not face_index_ready.is_set():
+        # Searching a partially loaded index would silently miss records
+        raise HTTPException(status_code=503, detail="Face index is still loading", headers={"Retry-After": "5"})
+
+# Record metadata searched by /search_records; each record stores its trigram
+# keys in a multikey-indexed field so every worker searches the same data
+TEXT_SEARCH_FIELDS = ("name", "location", "mobile", "reporter")
+# Set once records saved before the search keys existed have been backfilled
+text_search_ready = threading.Event()
+
+cross_match_job = CrossMatchJob(
+    k=CASCADE_VERIFY_TOP_K,
+    min_similarity=CASCADE_MIN_SIMILARITY if CROSS_MATCH_VERIFY else MATCH_SIMILARITY_THRESHOLD,
+    lost_chunk_rows=CROSS_MATCH_CHUNK_ROWS
+)
+
+
+def detect_faces(image: np.ndarray) -> List[Tuple[np.ndarray, float, List[int]]]:
+    """Detect every face in an image using YOLO face detection.
+
+    Returns (cropped face, detector confidence, [x1, y1, x2, y2]) for each box,
+    most confident first. Empty if no face was found.
+    """
     if face_model is None:
         raise HTTPException(status_code=500, detail="Face detection model not available")
 
     results = face_model.predict(image, verbose=False)
-    if results and results[0].boxes and results[0].boxes.xyxy.shape[0] > 0:
-        x1, y1, x2, y2 = results[0].boxes.xyxy[0].cpu().numpy().astype(int)
+    if not results or not results[0].boxes or results[0].boxes.xyxy.shape[0] == 0:
+        return []
+
+    boxes = np.maximum(results[0].boxes.xyxy.cpu().numpy().astype(int), 0)
+    confidences = results[0].boxes.conf.cpu().numpy()
+    faces = []
+    for i in np.argsort(-confidences):
+        x1, y1, x2, y2 = boxes[i]
         cropped_face = image[y1:y2, x1:x2]
-        return cropped_face
-    raise HTTPException(status_code=400, detail="No face detected in the image")
+        if cropped_face.size:
+            faces.append((cropped_face, float(confidences[i]), [int(x1), int(y1), int(x2), int(y2)]))
+    return faces
+
+
+def detect_face(image: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Extract and crop the most confident face from image using YOLO face detection.
+
+    Returns the cropped face and the detector confidence for its box.
+    """
+    faces = detect_faces(image)
+    if not faces:
+        raise HTTPException(status_code=400, detail="No face detected in the image")
+    cropped_face, confidence, _ = faces[0]
+    return cropped_face, confidence
+
+
+def crop_face(image: np.ndarray) -> np.ndarray:
+    """Extract and crop face from image using YOLO face detection."""
+    return detect_face(image)[0]
+
+
+def check_face_quality(cropped_face: np.ndarray, confidence: float) -> Dict[str, Any]:
+    """Score a detected face and reject it before embedding if it can never match reliably."""
+    quality = assess_face_quality(cropped_face, confidence)
+    problems = quality_problems(quality, FACE_MIN_SIZE, FACE_MIN_SHARPNESS, FACE_MIN_CONFIDENCE)
+    if problems:
+        logger.info(f"Rejected low quality face: {quality}")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Face quality too low ({'; '.join(problems)}). Please upload a clearer photo."
+        )
+    return quality
+
+
+def quality_weight(quality_score: Optional[float]) -> float:
+    """Ranking weight for a gallery face; records without a quality score count as full quality."""
+    if quality_score is None:
+        return 1.0
+    return QUALITY_WEIGHT_FLOOR + (1.0 - QUALITY_WEIGHT_FLOOR) * quality_score
+
+
+def decode_face_blob(face_blob: str) -> Optional[np.ndarray]:
+    """Decode a base64 JPEG face blob into a BGR image, or None if it is invalid."""
+    if not face_blob:
+        return None
+    img_bytes = base64.b64decode(face_blob)
+    return cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_COLOR)
+
+
+def compute_face_embedding(face_image: np.ndarray) -> np.ndarray:
+    """Compute a normalised ArcFace embedding for an already cropped face."""
+    result = DeepFace.represent(
+        face_image,
+        model_name="ArcFace",
+        enforce_detection=False,
+        detector_backend="skip"
+    )
+    return normalize_embeddings(result[0]["embedding"])
+
+
+def compute_face_embeddings(face_images: List[np.ndarray]) -> np.ndarray:
+    """Compute normalised ArcFace embeddings for several cropped faces.
+
+    All crops go through DeepFace in one batched call; DeepFace versions that
+    do not accept a list of images fall back to one call per face.
+    """
+    if not face_images:
+        return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+    try:
+        results = DeepFace.represent(
+            face_images,
+            model_name="ArcFace",
+            enforce_detection=False,
+            detector_backend="skip"
+        )
+        # Batched calls return one result list per input image
+        embeddings = [result[0]["embedding"] for result in results]
+        if len(embeddings) != len(face_images):
+            raise ValueError("batched represent returned a different number of embeddings")
+    except Exception as e:
+        logger.info(f"Batched embedding unavailable ({e}), embedding faces one at a time")
+        return np.stack([compute_face_embedding(face_image) for face_image in face_images])
+    return normalize_embeddings(np.asarray(embeddings, dtype=np.float32))
+
+
+def store_face_embedding(source: str, face_id: str, embedding: np.ndarray) -> None:
+    """Persist a face embedding and add it to the in-memory index for its source."""
+    embedding_collection.update_one(
+        {"face_id": face_id},
+        {"$set": {
+            "face_id": face_id,
+            "source": source,
+            "model": "ArcFace",
+            "embedding": Binary(np.asarray(embedding, dtype=np.float32).tobytes()),
+            "updated_time": datetime.now().isoformat()
+        }},
+        upsert=True
+    )
+    face_index_stores[source].add(face_id, embedding)
+
+
+def remove_face_embedding(source: str, face_id: str) -> None:
+    """Delete a face embedding from the database and the in-memory index."""
+    try:
+        embedding_collection.delete_one({"face_id": face_id})
+        face_index_stores[source].remove(face_id)
+    except Exception as e:
+        logger.error(f"Error removing embedding for {face_id}: {e}")
+
+
+def record_search_text(record: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """Searchable metadata of a lost or found record, keyed by TEXT_SEARCH_FIELDS."""
+    reported_by = record.get("reported_by") or {}
+    return {
+        "name": record.get("name"),
+        "location": record.get("where_lost") or record.get("location_found"),
+        "mobile": (record.get("contact_details") or {}).get("mobile_no"),
+        "reporter": record.get("reporter_name") or reported_by.get("name")
+    }
+
+
+# Record fields /search_records callers may project (face_blob only with include_images)
+SEARCH_PROJECTION_FIELDS = {
+    "face_id", "name", "gender", "age", "where_lost", "location_found", "reporter_name",
+    "relation_with_lost", "reported_by", "user_id", "contact_details", "face_quality",
+    "upload_time", "status", "status_updated_time", "source_photo_id", "source_face_box", "face_blob"
+}
+
+# Fields read from MongoDB to backfill the search keys
+TEXT_SEARCH_PROJECTION = {
+    "_id": 0, "face_id": 1, "name": 1, "where_lost": 1, "location_found": 1,
+    "contact_details.mobile_no": 1, "reporter_name": 1, "reported_by.name": 1
+}
+
+
+def add_search_keys(record: Dict[str, Any]) -> None:
+    """Store the record's text search keys on it before it is saved."""
+    try:
+        record["search_grams"] = search_keys(record_search_text(record))
+    except Exception as e:
+        logger.error(f"Error computing search keys for {record.get('face_id')}: {e}")
+
+
+def backfill_search_keys() -> None:
+    """Add search keys to records saved before they existed, in batches of bulk updates."""
+    for source, collection in source_collections.items():
+        try:
+            started = time.time()
+            updated = 0
+            batch = []
+            for doc in collection.find({"search_grams": {"$exists": False}}, TEXT_SEARCH_PROJECTION, batch_size=5000):
+                if not doc.get("face_id"):
+                    continue
+                batch.append(UpdateOne({"face_id": doc["face_id"]},
+                                       {"$set": {"search_grams": search_keys(record_search_text(doc))}}))
+                if len(batch) >= 1000:
+                    updated += collection.bulk_write(batch, ordered=False).modified_count
+                    batch = []
+            if batch:
+                updated += collection.bulk_write(batch, ordered=False).modified_count
+            if updated:
+                logger.info(f"Added search keys to {updated} {source} records in {time.time() - started:.1f}s")
+        except Exception as e:
+            logger.error(f"Error backfilling {source} search keys: {e}")
+    text_search_ready.set()
+
+
+def load_stored_embeddings(source: str) -> Tuple[List[str], np.ndarray]:
+    """Stream the stored embeddings of one source from MongoDB into a preallocated matrix.
+
+    Only ``face_id`` and the raw embedding bytes are read, in large cursor
+    batches, and each row is copied straight into place: no images are
+    decoded and no per-row arrays are kept around.
+    """
+    started = time.time()
+    query = {"source": source}
+    capacity = max(embedding_collection.count_documents(query), 1)
+    matrix = np.empty((capacity, EMBEDDING_DIM), dtype=np.float32)
+    face_ids = []
+    cursor = embedding_collection.find(query, {"_id": 0, "face_id": 1, "embedding": 1},
+                                       batch_size=EMBEDDING_LOAD_BATCH_SIZE)
+    for doc in cursor:
+        embedding = np.frombuffer(doc["embedding"], dtype=np.float32)
+        if embedding.shape[0] != EMBEDDING_DIM:
+            logger.error(f"Skipping {source} embedding {doc.get('face_id')} with dimension {embedding.shape[0]}")
+            continue
+        row = len(face_ids)
+        if row == len(matrix):
+            # Documents inserted since the count; grow instead of failing the load
+            grown = np.empty((2 * len(matrix), EMBEDDING_DIM), dtype=np.float32)
+            grown[:row] = matrix
+            matrix = grown
+        matrix[row] = embedding
+        face_ids.append(doc["face_id"])
+    matrix = matrix[:len(face_ids)]
+
+    elapsed = time.time() - started
+    rate = len(face_ids) / elapsed if elapsed > 0 else 0.0
+    logger.info(f"Loaded {len(face_ids)} {source} embeddings from MongoDB in {elapsed:.2f}s "
+                f"({rate:.0f}/s, {matrix.nbytes / 2 ** 20:.1f} MB)")
+    return face_ids, matrix
+
+
+def rebuild_face_index(source: str) -> None:
+    """Rebuild an index from MongoDB, re-embedding records that have no stored embedding."""
+    store = face_index_stores[source]
+    face_ids, embeddings = load_stored_embeddings(source)
+    if face_ids:
+        store.bulk_add(face_ids, embeddings)
+
+    # Only records without a stored embedding need their face image
+    indexed = set(face_ids)
+    missing = [doc["face_id"] for doc in source_collections[source].find({}, {"_id": 0, "face_id": 1})
+               if doc.get("face_id") and doc["face_id"] not in indexed]
+    reembedded = 0
+    for start in range(0, len(missing), 500):
+        for doc in source_collections[source].find({"face_id": {"$in": missing[start:start + 500]}},
+                                                   {"face_id": 1, "face_blob": 1}):
+            try:
+                face_image = decode_face_blob(doc.get("face_blob"))
+                if face_image is None:
+                    continue
+                store_face_embedding(source, doc["face_id"], compute_face_embedding(face_image))
+                reembedded += 1
+            except Exception as e:
+                logger.error(f"Error re-embedding {source} face {doc.get('face_id')}: {e}")
+
+    logger.info(f"Rebuilt {source} face index from MongoDB: {len(face_ids)} stored, {reembedded} re-embedded")
+    # Workers without the writer lock wait for this snapshot instead of rebuilding themselves
+    store.snapshot()
+
+
+def load_face_index(source: str) -> None:
+    """Map an index's snapshot; without one, the writer rebuilds it and the other workers wait for its snapshot.
+
+    A waiting worker takes over the writer lock, and the rebuild, if the writer exits first.
+    """
+    store = face_index_stores[source]
+    started = time.time()
+    waiting = False
+    while True:
+        store.try_become_writer()
+        if store.load():
+            logger.info(f"Loaded {source} face index snapshot: {len(store.index)} faces in {time.time() - started:.2f}s")
+            return
+        if store.is_writer:
+            logger.info(f"No {source} face index snapshot, rebuilding from MongoDB")
+            rebuild_face_index(source)
+            return
+        if not waiting:
+            logger.info(f"No {source} face index snapshot, waiting for the writer process to rebuild it")
+            waiting = True
+        time.sleep(INDEX_REFRESH_INTERVAL)
+
+
+def maintain_face_indexes() -> None:
+    """Load each index from its snapshot (or rebuild it), then keep it current.
+
+    Every worker refreshes its indexes from the shared WAL every
+    INDEX_REFRESH_INTERVAL seconds; the one worker holding the snapshot writer
+    lock also snapshots every INDEX_SNAPSHOT_INTERVAL seconds.
+    """
+    started = time.time()
+    for source in face_index_stores:
+        try:
+            load_face_index(source)
+        except Exception as e:
+            logger.error(f"Error loading {source} face index: {e}")
+    face_index_ready.set()
+    logger.info(f"Face indexes ready in {time.time() - started:.2f}s")
+
+    last_snapshot = time.time()
+    while True:
+        time.sleep(INDEX_REFRESH_INTERVAL)
+        snapshot_due = time.time() - last_snapshot >= INDEX_SNAPSHOT_INTERVAL
+        for source, store in face_index_stores.items():
+            try:
+                # Take over snapshotting if the writer process has exited
+                if store.try_become_writer() and snapshot_due and store.pending_changes:
+                    store.snapshot()
+                else:
+                    store.refresh()
+            except Exception as e:
+                logger.error(f"Error maintaining {source} face index: {e}")
+        if snapshot_due:
+            last_snapshot = time.time()
+
+
+@app.on_event("startup")
+def start_face_index_maintenance():
+    threading.Thread(target=maintain_face_indexes, daemon=True).start()
+
+
+@app.on_event("startup")
+def start_search_key_backfill():
+    threading.Thread(target=backfill_search_keys, daemon=True).start()
+
+
+@app.on_event("startup")
+def start_cross_match_schedule():
+    if CROSS_MATCH_INTERVAL > 0:
+        threading.Thread(target=schedule_cross_match, daemon=True).start()
+
+
+@app.on_event("startup")
+def ensure_indexes():
+    """Create the MongoDB indexes the service relies on."""
+    try:
+        embedding_collection.create_index("face_id", unique=True)
+        ensure_unique_match_index()
+        alert_collection.create_index([("user_id", 1), ("_id", -1)])
+        alert_cursor_collection.create_index("user_id", unique=True)
+        found_collection.create_index("face_phash_bands")
+        lost_collection.create_index("search_grams")
+        found_collection.create_index("search_grams")
+        # Paged listings sort by upload time
+        lost_collection.create_index([("upload_time", -1)])
+        found_collection.create_index([("upload_time", -1)])
+        found_collection.create_index("source_photo_id", sparse=True)
+        source_photo_collection.create_index("source_photo_id", unique=True)
+    except Exception as e:
+        logger.error(f"Error creating MongoDB indexes: {e}")
+
+
+@app.on_event("startup")
+def backfill_alert_inbox():
+    """Seed an empty alert inbox from records that were matched before the inbox existed."""
+    try:
+        if alert_collection.estimated_document_count() > 0:
+            return
+        alerts = []
+        for alert_type, collection in (("lost", lost_collection), ("found", found_collection)):
+            for record in collection.find({"status": "found", "user_id": {"$exists": True}}, ALERT_RECORD_PROJECTION):
+                created_at = record.get("status_updated_time") or record.get("upload_time") or datetime.now().isoformat()
+                alerts.append({
+                    "alert_id": str(uuid.uuid4()),
+                    "user_id": record["user_id"],
+                    "type": alert_type,
+                    "face_id": record.get("face_id"),
+                    "created_at": created_at,
+                    "data": record
+                })
+        if alerts:
+            alert_collection.insert_many(alerts, ordered=False)
+            logger.info(f"Backfilled alert inbox with {len(alerts)} alerts")
+    except Exception as e:
+        logger.error(f"Error backfilling alert inbox: {e}")
+
+
+@app.on_event("shutdown")
+def stop_face_index_shards():
+    for store in face_index_stores.values():
+        if hasattr(store.index, "close"):
+            store.index.close()
 
 
 def save_metadata(collection, metadata: dict) -> str:
@@ -83,6 +579,125 @@ def save_metadata(collection, metadata: dict) -> str:
     return str(result.inserted_id)
 
 
+def save_match_records(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert match records in one bulk write, keyed by (lost_face_id, found_face_id).
+
+    Each record is an upsert that only sets fields on insert, so a pair that
+    already has a match record is left untouched, except that a confirmed
+    match replaces an unverified "candidate" record of the same pair. Returns
+    the records that were newly inserted or confirmed. Only confirmed records
+    publish alerts.
+    """
+    if not matches:
+        return []
+    operations = [
+        UpdateOne(
+            {"lost_face_id": match["lost_face_id"], "found_face_id": match["found_face_id"]},
+            {"$setOnInsert": match},
+            upsert=True
+        )
+        for match in matches
+    ]
+    try:
+        upserted = match_collection.bulk_write(operations, ordered=False).upserted_ids
+    except BulkWriteError as e:
+        # Concurrent upserts of the same pair collide on the unique index; the first one wins
+        if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+            raise
+        upserted = {entry["index"]: entry["_id"] for entry in e.details.get("upserted", [])}
+    created = [matches[i] for i in sorted(upserted)]
+    for i, match in enumerate(matches):
+        if i in upserted or match.get("match_status") != "confirmed":
+            continue
+        promoted = match_collection.update_one(
+            {"lost_face_id": match["lost_face_id"], "found_face_id": match["found_face_id"], "match_status": "candidate"},
+            {"$set": match}
+        )
+        if promoted.modified_count:
+            created.append(match)
+    publish_match_alerts([match for match in created if match.get("match_status") == "confirmed"])
+    return created
+
+
+# Alerts carry record metadata only; clients fetch images separately when needed
+ALERT_RECORD_PROJECTION = {"_id": 0, "face_blob": 0, "face_phash": 0, "face_phash_bands": 0, "search_grams": 0}
+
+
+def alert_record(record: Dict[str, Any], status_time: str) -> Dict[str, Any]:
+    """Copy of a lost/found record for an alert: no image or hashes, status already 'found'."""
+    data = {key: value for key, value in record.items() if key not in ALERT_RECORD_PROJECTION}
+    data["status"] = "found"
+    data["status_updated_time"] = status_time
+    return convert_objectid_to_str(data)
+
+
+def publish_match_alerts(matches: List[Dict[str, Any]]) -> None:
+    """Write one inbox alert per side of each new match to the users who reported the records."""
+    alerts = []
+    for match in matches:
+        match_info = {
+            "match_id": match.get("match_id"),
+            "lost_face_id": match.get("lost_face_id"),
+            "found_face_id": match.get("found_face_id"),
+            "match_time": match.get("match_time")
+        }
+        for alert_type, record in (("lost", match.get("lost_person")), ("found", match.get("found_person"))):
+            if not record or not record.get("user_id"):
+                continue
+            created_at = datetime.now().isoformat()
+            alerts.append({
+                "alert_id": str(uuid.uuid4()),
+                "user_id": record["user_id"],
+                "type": alert_type,
+                "face_id": record.get("face_id"),
+                "created_at": created_at,
+                "data": {**alert_record(record, created_at), "match": match_info}
+            })
+    if not alerts:
+        return
+    try:
+        alert_collection.insert_many(alerts, ordered=False)
+    except Exception as e:
+        logger.error(f"Error writing match alerts: {e}")
+
+
+def remove_duplicate_match_records() -> int:
+    """Delete repeated match records for the same pair, keeping the earliest one."""
+    removed = 0
+    pipeline = [
+        {"$sort": {"match_time": 1}},
+        {"$group": {
+            "_id": {"lost_face_id": "$lost_face_id", "found_face_id": "$found_face_id"},
+            "ids": {"$push": "$_id"},
+            "count": {"$sum": 1}
+        }},
+        {"$match": {"count": {"$gt": 1}}}
+    ]
+    for group in match_collection.aggregate(pipeline, allowDiskUse=True):
+        removed += match_collection.delete_many({"_id": {"$in": group["ids"][1:]}}).deleted_count
+    if removed:
+        logger.info(f"Removed {removed} duplicate match records")
+    return removed
+
+
+def ensure_unique_match_index() -> None:
+    """Create the unique (lost_face_id, found_face_id) index on match records.
+
+    The index already exists on every start after the first, so create_index
+    is a no-op; records are only deduplicated when repeated pairs from older
+    deployments make the index build fail.
+    """
+    keys = [("lost_face_id", 1), ("found_face_id", 1)]
+    try:
+        match_collection.create_index(keys, unique=True)
+    except OperationFailure as e:
+        if e.code != 11000:
+            raise
+        logger.info("Repeated match records block the unique pair index, removing them")
+        remove_duplicate_match_records()
+        match_collection.create_index(keys, unique=True)
+
+
 def convert_objectid_to_str(data: Any) -> Any:
     """Recursively convert ObjectId fields to strings in MongoDB documents."""
     if isinstance(data, list):
@@ -105,11 +720,55 @@ def convert_objectid_to_str(data: Any) -> Any:
         return data
 
 
-def match_face_with_db(known_image: np.ndarray, collection) -> List[Dict]:
-    """Match a face against faces in a MongoDB collection using DeepFace."""
+def rank_candidates(query_embedding: np.ndarray, collection) -> Optional[List[Dict]]:
+    """Pre-rank a collection by stored-embedding similarity and return the top documents.
+
+    Similarities are weighted by the stored face quality of each gallery
+    entry, so blurry or tiny faces use up fewer verification slots.
+    Returns None when the embedding index cannot be used, so the caller falls
+    back to verifying every record.
+    """
+    source = collection_sources.get(collection.name)
+    if query_embedding is None or source is None or not face_index_ready.is_set():
+        return None
+
+    # Over-fetch so quality weighting can reorder candidates near the cut-off
+    hits = face_index_stores[source].index.search(query_embedding, CASCADE_VERIFY_TOP_K * 4)
+    similarities = {face_id: similarity for face_id, similarity in hits if similarity >= CASCADE_MIN_SIMILARITY}
+    if not similarities:
+        return []
+    weighted = {}
+    for doc in collection.find({"face_id": {"$in": list(similarities)}}, {"face_id": 1, "face_quality.score": 1}):
+        score = doc.get("face_quality", {}).get("score")
+        weighted[doc["face_id"]] = similarities[doc["face_id"]] * quality_weight(score)
+    top_ids = sorted(weighted, key=weighted.get, reverse=True)[:CASCADE_VERIFY_TOP_K]
+    docs = list(collection.find({"face_id": {"$in": top_ids}}))
+    return sorted(docs, key=lambda doc: weighted[doc["face_id"]], reverse=True)
+
+
+def verify_faces(known_image: np.ndarray, compare_image: np.ndarray) -> bool:
+    """Full DeepFace ArcFace verification of two face crops."""
+    result = DeepFace.verify(
+        known_image,
+        compare_image,
+        model_name="ArcFace",
+        enforce_detection=False
+    )
+    return bool(result["verified"])
+
+
+def match_face_with_db(known_image: np.ndarray, collection, query_embedding: Optional[np.ndarray] = None) -> List[Dict]:
+    """Match a face against faces in a MongoDB collection using DeepFace.
+
+    With a query embedding, stored embeddings pre-rank every record and only
+    the top CASCADE_VERIFY_TOP_K candidates go through the full DeepFace.verify.
+    """
     matches = []
     try:
-        for doc in collection.find():
+        candidates = rank_candidates(query_embedding, collection)
+        if candidates is None:
+            candidates = collection.find()
+        for doc in candidates:
             try:
                 face_blob = doc.get("face_blob")
                 if not face_blob:
@@ -124,14 +783,7 @@ def match_face_with_db(known_image: np.ndarray, collection) -> List[Dict]:
                     continue
 
                 # Perform face verification
-                result = DeepFace.verify(
-                    known_image,
-                    compare_image,
-                    model_name="ArcFace",
-                    enforce_detection=False
-                )
-
-                if result["verified"]:
+                if verify_faces(known_image, compare_image):
                     # Convert ObjectIds to strings before adding to matches
                     match_doc = convert_objectid_to_str(doc)
                     matches.append(match_doc)
@@ -146,20 +798,103 @@ def match_face_with_db(known_image: np.ndarray, collection) -> List[Dict]:
     return matches
 
 
-def check_duplicate_faces_in_found(known_image: np.ndarray, threshold: float = 0.1) -> List[Dict]:
+def find_phash_duplicates_in_found(face_phash: int) -> List[Dict]:
+    """Find found records whose face crop is an exact or near-exact copy of this one.
+
+    Uses the indexed pHash bands, so no neural inference is needed.
+    """
+    duplicates = []
+    try:
+        for doc in found_collection.find({"face_phash_bands": {"$in": hash_bands(face_phash)}}):
+            distance = hamming_distance(face_phash, int(doc["face_phash"], 16))
+            if distance <= PHASH_MAX_DISTANCE:
+                duplicate_doc = convert_objectid_to_str(doc)
+                duplicate_doc["hamming_distance"] = distance
+                duplicate_doc["similarity_distance"] = distance / 64
+                duplicate_doc["similarity_percentage"] = (1 - distance / 64) * 100
+                duplicates.append(duplicate_doc)
+    except Exception as e:
+        logger.error(f"Error in perceptual hash duplicate lookup: {str(e)}")
+
+    return duplicates
+
+
+def stored_face_embedding(source: str, face_id: str) -> Optional[np.ndarray]:
+    """The stored embedding of a face, from the in-memory index or else from MongoDB."""
+    if face_index_ready.is_set():
+        embedding = face_index_stores[source].index.get(face_id)
+        if embedding is not None:
+            return embedding
+    doc = embedding_collection.find_one({"face_id": face_id}, {"_id": 0, "embedding": 1})
+    return np.frombuffer(doc["embedding"], dtype=np.float32) if doc else None
+
+
+def confirm_phash_duplicates(duplicates: List[Dict], known_image: np.ndarray,
+                             query_embedding: Optional[np.ndarray]) -> List[Dict]:
+    """Keep the pHash hits that are also the same face.
+
+    Similar crops are not proof of the same person, so each hit must also
+    reach DUPLICATE_MIN_SIMILARITY against its stored embedding, or pass a
+    DeepFace verify when either embedding is missing, before it may be deleted.
+    """
+    confirmed = []
+    for doc in duplicates:
+        try:
+            stored = stored_face_embedding("found", doc["face_id"]) if query_embedding is not None else None
+            if stored is not None:
+                similarity = float(np.dot(normalize_embeddings(query_embedding), normalize_embeddings(stored)))
+                is_duplicate = similarity >= DUPLICATE_MIN_SIMILARITY
+            else:
+                compare_image = decode_face_blob(doc.get("face_blob"))
+                is_duplicate = compare_image is not None and verify_faces(known_image, compare_image)
+        except Exception as e:
+            logger.error(f"Error confirming pHash duplicate {doc.get('face_id')}: {e}")
+            is_duplicate = False
+        if is_duplicate:
+            confirmed.append(doc)
+        else:
+            logger.info(f"pHash hit {doc.get('face_id')} is a different face, keeping it")
+    return confirmed
+
+
+def rank_duplicate_candidates(query_embedding: Optional[np.ndarray]) -> Optional[List[Dict]]:
+    """Return the few found records close enough to the embedding to be duplicates.
+
+    Returns None when the embedding index cannot be used, so the caller falls
+    back to verifying every found record.
+    """
+    if query_embedding is None or not face_index_ready.is_set():
+        return None
+
+    hits = face_index_stores["found"].index.search(query_embedding, DUPLICATE_VERIFY_TOP_K)
+    similarities = {face_id: similarity for face_id, similarity in hits if similarity >= DUPLICATE_MIN_SIMILARITY}
+    if not similarities:
+        return []
+    docs = list(found_collection.find({"face_id": {"$in": list(similarities)}}))
+    return sorted(docs, key=lambda doc: similarities[doc["face_id"]], reverse=True)
+
+
+def check_duplicate_faces_in_found(known_image: np.ndarray, threshold: float = 0.1,
+                                   query_embedding: Optional[np.ndarray] = None) -> List[Dict]:
     """Check for duplicate faces in found collection with specified accuracy threshold.
     
     Args:
         known_image: The face image to compare
         threshold: Distance threshold for similarity (lower = more similar)
                   0.1 corresponds to roughly 90% accuracy
+        query_embedding: Embedding of ``known_image``; when given, only the top
+                  DUPLICATE_VERIFY_TOP_K found faces from the embedding index
+                  are verified instead of every found record
     
     Returns:
         List of duplicate records found
     """
     duplicates = []
     try:
-        for doc in found_collection.find():
+        candidates = rank_duplicate_candidates(query_embedding)
+        if candidates is None:
+            candidates = found_collection.find()
+        for doc in candidates:
             try:
                 face_blob = doc.get("face_blob")
                 if not face_blob:
@@ -238,6 +973,7 @@ def remove_old_duplicate_found_records(duplicates: List[Dict], current_face_id:
                 result = found_collection.delete_one({"face_id": duplicate.get("face_id")})
                 
                 if result.deleted_count > 0:
+                    remove_face_embedding("found", duplicate.get("face_id"))
                     removal_results["records_removed"] += 1
                     removal_results["removed_records"].append({
                         "face_id": duplicate.get("face_id"),
@@ -297,6 +1033,7 @@ def remove_all_duplicates_keep_newest(all_duplicates: List[Dict]) -> Dict[str, A
                 result = found_collection.delete_one({"face_id": duplicate.get("face_id")})
                 
                 if result.deleted_count > 0:
+                    remove_face_embedding("found", duplicate.get("face_id"))
                     removal_results["records_removed"] += 1
                     removal_results["removed_records"].append({
                         "face_id": duplicate.get("face_id"),
@@ -374,8 +1111,113 @@ def update_records_status_to_found(lost_face_ids: List[str], found_face_ids: Lis
     return update_results
 
 
+def record_cross_matches(pairs: List[Tuple[str, str, float]]) -> int:
+    """Turn candidate (lost_face_id, found_face_id, similarity) pairs into match records.
+
+    Pairs that already have a match record are skipped before verification,
+    and save_match_records keys writes by the pair, so re-running the job
+    never duplicates a match. Without CROSS_MATCH_VERIFY pairs are recorded
+    as "candidate" matches, which leave record status alone and send no
+    alerts; with it, earlier candidates are verified and confirmed. Returns
+    the number of new match records.
+    """
+    if not pairs:
+        return 0
+
+    lost_ids = list({lost_id for lost_id, _, _ in pairs})
+    found_ids = list({found_id for _, found_id, _ in pairs})
+    existing_query = {"lost_face_id": {"$in": lost_ids}, "found_face_id": {"$in": found_ids}}
+    if CROSS_MATCH_VERIFY:
+        existing_query["match_status"] = {"$ne": "candidate"}
+    existing = {
+        (doc["lost_face_id"], doc["found_face_id"])
+        for doc in match_collection.find(existing_query, {"lost_face_id": 1, "found_face_id": 1})
+    }
+    pairs = [pair for pair in pairs if pair[:2] not in existing]
+    if not pairs:
+        return 0
+
+    lost_docs = {doc["face_id"]: doc for doc in lost_collection.find({"face_id": {"$in": [p[0] for p in pairs]}})}
+    found_docs = {doc["face_id"]: doc for doc in found_collection.find({"face_id": {"$in": [p[1] for p in pairs]}})}
+
+    matches = []
+    for lost_id, found_id, similarity in pairs:
+        lost_doc, found_doc = lost_docs.get(lost_id), found_docs.get(found_id)
+        if lost_doc is None or found_doc is None:
+            # Deleted since the indexes were read
+            continue
+        if CROSS_MATCH_VERIFY:
+            try:
+                lost_image = decode_face_blob(lost_doc.get("face_blob"))
+                found_image = decode_face_blob(found_doc.get("face_blob"))
+                if lost_image is None or found_image is None or not verify_faces(found_image, lost_image):
+                    continue
+            except Exception as e:
+                logger.error(f"Error verifying cross-match pair {lost_id}/{found_id}: {e}")
+                continue
+
+        matches.append({
+            "match_id": str(uuid.uuid4()),
+            "lost_face_id": lost_id,
+            "found_face_id": found_id,
+            "match_time": datetime.now().isoformat(),
+            "match_status": "confirmed" if CROSS_MATCH_VERIFY else "candidate",
+            "match_method": "cross_match",
+            "similarity": round(similarity, 4),
+            "lost_person": convert_objectid_to_str(lost_doc),
+            "found_person": convert_objectid_to_str(found_doc)
+        })
+
+    created = save_match_records(matches)
+    for match in created:
+        logger.info(f"Cross-match created {match['match_status']} match record: {match['lost_face_id']} <-> "
+                    f"{match['found_face_id']} (similarity {match['similarity']:.3f})")
+    confirmed = [match for match in created if match["match_status"] == "confirmed"]
+    if confirmed:
+        update_records_status_to_found(list({m["lost_face_id"] for m in confirmed}),
+                                       list({m["found_face_id"] for m in confirmed}))
+    return len(created)
+
+
+def load_cross_match_gallery():
+    """Live face ids and stored index rows for the lost and found indexes."""
+    lost_ids, lost_codes = face_index_stores["lost"].index.compact()
+    found_ids, found_codes = face_index_stores["found"].index.compact()
+    return lost_ids, lost_codes, found_ids, found_codes
+
+
+def run_cross_match(trigger: str) -> None:
+    """Run one claimed cross-match job (the caller has already called try_start)."""
+    try:
+        stats = cross_match_job.run(
+            load_cross_match_gallery,
+            face_index_stores["found"].index.codec.decode,
+            record_cross_matches,
+            trigger=trigger
+        )
+        logger.info(f"Cross-match completed: {stats['new_matches']} new matches from "
+                    f"{stats['pairs_scored']} pairs in {stats['elapsed_seconds']}s")
+    except Exception as e:
+        logger.error(f"Error in cross-match job: {e}")
+
+
+def schedule_cross_match() -> None:
+    """Re-run the lost x found cross-match every CROSS_MATCH_INTERVAL seconds.
+
+    Every worker runs this loop, but only the one holding the found index's
+    snapshot writer lock starts runs; another worker takes over when it exits.
+    """
+    face_index_ready.wait()
+    while True:
+        time.sleep(CROSS_MATCH_INTERVAL)
+        if not face_index_stores["found"].try_become_writer():
+            continue
+        if cross_match_job.try_start():
+            run_cross_match("schedule")
+
+
 @app.post("/upload_lost")
-async def upload_lost_person(
+def upload_lost_person(
         name: str = Form(...),
         gender: str = Form(...),
         age: int = Form(...),
@@ -385,12 +1227,13 @@ async def upload_lost_person(
         user_id: str = Form(...),
         mobile_no: str = Form(...),
         email_id: str = Form(...),
-        file: UploadFile = File(...)
+        file: UploadFile = File(...),
+        _slot: None = Depends(inference_slot)
 ):
     """Upload a lost person record with face recognition."""
     try:
         # Read and process image
-        contents = await file.read()
+        contents = file.file.read()
         image = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
 
         if image is None:
@@ -399,13 +1242,21 @@ async def upload_lost_person(
         # Generate unique face ID
         face_id = str(uuid.uuid4())
 
-        # Extract face from image
-        cropped_face = crop_face(image)
+        # Extract face from image and reject faces that are unusable for matching
+        cropped_face, confidence = detect_face(image)
+        face_quality = check_face_quality(cropped_face, confidence)
 
         # Encode face image to base64
         _, buffer = cv2.imencode('.jpg', cropped_face)
         image_blob = base64.b64encode(buffer).decode('utf-8')
 
+        # Embed the face once for indexing and candidate pre-ranking
+        try:
+            embedding = compute_face_embedding(cropped_face)
+        except Exception as e:
+            logger.error(f"Error computing face embedding for {face_id}: {e}")
+            embedding = None
+
         # Create metadata
         metadata = {
             "face_id": face_id,
@@ -421,23 +1272,31 @@ async def upload_lost_person(
                 "email_id": email_id
             },
             "face_blob": image_blob,
+            "face_quality": face_quality,
             "upload_time": datetime.now().isoformat(),
             "status": "pending"
         }
 
         # Save to database
+        add_search_keys(metadata)
         save_metadata(lost_collection, metadata)
         logger.info(f"Lost person record created: {face_id}")
 
+        # Add the face to the embedding index
+        if embedding is not None:
+            try:
+                store_face_embedding("lost", face_id, embedding)
+            except Exception as e:
+                logger.error(f"Error indexing face embedding for {face_id}: {e}")
+
         # Match against found people
-        matched_found = match_face_with_db(cropped_face, found_collection)
+        matched_found = match_face_with_db(cropped_face, found_collection, query_embedding=embedding)
 
-        # Process matches and create match records
+        # Create match records, skipping pairs that are already recorded
         status_update_results = {"lost_updated": 0, "found_updated": 0, "errors": []}
-        for match in matched_found:
-            try:
-                # Create match record
-                match_data = {
+        try:
+            save_match_records([
+                {
                     "match_id": str(uuid.uuid4()),
                     "lost_face_id": face_id,
                     "found_face_id": match.get("face_id"),
@@ -446,10 +1305,10 @@ async def upload_lost_person(
                     "lost_person": convert_objectid_to_str(metadata),
                     "found_person": convert_objectid_to_str(match)
                 }
-                save_metadata(match_collection, match_data)
-
-            except Exception as e:
-                logger.error(f"Error processing match: {e}")
+                for match in matched_found
+            ])
+        except Exception as e:
+            logger.error(f"Error saving match records: {e}")
 
         # Update status to 'found' for both lost and found records if matches exist
         if matched_found:
@@ -477,8 +1336,111 @@ async def upload_lost_person(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+def register_found_face(face_id: str, cropped_face: np.ndarray, face_quality: Dict[str, Any],
+                        embedding: Optional[np.ndarray], details: Dict[str, Any]) -> Dict[str, Any]:
+    """Store one found face, remove duplicates of it and match it against lost people.
+
+    ``details`` holds the descriptive record fields (name, location, reporter...).
+    Returns the per-face part of the upload response.
+    """
+    # Encode face image to base64
+    _, buffer = cv2.imencode('.jpg', cropped_face)
+    image_blob = base64.b64encode(buffer).decode('utf-8')
+
+    # Exact and near-exact re-uploads of the same photo are caught by an indexed
+    # perceptual hash lookup, confirmed against the stored embeddings
+    face_phash = perceptual_hash(cropped_face)
+    duplicates = confirm_phash_duplicates(find_phash_duplicates_in_found(face_phash), cropped_face, embedding)
+    duplicate_method = "phash"
+
+    if not duplicates:
+        # Check for duplicate faces in found collection (90% accuracy threshold)
+        duplicates = check_duplicate_faces_in_found(cropped_face, threshold=0.1, query_embedding=embedding)
+        duplicate_method = "face_verification"
+
+    # Create metadata
+    metadata = {
+        "face_id": face_id,
+        **details,
+        "face_blob": image_blob,
+        "face_quality": face_quality,
+        "face_phash": format_hash(face_phash),
+        "face_phash_bands": hash_bands(face_phash),
+        "upload_time": datetime.now().isoformat(),
+        "status": "pending"
+    }
+
+    # Save to database first
+    add_search_keys(metadata)
+    save_metadata(found_collection, metadata)
+    logger.info(f"Found person record created: {face_id}")
+
+    # Add the face to the embedding index
+    if embedding is not None:
+        try:
+            store_face_embedding("found", face_id, embedding)
+        except Exception as e:
+            logger.error(f"Error indexing face embedding for {face_id}: {e}")
+
+    # Handle duplicates if any were found
+    duplicate_removal_results = {"duplicates_found": 0, "records_removed": 0}
+    if duplicates:
+        logger.info(f"Found {len(duplicates)} duplicate faces for {face_id}")
+
+        # Add the current record to duplicates list for comparison
+        current_record = convert_objectid_to_str(metadata.copy())
+        current_record["similarity_distance"] = 0.0  # Perfect match with itself
+        current_record["similarity_percentage"] = 100.0
+
+        all_duplicates = duplicates + [current_record]
+        logger.info(f"Total duplicates including current record: {len(all_duplicates)}")
+
+        # Remove old duplicate records (this will keep only the newest one)
+        duplicate_removal_results = remove_all_duplicates_keep_newest(all_duplicates)
+        duplicate_removal_results["detection_method"] = duplicate_method
+        logger.info(f"Duplicate removal completed: {duplicate_removal_results['records_removed']} records removed, kept: {duplicate_removal_results['kept_record']['face_id'] if duplicate_removal_results['kept_record'] else 'None'}")
+    else:
+        logger.info(f"No duplicates found for {face_id}")
+
+    # Match against lost people
+    matched_lost = match_face_with_db(cropped_face, lost_collection, query_embedding=embedding)
+
+    # Create match records, skipping pairs that are already recorded
+    status_update_results = {"lost_updated": 0, "found_updated": 0, "errors": []}
+    try:
+        save_match_records([
+            {
+                "match_id": str(uuid.uuid4()),
+                "lost_face_id": match.get("face_id"),
+                "found_face_id": face_id,
+                "match_time": datetime.now().isoformat(),
+                "match_status": "confirmed",
+                "lost_person": convert_objectid_to_str(match),
+                "found_person": convert_objectid_to_str(metadata)
+            }
+            for match in matched_lost
+        ])
+    except Exception as e:
+        logger.error(f"Error saving match records: {e}")
+
+    # Update status to 'found' for both lost and found records if matches exist
+    if matched_lost:
+        lost_face_ids = [match.get("face_id") for match in matched_lost]
+        found_face_ids = [face_id]
+        status_update_results = update_records_status_to_found(lost_face_ids, found_face_ids)
+        logger.info(f"Status update completed: {status_update_results['lost_updated']} lost + {status_update_results['found_updated']} found records updated")
+
+    return {
+        "face_id": face_id,
+        "matched_lost": convert_objectid_to_str(matched_lost),
+        "total_matches": len(matched_lost),
+        "duplicate_removal": duplicate_removal_results,
+        "status_updates": status_update_results
+    }
+
+
 @app.post("/upload_found")
-async def upload_found_person(
+def upload_found_person(
         name: str = Form(...),
         gender: str = Form(...),
         age: int = Form(...),
@@ -489,12 +1451,13 @@ async def upload_found_person(
         user_id: str = Form(...),
         mobile_no: str = Form(...),
         email_id: str = Form(...),
-        file: UploadFile = File(...)
+        file: UploadFile = File(...),
+        _slot: None = Depends(inference_slot)
 ):
     """Upload a found person record with face recognition."""
     try:
         # Read and process image
-        contents = await file.read()
+        contents = file.file.read()
         image = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
 
         if image is None:
@@ -503,19 +1466,18 @@ async def upload_found_person(
         # Generate unique face ID
         face_id = str(uuid.uuid4())
 
-        # Extract face from image
-        cropped_face = crop_face(image)
+        # Extract face from image and reject faces that are unusable for matching
+        cropped_face, confidence = detect_face(image)
+        face_quality = check_face_quality(cropped_face, confidence)
 
-        # Encode face image to base64
-        _, buffer = cv2.imencode('.jpg', cropped_face)
-        image_blob = base64.b64encode(buffer).decode('utf-8')
+        # Embed the face once for indexing and candidate pre-ranking
+        try:
+            embedding = compute_face_embedding(cropped_face)
+        except Exception as e:
+            logger.error(f"Error computing face embedding for {face_id}: {e}")
+            embedding = None
 
-        # Check for duplicate faces in found collection (90% accuracy threshold)
-        duplicates = check_duplicate_faces_in_found(cropped_face, threshold=0.1)
-        
-        # Create metadata
-        metadata = {
-            "face_id": face_id,
+        details = {
             "name": name,
             "gender": gender,
             "age": age,
@@ -529,72 +1491,14 @@ async def upload_found_person(
             "contact_details": {
                 "mobile_no": mobile_no,
                 "email_id": email_id
-            },
-            "face_blob": image_blob,
-            "upload_time": datetime.now().isoformat(),
-            "status": "pending"
+            }
         }
-
-        # Save to database first
-        save_metadata(found_collection, metadata)
-        logger.info(f"Found person record created: {face_id}")
-
-        # Handle duplicates if any were found
-        duplicate_removal_results = {"duplicates_found": 0, "records_removed": 0}
-        if duplicates:
-            logger.info(f"Found {len(duplicates)} duplicate faces for {face_id}")
-            
-            # Add the current record to duplicates list for comparison
-            current_record = convert_objectid_to_str(metadata.copy())
-            current_record["similarity_distance"] = 0.0  # Perfect match with itself
-            current_record["similarity_percentage"] = 100.0
-            
-            all_duplicates = duplicates + [current_record]
-            logger.info(f"Total duplicates including current record: {len(all_duplicates)}")
-            
-            # Remove old duplicate records (this will keep only the newest one)
-            duplicate_removal_results = remove_all_duplicates_keep_newest(all_duplicates)
-            logger.info(f"Duplicate removal completed: {duplicate_removal_results['records_removed']} records removed, kept: {duplicate_removal_results['kept_record']['face_id'] if duplicate_removal_results['kept_record'] else 'None'}")
-        else:
-            logger.info(f"No duplicates found for {face_id}")
-
-        # Match against lost people
-        matched_lost = match_face_with_db(cropped_face, lost_collection)
-
-        # Process matches and create match records
-        status_update_results = {"lost_updated": 0, "found_updated": 0, "errors": []}
-        for match in matched_lost:
-            try:
-                # Create match record
-                match_data = {
-                    "match_id": str(uuid.uuid4()),
-                    "lost_face_id": match.get("face_id"),
-                    "found_face_id": face_id,
-                    "match_time": datetime.now().isoformat(),
-                    "match_status": "confirmed",
-                    "lost_person": convert_objectid_to_str(match),
-                    "found_person": convert_objectid_to_str(metadata)
-                }
-                save_metadata(match_collection, match_data)
-
-            except Exception as e:
-                logger.error(f"Error processing match: {e}")
-
-        # Update status to 'found' for both lost and found records if matches exist
-        if matched_lost:
-            lost_face_ids = [match.get("face_id") for match in matched_lost]
-            found_face_ids = [face_id]
-            status_update_results = update_records_status_to_found(lost_face_ids, found_face_ids)
-            logger.info(f"Status update completed: {status_update_results['lost_updated']} lost + {status_update_results['found_updated']} found records updated")
+        result = register_found_face(face_id, cropped_face, face_quality, embedding, details)
 
         # Prepare response data with ObjectId conversion
         response_data = {
             "message": "Found person uploaded successfully.",
-            "face_id": face_id,
-            "matched_lost": convert_objectid_to_str(matched_lost),
-            "total_matches": len(matched_lost),
-            "duplicate_removal": duplicate_removal_results,
-            "status_updates": status_update_results
+            **result
         }
 
         logger.info(f"Found person upload completed: {face_id}")
@@ -607,6 +1511,146 @@ async def upload_found_person(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@app.post("/upload_found_group")
+def upload_found_group(
+        where_found: str = Form(...),
+        your_name: str = Form(...),
+        organization: str = Form(...),
+        designation: str = Form(...),
+        user_id: str = Form(...),
+        mobile_no: str = Form(...),
+        email_id: str = Form(...),
+        name: str = Form("Unknown"),
+        gender: str = Form("Unknown"),
+        age: Optional[int] = Form(None),
+        file: UploadFile = File(...),
+        _slot: None = Depends(inference_slot)
+):
+    """Upload a group or crowd photo: every detected face becomes its own found record.
+
+    All faces are detected in one pass and embedded in one batch. Faces that
+    fail the quality gate are skipped and reported instead of failing the
+    whole upload. Each record keeps ``source_photo_id`` and its box in the photo.
+    """
+    try:
+        contents = file.file.read()
+        image = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+
+        if image is None:
+            raise HTTPException(status_code=400, detail="Invalid image file")
+
+        detected = detect_faces(image)
+        if not detected:
+            raise HTTPException(status_code=400, detail="No face detected in the image")
+        if len(detected) > GROUP_MAX_FACES:
+            logger.info(f"Group photo has {len(detected)} faces, keeping the {GROUP_MAX_FACES} most confident")
+
+        accepted, rejected = [], []
+        for face_number, (cropped_face, confidence, box) in enumerate(detected[:GROUP_MAX_FACES]):
+            face_quality = assess_face_quality(cropped_face, confidence)
+            problems = quality_problems(face_quality, FACE_MIN_SIZE, FACE_MIN_SHARPNESS, FACE_MIN_CONFIDENCE)
+            if problems:
+                rejected.append({"face_number": face_number, "box": box, "reasons": problems})
+            else:
+                accepted.append((face_number, cropped_face, box, face_quality))
+
+        if not accepted:
+            raise HTTPException(
+                status_code=400,
+                detail=f"No face in the photo is clear enough for matching ({len(rejected)} detected). Please upload a clearer photo."
+            )
+
+        # Embed every accepted crop in one batch
+        try:
+            embeddings = compute_face_embeddings([face for _, face, _, _ in accepted])
+        except Exception as e:
+            logger.error(f"Error computing face embeddings for group photo: {e}")
+            embeddings = [None] * len(accepted)
+
+        # Keep a downscaled copy of the whole photo so every face record can link back to it
+        source_photo_id = str(uuid.uuid4())
+        height, width = image.shape[:2]
+        scale = min(1.0, SOURCE_PHOTO_MAX_SIDE / max(height, width))
+        photo = cv2.resize(image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA) if scale < 1.0 else image
+        _, photo_buffer = cv2.imencode('.jpg', photo)
+
+        face_ids = [str(uuid.uuid4()) for _ in accepted]
+        save_metadata(source_photo_collection, {
+            "source_photo_id": source_photo_id,
+            "photo_blob": base64.b64encode(photo_buffer).decode('utf-8'),
+            "photo_scale": scale,
+            "face_ids": face_ids,
+            "faces_detected": len(detected),
+            "user_id": user_id,
+            "upload_time": datetime.now().isoformat()
+        })
+
+        records = []
+        for face_id, (face_number, cropped_face, box, face_quality), embedding in zip(face_ids, accepted, embeddings):
+            details = {
+                "name": name,
+                "gender": gender,
+                "age": age,
+                "location_found": where_found,
+                "reported_by": {
+                    "name": your_name,
+                    "organization": organization,
+                    "designation": designation
+                },
+                "user_id": user_id,
+                "contact_details": {
+                    "mobile_no": mobile_no,
+                    "email_id": email_id
+                },
+                "source_photo_id": source_photo_id,
+                "source_face_box": box,
+                "source_face_number": face_number
+            }
+            try:
+                records.append(register_found_face(face_id, cropped_face, face_quality, embedding, details))
+            except Exception as e:
+                logger.error(f"Error registering face {face_number} of group photo {source_photo_id}: {e}")
+                rejected.append({"face_number": face_number, "box": box, "reasons": [f"processing failed: {str(e)}"]})
+
+        logger.info(f"Group photo upload completed: {source_photo_id}, {len(records)} of {len(detected)} faces registered")
+        return {
+            "message": "Group photo uploaded successfully.",
+            "source_photo_id": source_photo_id,
+            "faces_detected": len(detected),
+            "faces_registered": len(records),
+            "rejected_faces": rejected,
+            "records": records,
+            "total_matches": sum(record["total_matches"] for record in records)
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error uploading group photo: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.get("/source_photo/{source_photo_id}")
+async def get_source_photo(source_photo_id: str):
+    """Get a group photo and the found records extracted from it."""
+    try:
+        photo = source_photo_collection.find_one({"source_photo_id": source_photo_id})
+        if not photo:
+            raise HTTPException(status_code=404, detail="Source photo not found")
+
+        faces = list(found_collection.find({"source_photo_id": source_photo_id}, {"face_blob": 0, "search_grams": 0}))
+        return {
+            "photo": convert_objectid_to_str(photo),
+            "faces": convert_objectid_to_str(faces)
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting source photo {source_photo_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 @app.get("/get_records_by_user/{user_id}")
 async def get_records_by_user(user_id: str):
     """Get all records uploaded by a specific user."""
@@ -621,7 +1665,7 @@ async def get_records_by_user(user_id: str):
 
         for collection_name, collection in collections_info:
             try:
-                docs = list(collection.find({"user_id": user_id}))
+                docs = list(collection.find({"user_id": user_id}, {"search_grams": 0}))
                 for doc in docs:
                     doc = convert_objectid_to_str(doc)
                     records.append({"source": collection_name, "data": doc})
@@ -681,17 +1725,187 @@ async def search_face(face_id: str):
         raise HTTPException(status_code=500, detail=f"Error searching for face: {str(e)}")
 
 
-@app.get("/get_all_lost")
-async def get_all_lost_people():
-    """Get all lost people records."""
+@app.post("/search_by_face")
+def search_by_face(
+        file: UploadFile = File(...),
+        search_in: str = Form("both"),
+        top_k: int = Form(10),
+        include_images: bool = Form(False),
+        _ready: None = Depends(face_index_required),
+        _slot: None = Depends(inference_slot)
+):
+    """Rank lost and/or found faces by similarity to an uploaded photo."""
     try:
-        records = list(lost_collection.find().sort("upload_time", -1))
-        records = convert_objectid_to_str(records)
+        if search_in not in ("lost", "found", "both"):
+            raise HTTPException(status_code=400, detail="search_in must be 'lost', 'found' or 'both'")
+        top_k = max(1, min(top_k, 100))
+        sources = ["lost", "found"] if search_in == "both" else [search_in]
+
+        contents = file.file.read()
+        image = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise HTTPException(status_code=400, detail="Invalid image file")
+
+        embedding = compute_face_embedding(crop_face(image))
+
+        # One vectorized similarity pass per index instead of a verify call per record
+        hits = []
+        for source in sources:
+            for face_id, similarity in face_index_stores[source].index.search(embedding, top_k):
+                hits.append((similarity, source, face_id))
+        hits = sorted(hits, reverse=True)[:top_k]
+
+        projection = {"search_grams": 0} if include_images else {"face_blob": 0, "search_grams": 0}
+        records = {}
+        for source in sources:
+            face_ids = [face_id for _, hit_source, face_id in hits if hit_source == source]
+            if face_ids:
+                for doc in source_collections[source].find({"face_id": {"$in": face_ids}}, projection):
+                    records[(source, doc["face_id"])] = convert_objectid_to_str(doc)
+
+        candidates = []
+        for similarity, source, face_id in hits:
+            record = records.get((source, face_id))
+            if record is None:
+                continue
+            candidates.append({
+                "source": source,
+                "face_id": face_id,
+                "similarity": round(similarity, 4),
+                "confidence": round(float(calibrate_similarity(similarity, MATCH_SIMILARITY_THRESHOLD, MATCH_CALIBRATION_SCALE)), 4),
+                "likely_match": similarity >= MATCH_SIMILARITY_THRESHOLD,
+                "record": record
+            })
 
+        return {
+            "message": f"Found {len(candidates)} candidates.",
+            "search_in": search_in,
+            "total_candidates": len(candidates),
+            "candidates": candidates
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching by face: {e}")
+        raise HTTPException(status_code=500, detail=f"Error searching by face: {str(e)}")
+
+
+@app.get("/search_records")
+async def search_records(
+        q: str,
+        search_in: str = "both",
+        fields: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20,
+        projection: Optional[str] = None,
+        include_images: bool = False,
+        min_score: float = 0.5
+):
+    """Fuzzy search over record metadata (name, location, mobile number, reporter name).
+
+    Candidates come from the multikey index on each record's trigram keys, so
+    fragments, typos and different transliterations of a name match without
+    scanning the collections.
+    """
+    if search_in not in ("lost", "found", "both"):
+        raise HTTPException(status_code=400, detail="search_in must be 'lost', 'found' or 'both'")
+    search_fields = [field.strip() for field in fields.split(",") if field.strip()] if fields else list(TEXT_SEARCH_FIELDS)
+    unknown = set(search_fields) - set(TEXT_SEARCH_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search fields {sorted(unknown)}, expected {list(TEXT_SEARCH_FIELDS)}")
+    if len(q.strip()) < 2:
+        raise HTTPException(status_code=400, detail="Search query must be at least 2 characters")
+    projection_fields = [field.strip() for field in projection.split(",") if field.strip()] if projection else []
+    allowed_fields = SEARCH_PROJECTION_FIELDS if include_images else SEARCH_PROJECTION_FIELDS - {"face_blob"}
+    # Sub-fields such as contact_details.mobile_no are allowed under an allowed field
+    unknown = sorted(field for field in projection_fields if field.split(".", 1)[0] not in allowed_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Fields {unknown} cannot be projected, expected fields of {sorted(allowed_fields)}")
+    if not text_search_ready.is_set():
+        raise HTTPException(status_code=503, detail="Search index is still loading", headers={"Retry-After": "5"})
+
+    page = max(1, page)
+    page_size = max(1, min(page_size, 100))
+    min_score = max(0.0, min(min_score, 1.0))
+
+    try:
+        sources = ["lost", "found"] if search_in == "both" else [search_in]
+        keys = query_keys(q, search_fields)
+        hits = []
+        for source in sources:
+            candidates = (
+                (doc["face_id"], doc.get("search_grams") or ())
+                for doc in source_collections[source].find({"search_grams": {"$in": keys}},
+                                                           {"_id": 0, "face_id": 1, "search_grams": 1})
+            )
+            hits.extend((score, source, face_id) for face_id, score in rank_matches(q, candidates, search_fields, min_score))
+        hits.sort(key=lambda hit: -hit[0])
+        page_hits = hits[(page - 1) * page_size:page * page_size]
+
+        if projection_fields:
+            mongo_projection = {"_id": 0, "face_id": 1, **{field: 1 for field in projection_fields}}
+        else:
+            mongo_projection = {"_id": 0, "face_phash_bands": 0, "search_grams": 0}
+            if not include_images:
+                mongo_projection["face_blob"] = 0
+
+        records = {}
+        for source in sources:
+            face_ids = [face_id for _, hit_source, face_id in page_hits if hit_source == source]
+            if face_ids:
+                for doc in source_collections[source].find({"face_id": {"$in": face_ids}}, mongo_projection):
+                    records[source, doc["face_id"]] = doc
+
+        results = [
+            {"source": source, "face_id": face_id, "score": round(score, 4),
+             "record": convert_objectid_to_str(records[source, face_id])}
+            for score, source, face_id in page_hits
+            if (source, face_id) in records
+        ]
+        return {
+            "query": q,
+            "search_in": search_in,
+            "fields": search_fields,
+            "total": len(hits),
+            "page": page,
+            "page_size": page_size,
+            "results": results
+        }
+
+    except Exception as e:
+        logger.error(f"Error searching records for '{q}': {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+def list_records(collection, page: Optional[int], page_size: int, include_images: bool) -> Dict[str, Any]:
+    """Records of a collection, newest first; one page of them when ``page`` is given."""
+    projection = {"search_grams": 0} if include_images else {"face_blob": 0, "search_grams": 0}
+    cursor = collection.find({}, projection).sort("upload_time", -1)
+    if page is None:
+        records = convert_objectid_to_str(list(cursor))
+        return {"total_count": len(records), "records": records}
+
+    page = max(1, page)
+    page_size = max(1, min(page_size, 200))
+    records = convert_objectid_to_str(list(cursor.skip((page - 1) * page_size).limit(page_size)))
+    total = collection.count_documents({})
+    return {
+        "total_count": total,
+        "records": records,
+        "page": page,
+        "page_size": page_size,
+        "has_more": page * page_size < total
+    }
+
+
+@app.get("/get_all_lost")
+async def get_all_lost_people(page: Optional[int] = None, page_size: int = 50, include_images: bool = True):
+    """Get all lost people records, or one page of them with ``page``."""
+    try:
         return {
             "message": "Lost people records retrieved successfully.",
-            "total_count": len(records),
-            "records": records
+            **list_records(lost_collection, page, page_size, include_images)
         }
     except Exception as e:
         logger.error(f"Error getting lost people: {e}")
@@ -699,16 +1913,12 @@ async def get_all_lost_people():
 
 
 @app.get("/get_all_found")
-async def get_all_found_people():
-    """Get all found people records."""
+async def get_all_found_people(page: Optional[int] = None, page_size: int = 50, include_images: bool = True):
+    """Get all found people records, or one page of them with ``page``."""
     try:
-        records = list(found_collection.find().sort("upload_time", -1))
-        records = convert_objectid_to_str(records)
-
         return {
             "message": "Found people records retrieved successfully.",
-            "total_count": len(records),
-            "records": records
+            **list_records(found_collection, page, page_size, include_images)
         }
     except Exception as e:
         logger.error(f"Error getting found people: {e}")
@@ -754,13 +1964,23 @@ async def health_check():
         except Exception as e:
             collections_status = {"error": str(e)}
 
-        return {
+        health = {
             "status": "healthy" if db_status == "connected" else "unhealthy",
             "timestamp": datetime.now().isoformat(),
             "database": db_status,
             "collections": collections_status,
-            "face_model_loaded": face_model is not None
+            "face_model_loaded": face_model is not None,
+            "face_index_ready": face_index_ready.is_set(),
+            "text_search_ready": text_search_ready.is_set(),
+            "admission": admission_controller.stats(),
+            "maintenance": maintenance_controller.stats(),
+            "face_index": {source: store.stats() for source, store in face_index_stores.items()}
         }
+        if not face_index_ready.is_set():
+            # Matching would fall back to full scans until the indexes are loaded
+            health["status"] = "starting"
+            return JSONResponse(status_code=503, content=health)
+        return health
 
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -831,7 +2051,7 @@ async def check_matches(face_id: str):
 
 
 @app.post("/cleanup_found_duplicates")
-async def cleanup_found_duplicates(threshold: float = 0.1):
+def cleanup_found_duplicates(threshold: float = 0.1, _slot: None = Depends(maintenance_slot)):
     """Manually clean up duplicate records in found collection.
     
     Args:
@@ -937,6 +2157,7 @@ async def cleanup_found_duplicates(threshold: float = 0.1):
                         try:
                             result = found_collection.delete_one({"face_id": dup_record.get("face_id")})
                             if result.deleted_count > 0:
+                                remove_face_embedding("found", dup_record.get("face_id"))
                                 removed_count += 1
                                 removed_details.append({
                                     "face_id": dup_record.get("face_id"),
@@ -976,30 +2197,140 @@ async def cleanup_found_duplicates(threshold: float = 0.1):
         raise HTTPException(status_code=500, detail=f"Error cleaning up duplicates: {str(e)}")
 
 
+@app.post("/cross_match/run")
+async def start_cross_match():
+    """Start a lost x found cross-match over all stored embeddings in the background."""
+    if not face_index_ready.is_set():
+        raise HTTPException(status_code=503, detail="Face index is still loading")
+    if not cross_match_job.try_start():
+        raise HTTPException(status_code=409, detail="Cross-match job is already running")
+
+    threading.Thread(target=run_cross_match, args=("manual",), daemon=True).start()
+    return {"message": "Cross-match job started.", "status": cross_match_job.stats()}
+
+
+@app.get("/cross_match/status")
+async def get_cross_match_status():
+    """Progress and throughput of the current or last cross-match run."""
+    return {
+        **cross_match_job.stats(),
+        "schedule_interval_seconds": CROSS_MATCH_INTERVAL,
+        # Scheduled runs happen in the worker that writes the found index snapshots
+        "runs_schedule": face_index_stores["found"].is_writer,
+        "verify": CROSS_MATCH_VERIFY
+    }
+
+
+def parse_alert_cursor(value: Optional[str]) -> Optional[ObjectId]:
+    """Parse a ``since``/``until`` alert cursor (an alert's ``cursor`` or a ``next_since``).
+
+    Only an omitted parameter means "no cursor"; an empty value is rejected so a
+    client that lost its cursor cannot mark every alert read by accident.
+    """
+    if value is None:
+        return None
+    if not ObjectId.is_valid(value):
+        raise HTTPException(status_code=400, detail="Invalid alert cursor")
+    return ObjectId(value)
+
+
+def get_read_cursor(user_id: str) -> Optional[ObjectId]:
+    """The _id of the newest alert the user has read, or None."""
+    return (alert_cursor_collection.find_one({"user_id": user_id}) or {}).get("read_until")
+
+
 @app.get("/alert/{user_id}")
-async def get_user_alerts(user_id: str):
-    """Return notification alerts for a user when their lost/found person is matched (status 'found')."""
-    try:
-        # Find lost records for this user with status 'found'
-        lost_alerts = list(lost_collection.find({"user_id": user_id, "status": "found"}))
-        # Find found records for this user with status 'found'
-        found_alerts = list(found_collection.find({"user_id": user_id, "status": "found"}))
-        # Combine and convert ObjectIds
+async def get_user_alerts(user_id: str, since: Optional[str] = None, limit: int = 100, unread_only: bool = False):
+    """Return notification alerts for a user when their lost/found person is matched.
+
+    Alerts are read from the user's inbox, which the matching pipeline writes
+    when a match is created, and are paged by their unique, increasing _id
+    (``created_at`` comes from the app clock and can repeat). Without
+    ``since`` the newest ``limit`` alerts are returned, newest first. With
+    ``since`` (the ``next_since`` of a previous response) only newer alerts
+    are returned, oldest first, so a client can page forward until
+    ``has_more`` is false.
+    """
+    try:
+        limit = max(1, min(limit, 500))
+        since_id = parse_alert_cursor(since)
+        read_until = get_read_cursor(user_id)
+
+        query: Dict[str, Any] = {"user_id": user_id}
+        if since_id:
+            query["_id"] = {"$gt": since_id}
+        if unread_only and read_until:
+            query["_id"] = {"$gt": max(since_id, read_until) if since_id else read_until}
+        order = 1 if since_id else -1
+
+        docs = list(alert_collection.find(query).sort("_id", order).limit(limit + 1))
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+
         alerts = [
-            {"type": "lost", "data": convert_objectid_to_str(rec)} for rec in lost_alerts
-        ] + [
-            {"type": "found", "data": convert_objectid_to_str(rec)} for rec in found_alerts
+            {
+                "alert_id": doc["alert_id"],
+                "cursor": str(doc["_id"]),
+                "type": doc["type"],
+                "created_at": doc["created_at"],
+                "read": read_until is not None and doc["_id"] <= read_until,
+                "data": doc.get("data", {})
+            }
+            for doc in docs
         ]
+        newest = max((doc["_id"] for doc in docs), default=since_id)
+
+        unread_query: Dict[str, Any] = {"user_id": user_id}
+        if read_until:
+            unread_query["_id"] = {"$gt": read_until}
+
         return {
             "user_id": user_id,
             "total_alerts": len(alerts),
-            "alerts": alerts
+            "alerts": alerts,
+            "next_since": str(newest) if newest else None,
+            "has_more": has_more,
+            "read_until": str(read_until) if read_until else None,
+            "unread_count": alert_collection.count_documents(unread_query)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting alerts for user {user_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Error retrieving alerts: {str(e)}")
 
 
+@app.post("/alert/{user_id}/read")
+async def mark_alerts_read(user_id: str, until: Optional[str] = None):
+    """Move the user's read cursor: alerts up to the ``until`` cursor (default the newest alert) count as read."""
+    try:
+        until_id = parse_alert_cursor(until)
+        if until_id is None:
+            newest = alert_collection.find_one({"user_id": user_id}, {"_id": 1}, sort=[("_id", -1)])
+            until_id = newest["_id"] if newest else None
+        if until_id is not None:
+            alert_cursor_collection.update_one(
+                {"user_id": user_id},
+                # Never move the cursor backwards
+                {"$max": {"read_until": until_id}, "$set": {"updated_time": datetime.now().isoformat()}},
+                upsert=True
+            )
+        read_until = get_read_cursor(user_id)
+        unread_query: Dict[str, Any] = {"user_id": user_id}
+        if read_until:
+            unread_query["_id"] = {"$gt": read_until}
+        return {
+            "user_id": user_id,
+            "read_until": str(read_until) if read_until else None,
+            "unread_count": alert_collection.count_documents(unread_query)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating alert cursor for user {user_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Error updating alert cursor: {str(e)}")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,393 @@
+"""End-to-end benchmark of the lost & found API with stub face models.
+
+Seeds MongoDB (or an in-memory mongomock stand-in) with synthetic lost and
+found records, swaps DeepFace and the YOLO face detector for deterministic
+stubs so no model weights are needed, then drives the API in-process at a
+configurable concurrency:
+
+- upload: /upload_lost and /upload_found (detection, embedding, duplicate
+  checks, matching)
+- match: /search_by_face and /check_matches/{face_id}
+- list: /get_all_lost, /get_all_found, /get_all_matches, /search_records
+- cleanup: /cleanup_found_duplicates
+
+Latency percentiles, throughput and status codes per endpoint are written to
+a JSON report, so runs with different collection sizes or code versions can
+be compared.
+
+The stub embedder projects a downscaled grey crop onto a fixed random basis,
+so crops of the same synthetic identity embed close together and different
+identities do not, and matches and duplicates occur as they would with
+ArcFace. ``--represent-ms`` and ``--verify-ms`` add a fixed delay per model
+call to emulate real inference cost.
+
+Usage (from the "lost and found server" directory):
+
+    python benchmarks/bench_api.py --records 2000 --uploads 50 --concurrency 4 --output api.json
+    python benchmarks/bench_api.py --mongo-uri mongodb://localhost:27017 --records 20000
+"""
+import os
+import sys
+import json
+import time
+import types
+import uuid
+import base64
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+IMAGE_SIZE = 160
+# The stub detector's box: the centre of the image, as a face in a portrait photo
+FACE_BOX = (16, 16, IMAGE_SIZE - 16, IMAGE_SIZE - 16)
+
+
+# ---------------------------------------------------------------------------
+# Stub models
+# ---------------------------------------------------------------------------
+
+class StubTensor(np.ndarray):
+    """ndarray with the torch-style .cpu()/.numpy() calls the app makes on YOLO results."""
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return np.asarray(self)
+
+
+class StubBoxes:
+    def __init__(self, xyxy, conf):
+        self.xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4).view(StubTensor)
+        self.conf = np.asarray(conf, dtype=np.float32).view(StubTensor)
+
+    def __len__(self):
+        return len(self.xyxy)
+
+
+class StubYOLO:
+    """Reports one confident face box in the centre of every image."""
+
+    def __init__(self, weights: str):
+        self.weights = weights
+
+    def predict(self, image, verbose: bool = False):
+        height, width = image.shape[:2]
+        x1, y1, x2, y2 = FACE_BOX
+        box = [x1 * width / IMAGE_SIZE, y1 * height / IMAGE_SIZE, x2 * width / IMAGE_SIZE, y2 * height / IMAGE_SIZE]
+        return [types.SimpleNamespace(boxes=StubBoxes([box], [0.92]))]
+
+
+class StubDeepFace:
+    """Deterministic stand-in for DeepFace.represent / DeepFace.verify (ArcFace, cosine)."""
+
+    represent_delay = 0.0
+    verify_delay = 0.0
+    _basis = np.random.default_rng(1234).standard_normal((32 * 32, 512)).astype(np.float32)
+
+    @classmethod
+    def _embed(cls, image) -> np.ndarray:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        pixels = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32).ravel()
+        pixels -= pixels.mean()
+        embedding = pixels @ cls._basis
+        return embedding / (np.linalg.norm(embedding) or 1.0)
+
+    @classmethod
+    def represent(cls, img_path, model_name="ArcFace", enforce_detection=True, detector_backend="opencv", **kwargs):
+        if isinstance(img_path, list):
+            time.sleep(cls.represent_delay * len(img_path))
+            return [[{"embedding": cls._embed(image).tolist()}] for image in img_path]
+        time.sleep(cls.represent_delay)
+        return [{"embedding": cls._embed(img_path).tolist()}]
+
+    @classmethod
+    def verify(cls, img1_path, img2_path, model_name="ArcFace", enforce_detection=True,
+               distance_metric="cosine", **kwargs):
+        time.sleep(cls.verify_delay)
+        distance = float(1.0 - cls._embed(img1_path) @ cls._embed(img2_path))
+        return {"verified": distance <= 0.68, "distance": distance, "threshold": 0.68,
+                "model": model_name, "similarity_metric": distance_metric}
+
+
+def install_stub_models(represent_ms: float, verify_ms: float):
+    StubDeepFace.represent_delay = represent_ms / 1000.0
+    StubDeepFace.verify_delay = verify_ms / 1000.0
+    deepface = types.ModuleType("deepface")
+    deepface.DeepFace = StubDeepFace
+    ultralytics = types.ModuleType("ultralytics")
+    ultralytics.YOLO = StubYOLO
+    sys.modules["deepface"] = deepface
+    sys.modules["ultralytics"] = ultralytics
+
+
+def use_mongomock():
+    """Point the app's MongoClient at an in-memory mongomock server."""
+    import pymongo
+    import mongomock
+    from mongomock.collection import BulkOperationBuilder
+
+    # Newer pymongo passes keyword arguments (e.g. sort) that mongomock's bulk builder does not know
+    add_update = BulkOperationBuilder.add_update
+
+    def compatible_add_update(self, selector, doc, multi=False, upsert=False, collation=None,
+                              array_filters=None, hint=None, **kwargs):
+        return add_update(self, selector, doc, multi=multi, upsert=upsert, collation=collation,
+                          array_filters=array_filters, hint=hint)
+
+    BulkOperationBuilder.add_update = compatible_add_update
+    pymongo.MongoClient = mongomock.MongoClient
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+class IdentityGallery:
+    """Synthetic "faces": each identity is a smooth random pattern, each photo a noisy copy."""
+
+    def __init__(self, identities: int, noise: float, seed: int = 7):
+        self.identities = identities
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+        self._seeds = self.rng.integers(0, 2 ** 31, identities)
+
+    def photo(self, identity: int) -> np.ndarray:
+        base = np.random.default_rng(self._seeds[identity]).integers(0, 256, (12, 12, 3)).astype(np.float32)
+        image = cv2.resize(base, (IMAGE_SIZE, IMAGE_SIZE), interpolation=cv2.INTER_CUBIC)
+        image += self.rng.normal(0, self.noise, image.shape)
+        return np.clip(image, 0, 255).astype(np.uint8)
+
+    @staticmethod
+    def crop(image: np.ndarray) -> np.ndarray:
+        x1, y1, x2, y2 = FACE_BOX
+        return image[y1:y2, x1:x2]
+
+    @staticmethod
+    def jpeg(image: np.ndarray) -> bytes:
+        return cv2.imencode(".jpg", image)[1].tobytes()
+
+
+def seed_database(app_module, gallery: IdentityGallery, lost: int, found: int) -> Dict[str, float]:
+    """Insert synthetic records and their stub embeddings directly into MongoDB."""
+    from bson import Binary
+
+    started = time.perf_counter()
+    now = datetime.now()
+    for source, count in (("lost", lost), ("found", found)):
+        collection = app_module.source_collections[source]
+        records, embeddings = [], []
+        for i in range(count):
+            identity = int(gallery.rng.integers(gallery.identities))
+            crop = gallery.crop(gallery.photo(identity))
+            face_id = str(uuid.uuid4())
+            record = {
+                "face_id": face_id,
+                "name": f"Person {identity}",
+                "gender": "male" if identity % 2 else "female",
+                "age": 5 + identity % 70,
+                "user_id": f"bench_user_{i % 50}",
+                "contact_details": {"mobile_no": f"9{identity:09d}", "email_id": f"user{identity}@example.com"},
+                "face_blob": base64.b64encode(gallery.jpeg(crop)).decode("utf-8"),
+                "upload_time": (now - timedelta(seconds=count - i)).isoformat(),
+                "status": "pending",
+                "bench_identity": identity
+            }
+            if source == "lost":
+                record.update(where_lost=f"Ghat {identity % 40}", reporter_name="Bench Reporter", relation_with_lost="family")
+            else:
+                record.update(location_found=f"Gate {identity % 40}",
+                              reported_by={"name": "Bench Volunteer", "organization": "Bench", "designation": "volunteer"})
+            records.append(record)
+            embeddings.append({
+                "face_id": face_id, "source": source, "model": "ArcFace",
+                "embedding": Binary(StubDeepFace._embed(crop).astype(np.float32).tobytes()),
+                "updated_time": now.isoformat()
+            })
+            if len(records) >= 1000:
+                collection.insert_many(records)
+                app_module.embedding_collection.insert_many(embeddings)
+                records, embeddings = [], []
+        if records:
+            collection.insert_many(records)
+            app_module.embedding_collection.insert_many(embeddings)
+    return {"seed_seconds": time.perf_counter() - started}
+
+
+# ---------------------------------------------------------------------------
+# Load generation
+# ---------------------------------------------------------------------------
+
+def summarize(name: str, latencies: List[float], statuses: Dict[int, int], wall: float) -> Dict:
+    values = np.asarray(latencies) * 1000.0
+    summary = {
+        "endpoint": name,
+        "requests": len(latencies),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "wall_seconds": round(wall, 4),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0
+    }
+    if len(values):
+        summary.update({
+            "mean_ms": round(float(values.mean()), 2),
+            "p50_ms": round(float(np.percentile(values, 50)), 2),
+            "p90_ms": round(float(np.percentile(values, 90)), 2),
+            "p99_ms": round(float(np.percentile(values, 99)), 2),
+            "max_ms": round(float(values.max()), 2)
+        })
+    return summary
+
+
+async def drive(client, name: str, requests: List[Dict], concurrency: int) -> Dict:
+    """Send ``requests`` (httpx request kwargs) with at most ``concurrency`` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+
+    async def one(kwargs):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(**kwargs)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(kwargs) for kwargs in requests))
+    result = summarize(name, latencies, statuses, time.perf_counter() - started)
+    print(f"{name:<28}{result['requests']:>6}{result.get('p50_ms', 0):>10.1f}{result.get('p90_ms', 0):>10.1f}"
+          f"{result.get('p99_ms', 0):>10.1f}{result['throughput_rps']:>10.1f}  {result['status_codes']}")
+    return result
+
+
+def upload_request(path: str, fields: Dict[str, str], image: bytes) -> Dict:
+    return {"method": "POST", "url": path, "data": fields,
+            "files": {"file": ("photo.jpg", image, "image/jpeg")}}
+
+
+async def run_benchmark(app_module, gallery: IdentityGallery, args) -> List[Dict]:
+    import httpx
+
+    app = app_module.app
+    transport = httpx.ASGITransport(app=app)
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        def photo(identity=None):
+            identity = int(gallery.rng.integers(gallery.identities)) if identity is None else identity
+            return gallery.jpeg(gallery.photo(identity))
+
+        lost_uploads = [upload_request("/upload_lost", {
+            "name": f"Bench Lost {i}", "gender": "female", "age": "30", "where_lost": "Main Ghat",
+            "your_name": "Reporter", "relation_with_lost": "family", "user_id": f"bench_user_{i % 50}",
+            "mobile_no": "9000000000", "email_id": "bench@example.com"
+        }, photo()) for i in range(args.uploads)]
+        found_uploads = [upload_request("/upload_found", {
+            "name": f"Bench Found {i}", "gender": "male", "age": "8", "where_found": "Gate 3",
+            "your_name": "Volunteer", "organization": "Bench", "designation": "volunteer",
+            "user_id": f"bench_user_{i % 50}", "mobile_no": "9000000001", "email_id": "bench@example.com"
+        }, photo()) for i in range(args.uploads)]
+        results.append(await drive(client, "POST /upload_lost", lost_uploads, args.concurrency))
+        results.append(await drive(client, "POST /upload_found", found_uploads, args.concurrency))
+
+        searches = [upload_request("/search_by_face", {"search_in": "both", "top_k": "10"}, photo())
+                    for _ in range(args.queries)]
+        results.append(await drive(client, "POST /search_by_face", searches, args.concurrency))
+        face_ids = [doc["face_id"] for doc in app_module.lost_collection.find({}, {"face_id": 1}).limit(args.queries)]
+        results.append(await drive(client, "GET /check_matches/{id}",
+                                   [{"method": "GET", "url": f"/check_matches/{face_id}"} for face_id in face_ids],
+                                   args.concurrency))
+
+        for path in ("/get_all_lost", "/get_all_found", "/get_all_matches"):
+            results.append(await drive(client, f"GET {path}", [{"method": "GET", "url": path}] * args.list_requests,
+                                       args.concurrency))
+        names = [f"Person {int(gallery.rng.integers(gallery.identities))}" for _ in range(args.queries)]
+        results.append(await drive(client, "GET /search_records",
+                                   [{"method": "GET", "url": "/search_records", "params": {"q": name}} for name in names],
+                                   args.concurrency))
+
+        if not args.skip_cleanup:
+            results.append(await drive(client, "POST /cleanup_found_duplicates",
+                                       [{"method": "POST", "url": "/cleanup_found_duplicates"}], 1))
+    return results
+
+
+async def start_app(app_module) -> float:
+    """Run the app's startup handlers and wait until its indexes are ready."""
+    started = time.perf_counter()
+    for handler in app_module.app.router.on_startup:
+        result = handler()
+        if asyncio.iscoroutine(result):
+            await result
+    while not (app_module.face_index_ready.is_set() and app_module.text_search_ready.is_set()):
+        await asyncio.sleep(0.05)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1000, help="seeded records per collection (lost and found)")
+    parser.add_argument("--identities", type=int, default=None, help="distinct synthetic people (default: records / 2)")
+    parser.add_argument("--noise", type=float, default=6.0, help="pixel noise between photos of one identity")
+    parser.add_argument("--uploads", type=int, default=20, help="uploads per endpoint")
+    parser.add_argument("--queries", type=int, default=20, help="search / check_matches requests")
+    parser.add_argument("--list-requests", type=int, default=5, help="requests per listing endpoint")
+    parser.add_argument("--concurrency", type=int, default=4, help="requests in flight")
+    parser.add_argument("--represent-ms", type=float, default=0.0, help="emulated cost of one embedding")
+    parser.add_argument("--verify-ms", type=float, default=0.0, help="emulated cost of one verification")
+    parser.add_argument("--skip-cleanup", action="store_true", help="skip /cleanup_found_duplicates (quadratic)")
+    parser.add_argument("--mongo-uri", default=None, help="benchmark against a real MongoDB instead of mongomock")
+    parser.add_argument("--output", default=None, help="optional path for a JSON report")
+    args = parser.parse_args()
+
+    install_stub_models(args.represent_ms, args.verify_ms)
+    database = f"bench_{uuid.uuid4().hex[:8]}"
+    if args.mongo_uri:
+        os.environ["MONGO_URI"] = args.mongo_uri
+    else:
+        use_mongomock()
+    os.environ["DATABASE_NAME"] = database
+    os.environ.setdefault("CROSS_MATCH_INTERVAL", "0")
+    # Let the configured concurrency through admission control instead of measuring 429s
+    os.environ.setdefault("INFERENCE_MAX_QUEUE", str(max(8, args.concurrency)))
+    snapshot_dir = tempfile.TemporaryDirectory()
+    os.environ["INDEX_SNAPSHOT_DIR"] = snapshot_dir.name
+
+    os.chdir(SERVER_DIR)
+    import app as app_module
+
+    gallery = IdentityGallery(args.identities or max(1, args.records // 2), args.noise)
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k != "mongo_uri"},
+        "backend": "mongodb" if args.mongo_uri else "mongomock"
+    }
+    try:
+        report.update(seed_database(app_module, gallery, args.records, args.records))
+        loop = asyncio.new_event_loop()
+        report["startup_seconds"] = loop.run_until_complete(start_app(app_module))
+        print(f"Seeded {args.records} lost + {args.records} found in {report['seed_seconds']:.1f}s, "
+              f"startup {report['startup_seconds']:.1f}s")
+        print(f"{'endpoint':<28}{'n':>6}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'req/s':>10}  status")
+        report["results"] = loop.run_until_complete(run_benchmark(app_module, gallery, args))
+        loop.close()
+    finally:
+        for handler in app_module.app.router.on_shutdown:
+            handler()
+        if args.mongo_uri:
+            app_module.client.drop_database(database)
+        snapshot_dir.cleanup()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
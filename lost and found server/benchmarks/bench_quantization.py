@@ -0,0 +1,117 @@
+"""Recall vs memory of compact embedding storage against exact cosine search.
+
+Builds a synthetic gallery of identities (several noisy ArcFace-sized
+embeddings per person), takes exact float32 cosine search as ground truth and
+measures, for int8 scalar quantisation and product quantisation with ADC:
+
+- bytes per face and total gallery size
+- recall@1: the exact nearest face is ranked first
+- recall@k: overlap of the approximate top-k with the exact top-k
+- identity hit rate: the top result belongs to the query's identity
+- query latency
+
+Usage (from the "lost and found server" directory):
+
+    python benchmarks/bench_quantization.py --faces 100000 --pq 32,64 --output quantization.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from face_index import FaceIndex, EMBEDDING_DIM, normalize_embeddings
+from quantization import Float32Codec, Int8Codec
+from product_quantizer import ProductQuantizer
+
+
+def synthetic_gallery(faces: int, per_identity: int, noise: float, rng):
+    identities = faces // per_identity
+    centers = normalize_embeddings(rng.standard_normal((identities, EMBEDDING_DIM), dtype=np.float32))
+    labels = np.repeat(np.arange(identities), per_identity)
+    gallery = normalize_embeddings(centers[labels] + noise * rng.standard_normal((len(labels), EMBEDDING_DIM), dtype=np.float32))
+    return centers, labels, gallery
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def evaluate(name, score_fn, queries, exact, labels, query_labels, k, bytes_per_face, faces):
+    recall_1 = recall_k = identity_hits = 0
+    started = time.perf_counter()
+    for query, truth, label in zip(queries, exact, query_labels):
+        found = top_k(score_fn(query), k)
+        recall_1 += found[0] == truth[0]
+        recall_k += len(np.intersect1d(found, truth)) / k
+        identity_hits += labels[found[0]] == label
+    elapsed = time.perf_counter() - started
+    n = len(queries)
+    return {
+        "method": name,
+        "bytes_per_face": bytes_per_face,
+        "gallery_mb": bytes_per_face * faces / 2 ** 20,
+        "recall_at_1": recall_1 / n,
+        f"recall_at_{k}": recall_k / n,
+        "identity_hit_rate": identity_hits / n,
+        "ms_per_query": 1000 * elapsed / n
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--faces", type=int, default=100000, help="gallery size")
+    parser.add_argument("--per-identity", type=int, default=4, help="embeddings per synthetic identity")
+    parser.add_argument("--noise", type=float, default=0.04, help="per-component noise around each identity")
+    parser.add_argument("--queries", type=int, default=200, help="number of queries")
+    parser.add_argument("--k", type=int, default=10, help="k for recall@k")
+    parser.add_argument("--pq", default="32,64", help="comma separated PQ sub-vector counts (bytes per face)")
+    parser.add_argument("--output", default=None, help="optional path for a JSON report")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    centers, labels, gallery = synthetic_gallery(args.faces, args.per_identity, args.noise, rng)
+    query_labels = rng.integers(0, len(centers), args.queries)
+    queries = normalize_embeddings(centers[query_labels] + args.noise * rng.standard_normal((args.queries, EMBEDDING_DIM), dtype=np.float32))
+    exact = [top_k(gallery @ q, args.k) for q in queries]
+
+    results = []
+    for codec in (Float32Codec(), Int8Codec()):
+        index = FaceIndex(EMBEDDING_DIM, codec=codec)
+        index.add_batch([str(i) for i in range(args.faces)], gallery)
+        _, codes = index.compact()
+        results.append(evaluate(
+            "float32 (exact)" if codec.name == "none" else codec.name,
+            lambda q: codec.scores(codes, q),
+            queries, exact, labels, query_labels, args.k,
+            codes.itemsize * codes.shape[1], args.faces
+        ))
+
+    for subvectors in [int(m) for m in args.pq.split(",") if m]:
+        started = time.perf_counter()
+        pq = ProductQuantizer(EMBEDDING_DIM, num_subvectors=subvectors).train(gallery)
+        codes = pq.encode(gallery)
+        train_seconds = time.perf_counter() - started
+        result = evaluate(f"pq{subvectors}", lambda q: pq.scores(codes, q),
+                          queries, exact, labels, query_labels, args.k, pq.bytes_per_vector, args.faces)
+        result["train_and_encode_seconds"] = train_seconds
+        results.append(result)
+
+    print(f"{args.faces} faces ({len(centers)} identities), {args.queries} queries")
+    print(f"{'method':<18}{'B/face':>8}{'MB':>9}{'R@1':>8}{f'R@{args.k}':>8}{'id hit':>8}{'ms/q':>8}")
+    for r in results:
+        print(f"{r['method']:<18}{r['bytes_per_face']:>8}{r['gallery_mb']:>9.1f}{r['recall_at_1']:>8.3f}"
+              f"{r[f'recall_at_{args.k}']:>8.3f}{r['identity_hit_rate']:>8.3f}{r['ms_per_query']:>8.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"faces": args.faces, "queries": args.queries, "k": args.k, "results": results}, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
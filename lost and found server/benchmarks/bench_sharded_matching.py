@@ -0,0 +1,118 @@
+"""Benchmark face matching throughput against the number of index shards.
+
+Seeds a snapshot with random ArcFace-sized embeddings, then runs the same
+top-k similarity queries against the in-process FaceIndex and against
+ShardedFaceIndex with an increasing number of worker processes. Each shard
+maps its slice of the snapshot, as the server does with FACE_INDEX_SHARDS.
+
+Usage (from the "lost and found server" directory):
+
+    python benchmarks/bench_sharded_matching.py --faces 200000 --shards 1,2,4,8
+"""
+import os
+
+# One BLAS thread per process so the scaling comes from the shards alone
+for var in ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(var, "1")
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from face_index import EMBEDDING_DIM, normalize_embeddings
+from index_snapshot import FaceIndexStore
+from sharding import ShardedFaceIndex
+
+
+def run_queries(index, queries: np.ndarray, k: int):
+    results = []
+    started = time.perf_counter()
+    for query in queries:
+        results.append(index.search(query, k))
+    return time.perf_counter() - started, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--faces", type=int, default=200000, help="gallery size")
+    parser.add_argument("--queries", type=int, default=50, help="number of queries per configuration")
+    parser.add_argument("--k", type=int, default=10, help="candidates returned per query")
+    parser.add_argument("--shards", default=None, help="comma separated shard counts (default: 1,2,4,... up to CPU count)")
+    parser.add_argument("--output", default=None, help="optional path for a JSON report")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    shard_counts = [int(n) for n in args.shards.split(",")] if args.shards else \
+        [n for n in (1, 2, 4, 8, 16, 32) if n <= cpus]
+
+    rng = np.random.default_rng(42)
+    face_ids = [f"face-{i}" for i in range(args.faces)]
+    gallery = normalize_embeddings(rng.standard_normal((args.faces, EMBEDDING_DIM), dtype=np.float32))
+    # Queries are noisy copies of gallery faces so every query has a true match
+    targets = rng.integers(0, args.faces, args.queries)
+    queries = normalize_embeddings(gallery[targets] + 0.05 * rng.standard_normal((args.queries, EMBEDDING_DIM), dtype=np.float32))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = FaceIndexStore(directory, "bench")
+        store.try_become_writer()
+        store.bulk_add(face_ids, gallery)
+        store.snapshot()
+        del gallery
+
+        baseline_store = FaceIndexStore(directory, "bench")
+        baseline_store.load()
+        run_queries(baseline_store.index, queries[:2], args.k)
+        baseline_time, baseline_results = run_queries(baseline_store.index, queries, args.k)
+        baseline_qps = args.queries / baseline_time
+        hits = sum(results[0][0] == face_ids[t] for results, t in zip(baseline_results, targets))
+
+        report = {
+            "faces": args.faces,
+            "queries": args.queries,
+            "k": args.k,
+            "cpu_count": cpus,
+            "baseline": {
+                "ms_per_query": 1000 * baseline_time / args.queries,
+                "queries_per_second": baseline_qps,
+                "top1_hits": int(hits)
+            },
+            "sharded": []
+        }
+        print(f"{args.faces} faces, {args.queries} queries, k={args.k}, {cpus} CPUs")
+        print(f"{'index':<16}{'ms/query':>10}{'queries/s':>12}{'speedup':>10}{'same top-k':>12}")
+        print(f"{'FaceIndex':<16}{report['baseline']['ms_per_query']:>10.2f}{baseline_qps:>12.1f}{1.0:>10.2f}{'-':>12}")
+
+        for shards in shard_counts:
+            sharded_store = FaceIndexStore(directory, "bench",
+                                           index_factory=lambda dim, **kw: ShardedFaceIndex(dim, num_shards=shards, **kw))
+            sharded_store.load()
+            index = sharded_store.index
+            run_queries(index, queries[:2], args.k)
+            elapsed, results = run_queries(index, queries, args.k)
+            index.close()
+
+            same = all([hit[0] for hit in a] == [hit[0] for hit in b] for a, b in zip(results, baseline_results))
+            qps = args.queries / elapsed
+            report["sharded"].append({
+                "shards": shards,
+                "ms_per_query": 1000 * elapsed / args.queries,
+                "queries_per_second": qps,
+                "speedup": qps / baseline_qps,
+                "same_results": same
+            })
+            print(f"{f'{shards} shards':<16}{1000 * elapsed / args.queries:>10.2f}{qps:>12.1f}"
+                  f"{qps / baseline_qps:>10.2f}{str(same):>12}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
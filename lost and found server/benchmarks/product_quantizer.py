@@ -0,0 +1,107 @@
+"""Product quantisation for the quantization benchmark.
+
+Kept out of quantization.py because it is not an index codec: it needs a
+codebook trained on the gallery, which FaceIndexStore snapshots do not persist,
+so it cannot be selected with FACE_INDEX_QUANTIZATION. The benchmark uses it
+to compare int8 storage against PQ with ADC.
+"""
+import os
+import sys
+import numpy as np
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quantization import SCORE_CHUNK_ROWS
+
+
+class ProductQuantizer:
+    """Product quantisation with asymmetric distance computation (ADC).
+
+    Vectors are split into ``num_subvectors`` slices and each slice is
+    replaced by the id of its nearest centroid from a per-slice k-means
+    codebook, so a 512-d float32 vector (2 KiB) becomes ``num_subvectors``
+    bytes. Queries stay in float: a lookup table of query/centroid dot
+    products is built once per query and scores are sums of table entries.
+    """
+
+    name = "pq"
+
+    def __init__(self, dim: int = 512, num_subvectors: int = 64, num_centroids: int = 256,
+                 iterations: int = 10, seed: int = 0):
+        if dim % num_subvectors:
+            raise ValueError("dim must be divisible by num_subvectors")
+        if num_centroids > 256:
+            raise ValueError("num_centroids must fit in a uint8 code")
+        self.dim = dim
+        self.num_subvectors = num_subvectors
+        self.num_centroids = num_centroids
+        self.sub_dim = dim // num_subvectors
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+
+    @property
+    def bytes_per_vector(self) -> int:
+        return self.num_subvectors
+
+    def _split(self, embeddings: np.ndarray) -> np.ndarray:
+        """(n, dim) -> (num_subvectors, n, sub_dim)"""
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        return embeddings.reshape(len(embeddings), self.num_subvectors, self.sub_dim).transpose(1, 0, 2)
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        distances = (centroids ** 2).sum(axis=1)[None, :] - 2.0 * vectors @ centroids.T
+        return distances.argmin(axis=1)
+
+    def train(self, embeddings: np.ndarray, max_samples: int = 20000) -> "ProductQuantizer":
+        """Fit the per-slice codebooks with k-means on (a sample of) ``embeddings``."""
+        rng = np.random.default_rng(self.seed)
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(embeddings) > max_samples:
+            embeddings = embeddings[rng.choice(len(embeddings), max_samples, replace=False)]
+        if len(embeddings) < self.num_centroids:
+            raise ValueError(f"Need at least {self.num_centroids} training vectors")
+
+        slices = self._split(embeddings)
+        self.centroids = np.empty((self.num_subvectors, self.num_centroids, self.sub_dim), dtype=np.float32)
+        for j, vectors in enumerate(slices):
+            centroids = vectors[rng.choice(len(vectors), self.num_centroids, replace=False)].copy()
+            for _ in range(self.iterations):
+                assignment = self._nearest(vectors, centroids)
+                counts = np.bincount(assignment, minlength=self.num_centroids)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, vectors)
+                empty = counts == 0
+                centroids[~empty] = sums[~empty] / counts[~empty, None]
+                # Re-seed empty clusters from random points
+                centroids[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+            self.centroids[j] = centroids
+        return self
+
+    def encode(self, embeddings: np.ndarray) -> np.ndarray:
+        """Return uint8 codes of shape (n, num_subvectors)."""
+        if self.centroids is None:
+            raise RuntimeError("ProductQuantizer must be trained before encoding")
+        slices = self._split(embeddings)
+        codes = np.empty((slices.shape[1], self.num_subvectors), dtype=np.uint8)
+        for j, vectors in enumerate(slices):
+            codes[:, j] = self._nearest(vectors, self.centroids[j])
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Reconstruct approximate vectors from codes."""
+        codes = np.atleast_2d(codes)
+        parts = [self.centroids[j][codes[:, j]] for j in range(self.num_subvectors)]
+        return np.concatenate(parts, axis=1)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Approximate dot products between ``query`` and every encoded row (ADC)."""
+        table = np.einsum("jkd,jd->jk", self.centroids, np.asarray(query, dtype=np.float32).reshape(self.num_subvectors, self.sub_dim))
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        columns = np.arange(self.num_subvectors)
+        for start in range(0, codes.shape[0], SCORE_CHUNK_ROWS):
+            block = codes[start:start + SCORE_CHUNK_ROWS]
+            scores[start:start + len(block)] = table[columns, block].sum(axis=1)
+        return scores
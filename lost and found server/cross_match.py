@@ -0,0 +1,143 @@
+import time
+import threading
+import numpy as np
+from datetime import datetime
+from typing import Callable, Dict, Any, Iterator, List, Sequence, Tuple
+
+# One similarity block is lost_chunk_rows x found_chunk_rows float32 values
+DEFAULT_LOST_CHUNK_ROWS = 1024
+DEFAULT_FOUND_CHUNK_ROWS = 8192
+
+
+def chunked_top_k(lost_codes: np.ndarray, found_codes: np.ndarray, decode: Callable[[np.ndarray], np.ndarray],
+                  k: int, min_similarity: float, lost_chunk_rows: int = DEFAULT_LOST_CHUNK_ROWS,
+                  found_chunk_rows: int = DEFAULT_FOUND_CHUNK_ROWS) -> Iterator[Tuple[int, int, List[Tuple[int, int, float]]]]:
+    """Best ``k`` found rows for every lost row, computed block by block.
+
+    ``decode`` turns stored index codes into normalised float32 rows, so the
+    full lost x found similarity matrix never exists in memory: peak use is one
+    lost_chunk_rows x found_chunk_rows block plus the running top-k.
+
+    Yields ``(start, stop, pairs)`` per lost chunk, where ``pairs`` holds
+    ``(lost_row, found_row, similarity)`` with similarity >= ``min_similarity``.
+    """
+    num_found = len(found_codes)
+    k = min(k, num_found)
+    for start in range(0, len(lost_codes), lost_chunk_rows):
+        lost = np.atleast_2d(decode(lost_codes[start:start + lost_chunk_rows]))
+        best_scores = np.full((len(lost), k), -np.inf, dtype=np.float32)
+        best_rows = np.full((len(lost), k), -1, dtype=np.int64)
+
+        for found_start in range(0, num_found, found_chunk_rows):
+            found = np.atleast_2d(decode(found_codes[found_start:found_start + found_chunk_rows]))
+            scores = np.concatenate([best_scores, lost @ found.T], axis=1)
+            rows = np.concatenate([best_rows, np.broadcast_to(
+                np.arange(found_start, found_start + len(found)), (len(lost), len(found)))], axis=1)
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(scores, top, axis=1)
+            best_rows = np.take_along_axis(rows, top, axis=1)
+
+        hit_rows, hit_cols = np.nonzero(best_scores >= min_similarity)
+        pairs = [(start + int(i), int(best_rows[i, j]), float(best_scores[i, j])) for i, j in zip(hit_rows, hit_cols)]
+        yield start, start + len(lost), pairs
+
+
+class CrossMatchJob:
+    """Runs the lost x found cross-match and keeps its progress for status reporting.
+
+    ``handle_pairs`` receives each chunk's candidate pairs as
+    ``(lost_face_id, found_face_id, similarity)`` and returns how many of them
+    became new match records. Only one run happens at a time.
+    """
+
+    def __init__(self, k: int = 5, min_similarity: float = 0.15,
+                 lost_chunk_rows: int = DEFAULT_LOST_CHUNK_ROWS,
+                 found_chunk_rows: int = DEFAULT_FOUND_CHUNK_ROWS):
+        self.k = k
+        self.min_similarity = min_similarity
+        self.lost_chunk_rows = lost_chunk_rows
+        self.found_chunk_rows = found_chunk_rows
+        self._lock = threading.Lock()
+        self._running = False
+        self._status: Dict[str, Any] = {"state": "idle", "runs": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def try_start(self) -> bool:
+        """Claim the job for one run. Returns False if a run is already in progress."""
+        with self._lock:
+            if self._running:
+                return False
+            self._running = True
+            return True
+
+    def _update(self, **fields):
+        with self._lock:
+            self._status.update(fields)
+
+    def run(self, load_gallery: Callable[[], Tuple[Sequence[str], np.ndarray, Sequence[str], np.ndarray]],
+            decode: Callable[[np.ndarray], np.ndarray],
+            handle_pairs: Callable[[List[Tuple[str, str, float]]], int], trigger: str = "manual") -> Dict[str, Any]:
+        """Score every lost face against every found face. Must be preceded by ``try_start``.
+
+        ``load_gallery`` returns ``(lost_ids, lost_codes, found_ids, found_codes)``
+        as stored in the embedding indexes.
+        """
+        started = time.perf_counter()
+        self._update(
+            state="running", trigger=trigger, error=None,
+            started_at=datetime.now().isoformat(), finished_at=None,
+            lost_total=0, found_total=0, lost_done=0,
+            pairs_scored=0, candidate_pairs=0, new_matches=0,
+            scoring_seconds=0.0, handling_seconds=0.0, elapsed_seconds=0.0,
+            pairs_per_second=0.0, lost_per_second=0.0, progress=0.0, runs=self._status["runs"] + 1
+        )
+        scoring = handling = 0.0
+        candidates = new_matches = 0
+        try:
+            lost_ids, lost_codes, found_ids, found_codes = load_gallery()
+            self._update(lost_total=len(lost_ids), found_total=len(found_ids))
+            if len(lost_ids) and len(found_ids):
+                chunks = chunked_top_k(lost_codes, found_codes, decode, self.k, self.min_similarity,
+                                       self.lost_chunk_rows, self.found_chunk_rows)
+                while True:
+                    block_started = time.perf_counter()
+                    chunk = next(chunks, None)
+                    scoring += time.perf_counter() - block_started
+                    if chunk is None:
+                        break
+                    start, stop, pairs = chunk
+
+                    handle_started = time.perf_counter()
+                    new_matches += handle_pairs([(lost_ids[l], found_ids[f], s) for l, f, s in pairs])
+                    handling += time.perf_counter() - handle_started
+                    candidates += len(pairs)
+
+                    elapsed = time.perf_counter() - started
+                    self._update(
+                        lost_done=stop, pairs_scored=stop * len(found_ids),
+                        candidate_pairs=candidates, new_matches=new_matches,
+                        scoring_seconds=round(scoring, 3), handling_seconds=round(handling, 3),
+                        elapsed_seconds=round(elapsed, 3),
+                        pairs_per_second=round(stop * len(found_ids) / scoring, 1) if scoring else 0.0,
+                        lost_per_second=round(stop / elapsed, 1) if elapsed else 0.0,
+                        progress=round(stop / len(lost_ids), 4)
+                    )
+            self._update(state="completed", progress=1.0,
+                         elapsed_seconds=round(time.perf_counter() - started, 3),
+                         finished_at=datetime.now().isoformat())
+        except Exception as e:
+            self._update(state="failed", error=str(e),
+                         elapsed_seconds=round(time.perf_counter() - started, 3),
+                         finished_at=datetime.now().isoformat())
+            raise
+        finally:
+            with self._lock:
+                self._running = False
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._status)
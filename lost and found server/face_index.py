@@ -0,0 +1,169 @@
+import threading
+import numpy as np
+from typing import Optional, List, Tuple, Sequence
+
+from quantization import Float32Codec
+
+# ArcFace embedding size
+EMBEDDING_DIM = 512
+
+
+def normalize_embeddings(embeddings) -> np.ndarray:
+    """Return float32 embeddings with L2-normalised rows so dot product is cosine similarity."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    squeeze = matrix.ndim == 1
+    matrix = np.atleast_2d(matrix)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix = matrix / norms
+    return matrix[0] if squeeze else matrix
+
+
+def calibrate_similarity(similarity, threshold: float, scale: float):
+    """Map cosine similarity to a 0-1 match confidence with a logistic curve.
+
+    ``threshold`` is the similarity at which DeepFace's ``verify`` would flip
+    to a match, so a confidence of 0.5 corresponds to its decision boundary.
+    """
+    return 1.0 / (1.0 + np.exp(-scale * (np.asarray(similarity, dtype=np.float64) - threshold)))
+
+
+class FaceIndex:
+    """Cosine similarity index over face embeddings keyed by face_id.
+
+    Rows are stored in a read-only base segment, which may be a memory-mapped
+    snapshot shared between processes, followed by an in-memory tail of rows
+    added since. Removed or replaced rows are tombstoned until ``compact``.
+
+    Rows are stored in the representation of ``codec`` (normalised float32
+    by default, or compact int8 codes); queries are always float32.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM, base: Optional[np.ndarray] = None,
+                 base_ids: Optional[Sequence[str]] = None, codec=None):
+        self.dim = dim
+        self.codec = codec or Float32Codec()
+        self.width = self.codec.code_width(dim)
+        self._lock = threading.RLock()
+        self._base = base if base is not None else np.empty((0, self.width), dtype=self.codec.dtype)
+        self._ids: List[Optional[str]] = list(base_ids or [])
+        if len(self._ids) != self._base.shape[0]:
+            raise ValueError("Number of ids does not match number of embedding rows")
+
+        self._tail = np.empty((0, self.width), dtype=self.codec.dtype)
+        self._tail_size = 0
+        self._live = np.ones(len(self._ids), dtype=bool)
+        self._positions = {face_id: i for i, face_id in enumerate(self._ids)}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, face_id: str) -> bool:
+        return face_id in self._positions
+
+    @property
+    def tombstones(self) -> int:
+        """Number of dead rows waiting for compaction."""
+        return len(self._ids) - len(self._positions)
+
+    def _grow_tail(self, needed: int):
+        capacity = max(64, self._tail.shape[0])
+        while capacity < needed:
+            capacity *= 2
+        if capacity != self._tail.shape[0]:
+            tail = np.empty((capacity, self.width), dtype=self.codec.dtype)
+            tail[:self._tail_size] = self._tail[:self._tail_size]
+            self._tail = tail
+            live = np.zeros(self._base.shape[0] + capacity, dtype=bool)
+            live[:len(self._ids)] = self._live[:len(self._ids)]
+            self._live = live
+
+    def add(self, face_id: str, embedding) -> None:
+        """Insert or replace the embedding for ``face_id``."""
+        self.add_batch([face_id], np.atleast_2d(embedding))
+
+    def add_batch(self, face_ids: Sequence[str], embeddings) -> None:
+        """Insert or replace embeddings for several face ids at once."""
+        if len(face_ids) == 0:
+            return
+        matrix = normalize_embeddings(np.atleast_2d(embeddings))
+        if matrix.shape != (len(face_ids), self.dim):
+            raise ValueError(f"Expected embeddings of shape ({len(face_ids)}, {self.dim}), got {matrix.shape}")
+
+        codes = self.codec.encode(matrix)
+
+        with self._lock:
+            for face_id in face_ids:
+                old = self._positions.pop(face_id, None)
+                if old is not None:
+                    self._live[old] = False
+
+            self._grow_tail(self._tail_size + len(face_ids))
+            self._tail[self._tail_size:self._tail_size + len(face_ids)] = codes
+            start = len(self._ids)
+            self._tail_size += len(face_ids)
+            self._ids.extend(face_ids)
+            self._live[start:start + len(face_ids)] = True
+            for offset, face_id in enumerate(face_ids):
+                self._positions[face_id] = start + offset
+
+    def remove(self, face_id: str) -> bool:
+        """Remove ``face_id`` from the index. Returns True if it was present."""
+        with self._lock:
+            position = self._positions.pop(face_id, None)
+            if position is None:
+                return False
+            self._live[position] = False
+            return True
+
+    def _row(self, position: int) -> np.ndarray:
+        base_rows = self._base.shape[0]
+        if position < base_rows:
+            return self._base[position]
+        return self._tail[position - base_rows]
+
+    def get(self, face_id: str) -> Optional[np.ndarray]:
+        """Return a copy of the stored (normalised) embedding for ``face_id``."""
+        with self._lock:
+            position = self._positions.get(face_id)
+            if position is None:
+                return None
+            return self.codec.decode(np.array(self._row(position)))
+
+    def scores(self, query) -> np.ndarray:
+        """Cosine similarity of ``query`` against every row; dead rows score -inf."""
+        query = normalize_embeddings(query)
+        with self._lock:
+            base_rows = self._base.shape[0]
+            total = base_rows + self._tail_size
+            scores = np.empty(total, dtype=np.float32)
+            if base_rows:
+                scores[:base_rows] = self.codec.scores(self._base, query)
+            if self._tail_size:
+                scores[base_rows:] = self.codec.scores(self._tail[:self._tail_size], query)
+            scores[~self._live[:total]] = -np.inf
+            return scores
+
+    def search(self, query, k: int = 10) -> List[Tuple[str, float]]:
+        """Return up to ``k`` (face_id, cosine similarity) pairs, most similar first."""
+        with self._lock:
+            scores = self.scores(query)
+            k = min(k, len(self._positions))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self._ids[i], float(scores[i])) for i in top]
+
+    def compact(self) -> Tuple[List[str], np.ndarray]:
+        """Return the live face ids and a dense copy of their stored rows (codec representation)."""
+        with self._lock:
+            base_rows = self._base.shape[0]
+            total = base_rows + self._tail_size
+            live = np.flatnonzero(self._live[:total])
+            matrix = np.empty((len(live), self.width), dtype=self.codec.dtype)
+            base_live = live[live < base_rows]
+            tail_live = live[live >= base_rows] - base_rows
+            matrix[:len(base_live)] = self._base[base_live]
+            matrix[len(base_live):] = self._tail[tail_live]
+            return [self._ids[i] for i in live], matrix
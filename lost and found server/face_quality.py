@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+from typing import Dict, Any, List
+
+
+def assess_face_quality(face_image: np.ndarray, detector_confidence: float,
+                        good_face_size: float = 112.0, good_sharpness: float = 150.0) -> Dict[str, Any]:
+    """Cheap quality scores for a cropped face.
+
+    - face_size: shorter side of the crop in pixels (ArcFace works at 112x112)
+    - sharpness: variance of the Laplacian, low for blurred or out-of-focus crops
+    - detector_confidence: YOLO box confidence, low for occluded or profile faces
+
+    ``score`` combines the three into 0-1 with a geometric mean, so one very
+    poor factor pulls the whole score down.
+    """
+    height, width = face_image.shape[:2]
+    face_size = min(height, width)
+    gray = cv2.cvtColor(face_image, cv2.COLOR_BGR2GRAY) if face_image.ndim == 3 else face_image
+    sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var()) if face_size > 0 else 0.0
+
+    factors = [
+        min(1.0, face_size / good_face_size),
+        min(1.0, sharpness / good_sharpness),
+        min(1.0, max(0.0, detector_confidence))
+    ]
+    score = float(np.prod(factors) ** (1.0 / len(factors)))
+
+    return {
+        "face_size": int(face_size),
+        "sharpness": round(sharpness, 2),
+        "detector_confidence": round(float(detector_confidence), 4),
+        "score": round(score, 4)
+    }
+
+
+def quality_problems(quality: Dict[str, Any], min_face_size: int, min_sharpness: float,
+                     min_confidence: float) -> List[str]:
+    """Reasons a face is unusable for matching; empty if it passes the gate."""
+    problems = []
+    if quality["face_size"] < min_face_size:
+        problems.append("face is too small, move closer or crop the photo")
+    if quality["sharpness"] < min_sharpness:
+        problems.append("photo is too blurry")
+    if quality["detector_confidence"] < min_confidence:
+        problems.append("face is not clearly visible, use a front-facing photo")
+    return problems
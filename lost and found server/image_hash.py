@@ -0,0 +1,37 @@
+import cv2
+import numpy as np
+from typing import List
+
+# 64-bit hash split into 4 bands of 16 bits: by the pigeonhole principle two
+# hashes within Hamming distance 3 share at least one band exactly, so an
+# indexed lookup on the bands finds every near-exact duplicate.
+PHASH_BANDS = 4
+PHASH_MAX_DISTANCE = PHASH_BANDS - 1
+
+
+def perceptual_hash(image: np.ndarray) -> int:
+    """64-bit DCT perceptual hash (pHash) of a BGR or grayscale image."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].flatten()
+    # The DC term only encodes overall brightness; keep it out of the median
+    bits = low > np.median(low[1:])
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def format_hash(value: int) -> str:
+    return f"{value:016x}"
+
+
+def hash_bands(value: int) -> List[str]:
+    """Band keys for the multikey index, e.g. ``["0:9f3a", "1:0c71", ...]``."""
+    width = 64 // PHASH_BANDS
+    mask = (1 << width) - 1
+    return [f"{band}:{(value >> (band * width)) & mask:0{width // 4}x}" for band in range(PHASH_BANDS)]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
@@ -0,0 +1,338 @@
+import os
+import glob
+import json
+import base64
+import logging
+import threading
+import time
+import numpy as np
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, so run a single worker there
+    fcntl = None
+
+from face_index import FaceIndex, EMBEDDING_DIM
+from quantization import Float32Codec
+
+logger = logging.getLogger(__name__)
+
+
+class FaceIndexStore:
+    """A FaceIndex persisted as a memory-mapped snapshot plus a write-ahead log.
+
+    Files in ``directory`` for an index called ``name``:
+
+    - ``<name>.json``: snapshot manifest (matrix file, face ids, last WAL sequence)
+    - ``<name>-<seq>.npy``: embedding matrix, opened with ``mmap_mode='r'`` so the
+      pages are shared by every worker process that loads the same snapshot
+    - ``<name>.wal``: JSON lines of changes made after the snapshot
+    - ``<name>.lock``: flock held while the WAL is appended to, read or rotated
+    - ``<name>.writer.lock``: flock held for life by the one process that writes snapshots
+
+    Any number of worker processes may share a store. Every worker appends its
+    own changes to the WAL under the lock, after catching up on the entries
+    other workers wrote, so sequence numbers stay global and each worker's
+    index sees every change. Only the elected writer (``try_become_writer``)
+    rotates the WAL and writes snapshots; the others ``refresh`` by tailing the
+    WAL and reload when a new snapshot appears. If the writer exits, its lock is
+    released and another worker can take over.
+
+    ``index_factory`` builds the in-memory index from an optional base matrix
+    and ids (``FaceIndex`` or ``ShardedFaceIndex``), and ``codec`` selects the
+    stored row representation (see ``quantization``).
+    """
+
+    def __init__(self, directory: str, name: str, dim: int = EMBEDDING_DIM,
+                 index_factory: Callable[..., Any] = FaceIndex, codec=None):
+        self.directory = directory
+        self.name = name
+        self.dim = dim
+        self.codec = codec or Float32Codec()
+        self.index_factory = index_factory
+        self.index = index_factory(dim, codec=self.codec)
+        self.pending_changes = 0
+        self.last_snapshot_time: Optional[str] = None
+
+        self._lock = threading.RLock()
+        self._seq = 0
+        self._snapshot_seq: Optional[int] = None
+        # Position in the live WAL up to which entries have been applied
+        self._wal_inode: Optional[int] = None
+        self._wal_offset = 0
+        self._lock_file = None
+        self._lock_depth = 0
+        self._writer_file = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, f"{self.name}.json")
+
+    @property
+    def wal_path(self) -> str:
+        return os.path.join(self.directory, f"{self.name}.wal")
+
+    @property
+    def is_writer(self) -> bool:
+        return fcntl is None or self._writer_file is not None
+
+    def try_become_writer(self) -> bool:
+        """Claim the snapshot writer role if no other process holds it."""
+        with self._lock:
+            if self.is_writer:
+                return True
+            writer_file = open(os.path.join(self.directory, f"{self.name}.writer.lock"), "a")
+            try:
+                fcntl.flock(writer_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                writer_file.close()
+                return False
+            self._writer_file = writer_file
+            logger.info(f"This process (pid {os.getpid()}) writes face index snapshots for '{self.name}'")
+            return True
+
+    @contextmanager
+    def _wal_locked(self):
+        """Hold the cross-process WAL lock (re-entrant within this process)."""
+        with self._lock:
+            if self._lock_depth == 0 and fcntl is not None:
+                if self._lock_file is None:
+                    self._lock_file = open(os.path.join(self.directory, f"{self.name}.lock"), "a")
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _read_wal(self, path: str, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Complete entries of a WAL file after ``offset`` and the offset just past them."""
+        entries = []
+        with open(path, "rb") as wal:
+            wal.seek(offset)
+            for line in wal:
+                if not line.endswith(b"\n"):
+                    # A torn final line from a crash mid-write; it was never acknowledged
+                    logger.warning(f"Ignoring truncated WAL entry in {path}")
+                    break
+                offset += len(line)
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring corrupt WAL entry in {path}")
+        return entries, offset
+
+    def _apply(self, index, entries: List[Dict[str, Any]]) -> int:
+        """Apply entries newer than the last applied sequence number; returns how many."""
+        applied = 0
+        for entry in entries:
+            if entry["seq"] <= self._seq:
+                continue
+            if entry["op"] == "add":
+                embedding = np.frombuffer(base64.b64decode(entry["embedding"]), dtype=np.float32)
+                index.add(entry["face_id"], embedding)
+            elif entry["op"] == "remove":
+                index.remove(entry["face_id"])
+            self._seq = entry["seq"]
+            applied += 1
+        return applied
+
+    def _wal_segments(self):
+        """WAL files in replay order: frozen segments from interrupted snapshots, then the live log."""
+        frozen = sorted(glob.glob(self.wal_path + ".*"), key=lambda p: int(p.rsplit(".", 1)[1]))
+        return frozen + ([self.wal_path] if os.path.exists(self.wal_path) else [])
+
+    def _replay_segments(self, index) -> int:
+        """Apply every WAL segment and start tailing the live log at its end. Caller holds the WAL lock."""
+        applied = 0
+        self._wal_inode, self._wal_offset = None, 0
+        for path in self._wal_segments():
+            entries, end = self._read_wal(path)
+            applied += self._apply(index, entries)
+            if path == self.wal_path:
+                self._wal_inode, self._wal_offset = os.stat(path).st_ino, end
+        return applied
+
+    def _manifest_seq(self) -> Optional[int]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("wal_seq", 0)
+        except (OSError, ValueError):
+            return None
+
+    def _refresh_locked(self) -> int:
+        """Catch up with changes other processes made. Caller holds the WAL lock."""
+        manifest_seq = self._manifest_seq()
+        if manifest_seq is not None and manifest_seq != self._snapshot_seq:
+            # Another process wrote a snapshot; map it instead of growing the overlay
+            if self.load():
+                return 0
+            # Unusable snapshot: keep tailing the WAL rather than retrying it on every call
+            self._snapshot_seq = manifest_seq
+        try:
+            inode = os.stat(self.wal_path).st_ino
+        except FileNotFoundError:
+            inode = None
+        if inode is not None and inode == self._wal_inode:
+            entries, self._wal_offset = self._read_wal(self.wal_path, self._wal_offset)
+            applied = self._apply(self.index, entries)
+        else:
+            # The live log was rotated (or created) since we last read it
+            applied = self._replay_segments(self.index)
+        self.pending_changes += applied
+        return applied
+
+    def refresh(self) -> int:
+        """Apply changes written by other worker processes; returns how many were applied."""
+        with self._wal_locked():
+            return self._refresh_locked()
+
+    def _append(self, entry: Dict[str, Any]):
+        with self._wal_locked():
+            # Other workers may have appended since; their entries come first
+            self._refresh_locked()
+            self._seq += 1
+            entry["seq"] = self._seq
+            with open(self.wal_path, "ab") as wal:
+                if wal.tell() > 0:
+                    with open(self.wal_path, "rb") as tail:
+                        tail.seek(-1, os.SEEK_END)
+                        if tail.read(1) != b"\n":
+                            # Terminate a torn line left by a crashed writer
+                            wal.write(b"\n")
+                wal.write(json.dumps(entry).encode("utf-8") + b"\n")
+                wal.flush()
+            stat = os.stat(self.wal_path)
+            self._wal_inode, self._wal_offset = stat.st_ino, stat.st_size
+            self.pending_changes += 1
+
+    def add(self, face_id: str, embedding) -> None:
+        """Add or replace an embedding and record it in the write-ahead log."""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            self._append({
+                "op": "add",
+                "face_id": face_id,
+                "embedding": base64.b64encode(embedding.tobytes()).decode("ascii")
+            })
+            self.index.add(face_id, embedding)
+
+    def remove(self, face_id: str) -> None:
+        """Remove an embedding and record the removal in the write-ahead log."""
+        with self._lock:
+            if face_id not in self.index:
+                return
+            self._append({"op": "remove", "face_id": face_id})
+            self.index.remove(face_id)
+
+    def load(self) -> bool:
+        """Map the latest snapshot and replay later WAL entries.
+
+        Returns False when there is no usable snapshot, in which case the
+        caller should rebuild the index from the database.
+        """
+        with self._wal_locked():
+            if not os.path.exists(self.manifest_path):
+                return False
+            started = time.time()
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                if manifest.get("codec", Float32Codec.name) != self.codec.name:
+                    raise ValueError(f"snapshot uses '{manifest.get('codec')}' rows, index is configured for '{self.codec.name}'")
+                matrix = np.load(os.path.join(self.directory, manifest["matrix_file"]), mmap_mode="r")
+                if matrix.shape[1] != self.codec.code_width(self.dim) or matrix.dtype != self.codec.dtype:
+                    raise ValueError(f"snapshot rows {matrix.shape[1]}x{matrix.dtype} do not match the configured index")
+                index = self.index_factory(self.dim, base=matrix, base_ids=manifest["face_ids"], codec=self.codec)
+            except Exception as e:
+                logger.error(f"Could not load face index snapshot {self.manifest_path}: {e}")
+                return False
+
+            snapshot_seq = manifest.get("wal_seq", 0)
+            self._seq = snapshot_seq
+            replayed = self._replay_segments(index)
+
+            if hasattr(self.index, "close"):
+                self.index.close()
+            self.index = index
+            self._snapshot_seq = snapshot_seq
+            self.pending_changes = replayed
+            self.last_snapshot_time = manifest.get("created_at")
+            logger.info(f"Loaded face index '{self.name}' from snapshot: {len(index)} faces, "
+                        f"{replayed} WAL entries replayed in {time.time() - started:.2f}s")
+            return True
+
+    def bulk_add(self, face_ids, embeddings) -> None:
+        """Add rows loaded from the database without logging them; call ``snapshot`` afterwards."""
+        with self._lock:
+            self.index.add_batch(face_ids, embeddings)
+            self.pending_changes += len(face_ids)
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """Write the current index as a new snapshot and truncate the WAL.
+
+        Only the elected writer snapshots; other processes return None.
+        """
+        if not self.is_writer:
+            return None
+        with self._wal_locked():
+            self._refresh_locked()
+            seq = self._seq
+            face_ids, matrix = self.index.compact()
+            # Freeze the current log; new changes go to a fresh WAL while we write
+            frozen = f"{self.wal_path}.{seq}"
+            if os.path.exists(self.wal_path):
+                os.replace(self.wal_path, frozen)
+            self._wal_inode, self._wal_offset = None, 0
+            self.pending_changes = 0
+
+        started = time.time()
+        matrix_file = f"{self.name}-{seq}.npy"
+        tmp_matrix = os.path.join(self.directory, matrix_file + ".tmp")
+        with open(tmp_matrix, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp_matrix, os.path.join(self.directory, matrix_file))
+
+        created_at = datetime.now().isoformat()
+        tmp_manifest = self.manifest_path + ".tmp"
+        with open(tmp_manifest, "w", encoding="utf-8") as f:
+            json.dump({
+                "matrix_file": matrix_file,
+                "face_ids": face_ids,
+                "wal_seq": seq,
+                "dim": self.dim,
+                "codec": self.codec.name,
+                "created_at": created_at
+            }, f)
+
+        with self._wal_locked():
+            os.replace(tmp_manifest, self.manifest_path)
+            # This process's index already reflects the new snapshot
+            self._snapshot_seq = seq
+            # The snapshot now covers everything up to seq; drop older files
+            for path in glob.glob(os.path.join(self.directory, f"{self.name}-*.npy")):
+                if os.path.basename(path) != matrix_file:
+                    os.remove(path)
+            for path in glob.glob(self.wal_path + ".*"):
+                if int(path.rsplit(".", 1)[1]) <= seq:
+                    os.remove(path)
+
+        self.last_snapshot_time = created_at
+        logger.info(f"Wrote face index snapshot '{self.name}': {len(face_ids)} faces "
+                    f"in {time.time() - started:.2f}s")
+        return {"faces": len(face_ids), "wal_seq": seq, "created_at": created_at}
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size and persistence state for health reporting."""
+        return {
+            "faces": len(self.index),
+            "pending_changes": self.pending_changes,
+            "last_snapshot": self.last_snapshot_time,
+            "snapshot_writer": self.is_writer
+        }
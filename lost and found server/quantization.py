@@ -0,0 +1,75 @@
+import numpy as np
+
+# Rows scored per block so temporary float copies stay cache sized
+SCORE_CHUNK_ROWS = 2048
+
+
+class Float32Codec:
+    """Exact storage: rows are kept as normalised float32 vectors."""
+
+    name = "none"
+    dtype = np.float32
+
+    def code_width(self, dim: int) -> int:
+        return dim
+
+    def encode(self, embeddings: np.ndarray) -> np.ndarray:
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return np.asarray(codes, dtype=np.float32)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        return codes @ query
+
+
+class Int8Codec:
+    """Scalar int8 quantisation with one scale per row (4x smaller than float32).
+
+    Each normalised row is scaled so its largest component maps to 127. The
+    scale is not stored: scores are computed asymmetrically against the float
+    query and divided by the norm of the int8 row, which yields the cosine
+    similarity to the quantised direction.
+    """
+
+    name = "int8"
+    dtype = np.int8
+
+    def code_width(self, dim: int) -> int:
+        return dim
+
+    def encode(self, embeddings: np.ndarray) -> np.ndarray:
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        peak = np.abs(embeddings).max(axis=1, keepdims=True)
+        peak[peak == 0] = 1.0
+        return np.round(embeddings * (127.0 / peak)).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        rows = np.atleast_2d(codes).astype(np.float32)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        decoded = rows / norms
+        return decoded[0] if np.ndim(codes) == 1 else decoded
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        for start in range(0, codes.shape[0], SCORE_CHUNK_ROWS):
+            block = codes[start:start + SCORE_CHUNK_ROWS].astype(np.float32)
+            norms = np.sqrt(np.einsum("ij,ij->i", block, block))
+            norms[norms == 0] = 1.0
+            scores[start:start + len(block)] = (block @ query) / norms
+        return scores
+
+
+INDEX_CODECS = {
+    Float32Codec.name: Float32Codec,
+    Int8Codec.name: Int8Codec
+}
+
+
+def get_codec(name: str):
+    """Return the index storage codec for a FACE_INDEX_QUANTIZATION value."""
+    try:
+        return INDEX_CODECS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown face index quantization '{name}', expected one of {sorted(INDEX_CODECS)}")
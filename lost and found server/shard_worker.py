@@ -0,0 +1,70 @@
+"""Shard worker process for ShardedFaceIndex.
+
+Started by ``sharding.ShardedFaceIndex`` as a fresh interpreter running this
+file, so it imports NumPy and the index modules only: nothing from the
+application, its models or its threads is inherited. The worker listens on a
+local socket, prints the address for its parent, and serves index commands
+over the authenticated connection until the parent goes away.
+"""
+import os
+import sys
+from multiprocessing.connection import Listener
+
+import numpy as np
+
+from face_index import FaceIndex
+
+
+def serve(conn, dim: int, codec):
+    """Serve one shard of a ShardedFaceIndex until the connection is closed."""
+    index = FaceIndex(dim, codec=codec)
+    while True:
+        try:
+            command, args = conn.recv()
+        except (EOFError, OSError):
+            break
+        try:
+            if command == "load_mmap":
+                path, start, stop, face_ids = args
+                base = np.load(path, mmap_mode="r")[start:stop]
+                index = FaceIndex(dim, base=base, base_ids=face_ids, codec=codec)
+                result = len(index)
+            elif command == "load":
+                face_ids, matrix = args
+                index = FaceIndex(dim, base=matrix, base_ids=face_ids, codec=codec)
+                result = len(index)
+            elif command == "add":
+                face_ids, matrix = args
+                index.add_batch(face_ids, matrix)
+                result = len(index)
+            elif command == "remove":
+                result = [index.remove(face_id) for face_id in args]
+            elif command == "search":
+                query, k = args
+                result = index.search(query, k)
+            elif command == "get":
+                result = index.get(args)
+            elif command == "compact":
+                result = index.compact()
+            elif command == "stop":
+                conn.send(("ok", None))
+                break
+            else:
+                raise ValueError(f"Unknown shard command: {command}")
+            conn.send(("ok", result))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+def main():
+    authkey = bytes.fromhex(os.environ["SHARD_WORKER_AUTHKEY"])
+    with Listener(authkey=authkey) as listener:
+        print(listener.address, flush=True)
+        conn = listener.accept()
+    dim, codec = conn.recv()
+    serve(conn, dim, codec)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
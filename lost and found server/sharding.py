@@ -0,0 +1,200 @@
+import os
+import sys
+import heapq
+import threading
+import subprocess
+import zlib
+import numpy as np
+from multiprocessing.connection import Client
+from typing import Optional, List, Tuple, Sequence, Dict
+
+from face_index import EMBEDDING_DIM, normalize_embeddings
+from quantization import Float32Codec
+
+SHARD_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shard_worker.py")
+
+
+class ShardedFaceIndex:
+    """A FaceIndex partitioned across local worker processes.
+
+    Each worker owns one shard and scans it independently, so a query is
+    scattered to every shard and the per-shard top-k lists are merged. Rows
+    from a memory-mapped snapshot are split into contiguous ranges that each
+    worker maps itself; rows added later go to the shard chosen by a hash of
+    the face id.
+
+    Workers are started lazily on first use as fresh interpreters running
+    ``shard_worker.py``, which imports NumPy and the index modules only. They
+    are never forked from the application process, whose model, database and
+    thread-pool threads would make a fork unsafe, and unlike multiprocessing's
+    spawn and forkserver contexts they do not re-run the application's main
+    module (``python app.py``) to load the models again.
+
+    A closed index does not restart its workers: any later use raises
+    RuntimeError. ``close`` waits for in-flight calls to finish.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM, base: Optional[np.ndarray] = None,
+                 base_ids: Optional[Sequence[str]] = None, codec=None, num_shards: int = 2):
+        self.dim = dim
+        self.codec = codec or Float32Codec()
+        self.num_shards = max(1, num_shards)
+        self._lock = threading.Lock()
+        self._conns = []
+        self._processes = []
+        self._owner: Dict[str, int] = {}
+        self._pending_base = (base, list(base_ids or []))
+        self.closed = False
+
+    def _start_worker(self):
+        authkey = os.urandom(32)
+        process = subprocess.Popen(
+            [sys.executable, SHARD_WORKER_SCRIPT],
+            stdout=subprocess.PIPE,
+            env={**os.environ, "SHARD_WORKER_AUTHKEY": authkey.hex()}
+        )
+        address = process.stdout.readline().decode("utf-8").strip()
+        process.stdout.close()
+        if not address:
+            process.wait()
+            raise RuntimeError(f"Shard worker exited with code {process.returncode} before starting")
+        conn = Client(address, authkey=authkey)
+        conn.send((self.dim, self.codec))
+        return conn, process
+
+    def _ensure_started(self):
+        if self.closed:
+            raise RuntimeError("ShardedFaceIndex is closed")
+        if self._processes:
+            return
+        for _ in range(self.num_shards):
+            conn, process = self._start_worker()
+            self._conns.append(conn)
+            self._processes.append(process)
+
+        base, base_ids = self._pending_base
+        self._pending_base = (None, [])
+        if base is not None and len(base_ids):
+            self._load_base(base, base_ids)
+
+    def _load_base(self, base: np.ndarray, base_ids: List[str]):
+        bounds = np.linspace(0, len(base_ids), self.num_shards + 1).astype(int)
+        for shard, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+            shard_ids = base_ids[start:stop]
+            if isinstance(base, np.memmap) and base.filename:
+                # Let the worker map the same file so snapshot pages stay shared
+                self._conns[shard].send(("load_mmap", (base.filename, start, stop, shard_ids)))
+            else:
+                self._conns[shard].send(("load", (shard_ids, np.ascontiguousarray(base[start:stop]))))
+            for face_id in shard_ids:
+                self._owner[face_id] = shard
+        for conn in self._conns:
+            self._receive(conn)
+
+    @staticmethod
+    def _receive(conn):
+        status, result = conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"Shard worker error: {result}")
+        return result
+
+    def _call(self, shard: int, command: str, args=None):
+        self._conns[shard].send((command, args))
+        return self._receive(self._conns[shard])
+
+    def _shard_for(self, face_id: str) -> int:
+        return zlib.crc32(face_id.encode("utf-8")) % self.num_shards
+
+    def __len__(self) -> int:
+        return len(self._owner) + len(self._pending_base[1])
+
+    def __contains__(self, face_id: str) -> bool:
+        with self._lock:
+            self._ensure_started()
+            return face_id in self._owner
+
+    def add(self, face_id: str, embedding) -> None:
+        """Insert or replace the embedding for ``face_id``."""
+        self.add_batch([face_id], np.atleast_2d(embedding))
+
+    def add_batch(self, face_ids: Sequence[str], embeddings) -> None:
+        """Insert or replace embeddings, routing each to its shard."""
+        matrix = normalize_embeddings(np.atleast_2d(embeddings))
+        with self._lock:
+            self._ensure_started()
+            self._remove_locked([f for f in face_ids if f in self._owner])
+            by_shard: Dict[int, List[int]] = {}
+            for row, face_id in enumerate(face_ids):
+                by_shard.setdefault(self._shard_for(face_id), []).append(row)
+            for shard, rows in by_shard.items():
+                self._conns[shard].send(("add", ([face_ids[r] for r in rows], matrix[rows])))
+            for shard, rows in by_shard.items():
+                self._receive(self._conns[shard])
+                for r in rows:
+                    self._owner[face_ids[r]] = shard
+
+    def _remove_locked(self, face_ids: Sequence[str]):
+        by_shard: Dict[int, List[str]] = {}
+        for face_id in face_ids:
+            shard = self._owner.pop(face_id, None)
+            if shard is not None:
+                by_shard.setdefault(shard, []).append(face_id)
+        for shard, ids in by_shard.items():
+            self._call(shard, "remove", ids)
+
+    def remove(self, face_id: str) -> bool:
+        """Remove ``face_id`` from its shard. Returns True if it was present."""
+        with self._lock:
+            self._ensure_started()
+            present = face_id in self._owner
+            self._remove_locked([face_id])
+            return present
+
+    def get(self, face_id: str) -> Optional[np.ndarray]:
+        """Return the stored (normalised) embedding for ``face_id``."""
+        with self._lock:
+            self._ensure_started()
+            shard = self._owner.get(face_id)
+            return None if shard is None else self._call(shard, "get", face_id)
+
+    def search(self, query, k: int = 10) -> List[Tuple[str, float]]:
+        """Scatter the query to every shard and merge the per-shard top-k."""
+        query = normalize_embeddings(query)
+        with self._lock:
+            self._ensure_started()
+            for conn in self._conns:
+                conn.send(("search", (query, k)))
+            partials = [self._receive(conn) for conn in self._conns]
+        return heapq.nlargest(k, (hit for partial in partials for hit in partial), key=lambda hit: hit[1])
+
+    def compact(self) -> Tuple[List[str], np.ndarray]:
+        """Gather the live face ids and a dense copy of their stored rows from all shards."""
+        with self._lock:
+            self._ensure_started()
+            for conn in self._conns:
+                conn.send(("compact", None))
+            parts = [self._receive(conn) for conn in self._conns]
+        face_ids = [face_id for ids, _ in parts for face_id in ids]
+        matrix = np.concatenate([m for _, m in parts]) if parts else \
+            np.empty((0, self.codec.code_width(self.dim)), dtype=self.codec.dtype)
+        return face_ids, matrix
+
+    def close(self) -> None:
+        """Stop all shard workers."""
+        with self._lock:
+            self.closed = True
+            for conn, process in zip(self._conns, self._processes):
+                try:
+                    conn.send(("stop", None))
+                    conn.recv()
+                except (EOFError, OSError):
+                    pass
+                conn.close()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            self._conns = []
+            self._processes = []
+            self._owner = {}
+            self._pending_base = (None, [])
@@ -0,0 +1,113 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Spelling variants that transliterated (mostly Indian) names drift between,
+# e.g. Mohammed/Muhammad, Shrikant/Srikant, Pooja/Puja, Lakshmi/Laxmi
+TRANSLITERATION_FOLDS = [
+    (re.compile(r"ksh|x"), "ks"),
+    (re.compile(r"shr"), "sr"),
+    (re.compile(r"(?<=[bcdgjkpt])h"), ""),
+    (re.compile(r"sh"), "s"),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"z"), "j"),
+    (re.compile(r"q|ck|c(?=[aou])"), "k"),
+    (re.compile(r"ee|ii|ey$|y$"), "i"),
+    (re.compile(r"oo|uu|ou"), "u"),
+    (re.compile(r"aa"), "a"),
+    (re.compile(r"([a-z])\1+"), r"\1"),
+]
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase ASCII letters/digits separated by single spaces."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+def fold_word(word: str) -> str:
+    """Collapse common transliteration variants of a word to one spelling."""
+    if word.isdigit():
+        return word
+    for pattern, replacement in TRANSLITERATION_FOLDS:
+        word = pattern.sub(replacement, word)
+    # Unstressed vowels are the least stable part of a transliteration
+    return word[0] + re.sub(r"[aeiou]", "", word[1:]) if len(word) > 3 else word
+
+
+def _word_trigrams(word: str) -> List[str]:
+    padded = f"  {word} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of the spelling as written ("p:") and of its folded form ("f:").
+
+    Words are padded so prefixes count; digit runs (phone numbers) are not
+    padded, so any fragment of a number matches.
+    """
+    grams = set()
+    for word in normalize_text(text).split():
+        if word.isdigit():
+            grams.update("p:" + word[i:i + 3] for i in range(max(1, len(word) - 2)))
+            continue
+        grams.update("p:" + gram for gram in _word_trigrams(word))
+        grams.update("f:" + gram for gram in _word_trigrams(fold_word(word)))
+    return grams
+
+
+def search_keys(values: Dict[str, Optional[str]]) -> List[str]:
+    """Trigram keys ("<field>|<trigram>") of a record's searchable field values.
+
+    The keys are stored on the record itself and indexed in MongoDB, so every
+    worker searches the same, always current data.
+    """
+    return sorted(f"{field}|{gram}" for field, value in values.items() for gram in trigrams(value or ""))
+
+
+def query_keys(query: str, fields: Sequence[str]) -> List[str]:
+    """Keys of ``query`` in each of ``fields``, to look up candidate records with."""
+    return sorted(f"{field}|{gram}" for field in fields for gram in trigrams(query))
+
+
+def rank_matches(query: str, candidates: Iterable[Tuple[str, Iterable[str]]],
+                 fields: Sequence[str], min_score: float = 0.5) -> List[Tuple[str, float]]:
+    """Record ids ranked by their best field score, highest first.
+
+    ``candidates`` are ``(record_id, search_keys)`` pairs. A record matches
+    when enough of the query's trigrams occur in one of its fields, so
+    fragments ("ram" in "Ramesh"), digit runs in phone numbers and misspelt or
+    differently transliterated names all match. A field is scored on the
+    written and on the folded spelling separately and keeps the better of the
+    two: mostly the share of query trigrams it contains, with a small bonus
+    for values of similar length, so exact matches rank above longer values
+    that merely contain the query.
+    """
+    query_grams = trigrams(query)
+    if not query_grams:
+        return []
+    query_sizes = Counter(gram[0] for gram in query_grams)
+
+    best: Dict[str, float] = {}
+    for record_id, keys in candidates:
+        grams: Dict[str, Set[str]] = {}
+        for key in keys:
+            field, _, gram = key.partition("|")
+            grams.setdefault(field, set()).add(gram)
+        for field in fields:
+            field_grams = grams.get(field)
+            if not field_grams:
+                continue
+            shared = Counter(gram[0] for gram in query_grams & field_grams)
+            record_sizes = Counter(gram[0] for gram in field_grams)
+            for kind, count in shared.items():
+                coverage = count / query_sizes[kind]
+                if coverage < min_score:
+                    continue
+                dice = 2.0 * count / (query_sizes[kind] + record_sizes[kind])
+                score = 0.8 * coverage + 0.2 * dice
+                if score > best.get(record_id, 0.0):
+                    best[record_id] = score
+    return sorted(best.items(), key=lambda item: (-item[1], item[0]))
@@ -218,7 +218,7 @@ export default function AlertScreen({ navigation }) {
       <FlatList
         data={alerts}
         renderItem={({ item }) => renderAlert(item, navigation)}
-        keyExtractor={(item, idx) => item.data?.face_id || idx.toString()}
+        keyExtractor={(item, idx) => item.alert_id || item.data?.face_id || idx.toString()}
         refreshControl={
           <RefreshControl refreshing={refreshing} onRefresh={onRefresh} />
         }
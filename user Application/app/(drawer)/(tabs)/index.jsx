@@ -218,7 +218,7 @@ export default function HomeTab() {
 
       if (alertsData.length > 0) {
         const latest = alertsData[0];
-        const alertId = latest.data?.face_id || "unknown";
+        const alertId = latest.alert_id || latest.data?.face_id || "unknown";
 
         if (alertId !== lastSeenAlertId) {
           // Push notification
@@ -244,6 +244,13 @@ export default function HomeTab() {
             onPress: async () => {
               await AsyncStorage.setItem("lastSeenAlertId", alertId);
               setLastSeenAlertId(alertId);
+              // Move the server-side read cursor up to this alert; without a cursor
+              // the server would mark every alert read, so leave it unchanged
+              if (latest.cursor) {
+                fetch(`${API_URL}/alert/${userId}/read?until=${encodeURIComponent(latest.cursor)}`, {
+                  method: "POST",
+                }).catch(() => {});
+              }
               Toast.hide();
             },
           });